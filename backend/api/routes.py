@@ -1,8 +1,10 @@
 """
 API Routes for PRAGATI Backend
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request, Response, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Optional, Any, Awaitable, List
+import asyncio
 import logging
 
 from models.schemas import (
@@ -10,13 +12,24 @@ from models.schemas import (
     GenerateModuleResponse,
     TranslateRequest,
     TranslateResponse,
+    TranslateModuleRequest,
+    TranslateModuleResponse,
+    Module,
     FeedbackRequest,
     FeedbackResponse,
     IngestDocumentResponse
 )
 from services.rag_service import RAGService
 from services.translation_service import TranslationService
+from utils.translation_scheduler import TranslationQueueFull
+from utils.db_utils import ConversationNotFound
 from services.micro_learning_service import MicroLearningService
+from services.precompute_service import PrecomputeService
+from services.conversation_history_service import ConversationHistoryService
+from services.retention_service import RetentionService
+from services.dashboard_service import DashboardService
+from utils.module_codec import EncodedModule
+from config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -25,6 +38,76 @@ router = APIRouter()
 rag_service = RAGService()
 translation_service = TranslationService()
 micro_learning_service = MicroLearningService()
+precompute_service = PrecomputeService(rag_service, micro_learning_service)
+history_service = ConversationHistoryService(micro_learning_service.llm_service)
+retention_service = RetentionService()
+dashboard_service = DashboardService()
+
+# Non-standard status (nginx convention) for requests the client abandoned
+CLIENT_CLOSED_REQUEST = 499
+
+async def run_until_disconnect(http_request: Request, work: Awaitable[Any]) -> Optional[Any]:
+    """
+    Await work, cancelling it if the client disconnects first.
+    
+    Cancellation closes the upstream Ollama stream, so the backend stops
+    generating and its router slot is released.
+    
+    Returns:
+        The result of work, or None if the client went away
+    """
+    task = asyncio.ensure_future(work)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=settings.LLM_DISCONNECT_POLL_INTERVAL)
+        if done:
+            return task.result()
+        if await http_request.is_disconnected():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            return None
+
+def module_response(encoded: EncodedModule) -> Response:
+    """GenerateModuleResponse written around the module's already-serialized JSON."""
+    return Response(
+        content=encoded.envelope(success=True, message=None),
+        media_type="application/json"
+    )
+
+async def pretranslate_module(module: Module, languages: List[str]) -> None:
+    """Translate a fresh module into each language and store it for instant serving."""
+    from utils.async_db import save_module_translation
+    
+    for language in languages:
+        try:
+            translated = await translation_service.translate_module(
+                module=module,
+                target_language=language,
+                source_language=module.language
+            )
+            await save_module_translation(module.id, language, translated.model_dump(mode='json'))
+            logger.info(f"Pre-translated module {module.id} into {language}")
+        except Exception as e:
+            logger.error(f"Error pre-translating module {module.id} into {language}: {str(e)}")
+
+def schedule_pretranslation(
+    background_tasks: BackgroundTasks,
+    request: GenerateModuleRequest,
+    module: Module
+) -> None:
+    """Queue background pre-translation into the district's dialects, if requested."""
+    if not request.pretranslate:
+        return
+    
+    languages = settings.DISTRICT_DIALECTS.get(
+        (request.district or "").lower(),
+        settings.DEFAULT_PRETRANSLATE_LANGUAGES
+    )
+    languages = [language for language in languages if language != module.language]
+    if languages:
+        background_tasks.add_task(pretranslate_module, module, languages)
 
 @router.post("/ingest", response_model=IngestDocumentResponse)
 async def ingest_document(
@@ -55,6 +138,9 @@ async def ingest_document(
             title=title
         )
         
+        # Precomputed modules were built from the old corpus
+        await precompute_service.invalidate()
+        
         return IngestDocumentResponse(
             success=True,
             message=f"Document '{file.filename}' ingested successfully",
@@ -67,7 +153,11 @@ async def ingest_document(
         raise HTTPException(status_code=500, detail=f"Failed to ingest document: {str(e)}")
 
 @router.post("/generate", response_model=GenerateModuleResponse)
-async def generate_module(request: GenerateModuleRequest):
+async def generate_module(
+    request: GenerateModuleRequest,
+    http_request: Request,
+    background_tasks: BackgroundTasks
+):
     """
     Generate a micro-learning module based on teacher's challenge.
     Supports conversation context for iterative refinement.
@@ -78,17 +168,38 @@ async def generate_module(request: GenerateModuleRequest):
     Returns:
         Generated micro-learning module with sections
     """
+    # Sections already handed to the translation worker; cancelled if generation fails
+    section_translations = {}
+    
     try:
-        from utils.db_utils import create_conversation, add_message, get_conversation_messages
+        from utils.async_db import add_messages, save_module_translation
         
-        # Get conversation context if conversation_id is provided
+        # Non-English teachers get the module in their language
+        target_language = request.language or "eng_Latn"
+        if target_language not in settings.SUPPORTED_LANGUAGES:
+            raise HTTPException(status_code=400, detail=f"Unsupported language: {target_language}")
+        
+        # Get conversation context if conversation_id is provided: rolling
+        # summary plus the last few turns, never the whole transcript
         conversation_history = []
         if request.conversation_id:
-            messages = get_conversation_messages(request.conversation_id)
-            conversation_history = [
-                {"role": msg["role"], "content": msg["content"]}
-                for msg in messages
-            ]
+            conversation_history = await history_service.load(request.conversation_id)
+        
+        # Fresh challenges may already have a module precomputed while idle
+        if not request.conversation_id:
+            module = await precompute_service.lookup(
+                challenge=request.challenge,
+                target_duration=request.target_duration or 15,
+                difficulty_level=request.difficulty_level or "intermediate"
+            )
+            if module is not None:
+                schedule_pretranslation(background_tasks, request, module)
+                if target_language != module.language:
+                    module = await translation_service.translate_module(
+                        module=module,
+                        target_language=target_language
+                    )
+                return module_response(EncodedModule(module.model_dump(mode='json')))
         
         # Retrieve relevant content from vector DB
         relevant_chunks = await rag_service.retrieve_relevant_content(
@@ -96,28 +207,73 @@ async def generate_module(request: GenerateModuleRequest):
             top_k=5
         )
         
-        # Generate micro-learning module with conversation context
-        module = await micro_learning_service.generate_module(
-            challenge=request.challenge,
-            context=relevant_chunks,
-            conversation_history=conversation_history,
-            target_duration=request.target_duration or 15,
-            difficulty_level=request.difficulty_level or "intermediate"
+        # Sections are handed to the translation worker as soon as they finish
+        # streaming, so translation overlaps the rest of generation
+        def translate_section(index, section):
+            section_translations[index] = (
+                section,
+                translation_service.start_section_translation(section, target_language)
+            )
+        
+        # Generate micro-learning module with conversation context,
+        # abandoning the LLM call if the teacher disconnects meanwhile
+        module = await run_until_disconnect(
+            http_request,
+            micro_learning_service.generate_module(
+                challenge=request.challenge,
+                context=relevant_chunks,
+                conversation_history=conversation_history,
+                conversation_id=request.conversation_id,
+                target_duration=request.target_duration or 15,
+                difficulty_level=request.difficulty_level or "intermediate",
+                on_section=translate_section if target_language != "eng_Latn" else None
+            )
         )
+        if module is None:
+            logger.info("Client disconnected, module generation cancelled")
+            for _, task in section_translations.values():
+                task.cancel()
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
+        
+        # Pre-translation into dialects starts from the English original
+        schedule_pretranslation(background_tasks, request, module)
+        
+        # The module is stored as generated; a translation is stored alongside
+        # it under the same id (as pre-translation does), never in its place
+        source = EncodedModule(module.model_dump(mode='json'))
+        encoded = source
+        translated = None
+        if target_language != module.language:
+            translated = await translation_service.translate_module(
+                module=module,
+                target_language=target_language,
+                section_translations=section_translations
+            )
+            encoded = EncodedModule(translated.model_dump(mode='json'))
         
         # Save to conversation if conversation_id provided
         if request.conversation_id:
-            # Add user message
-            add_message(request.conversation_id, "user", request.challenge)
-            # Add assistant message with module data (serialize to json compatible format)
-            add_message(request.conversation_id, "assistant", "Module generated", module.model_dump(mode='json'))
+            # Add user message and assistant message with module data in one commit
+            await add_messages(request.conversation_id, [
+                ("user", request.challenge, None),
+                ("assistant", "Module generated", source)
+            ])
+            if translated is not None:
+                await save_module_translation(module.id, target_language, encoded.data)
+            dashboard_service.notify("query")
+            # Fold turns that just left the history window into the summary
+            background_tasks.add_task(history_service.update_summary, request.conversation_id)
         
-        return GenerateModuleResponse(
-            success=True,
-            module=module
-        )
+        return module_response(encoded)
         
+    except HTTPException:
+        raise
+    except ConversationNotFound as e:
+        logger.warning(f"Module generated for a missing conversation: {str(e)}")
+        raise HTTPException(status_code=404, detail=f"{str(e)}; restore it if it was archived")
     except Exception as e:
+        for _, task in section_translations.values():
+            task.cancel()
         logger.error(f"Error generating module: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate module: {str(e)}")
 
@@ -136,7 +292,8 @@ async def translate_content(request: TranslateRequest):
         translated_text = await translation_service.translate(
             text=request.text,
             target_language=request.target_language,
-            source_language=request.source_language or "eng_Latn"
+            source_language=request.source_language or "eng_Latn",
+            profile=request.profile
         )
         
         return TranslateResponse(
@@ -146,10 +303,81 @@ async def translate_content(request: TranslateRequest):
             target_language=request.target_language
         )
         
+    except TranslationQueueFull as e:
+        logger.warning(f"Translation queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error translating content: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to translate: {str(e)}")
 
+@router.post("/translate/module", response_model=TranslateModuleResponse)
+async def translate_module(request: TranslateModuleRequest):
+    """
+    Translate a whole module (titles, section contents, activities) in one batch.
+    
+    Args:
+        request: Module id or payload, and target language
+    
+    Returns:
+        Translated module with language set
+    """
+    try:
+        from utils.async_db import get_module_by_id, get_module_translation, save_module_translation
+        
+        module = request.module
+        if module is None:
+            if not request.module_id:
+                raise HTTPException(status_code=400, detail="Either module_id or module is required")
+            module_data = await get_module_by_id(request.module_id)
+            if module_data is None:
+                raise HTTPException(status_code=404, detail="Module not found")
+            module = Module(**module_data)
+        
+        source_language = request.source_language or module.language
+        
+        # Stored translations are of the stored module with the default profile,
+        # so only requests for exactly that may read or write them (a posted
+        # payload can differ from what is stored under its id)
+        cacheable = (
+            request.module is None
+            and source_language == module.language
+            and (request.profile or settings.TRANSLATION_DEFAULT_PROFILE) == settings.TRANSLATION_DEFAULT_PROFILE
+        )
+        
+        # Served straight from storage if it was pre-translated in the background
+        if cacheable:
+            cached = await get_module_translation(module.id, request.target_language)
+            if cached is not None:
+                return TranslateModuleResponse(success=True, module=Module(**cached))
+        
+        translated = await translation_service.translate_module(
+            module=module,
+            target_language=request.target_language,
+            source_language=source_language,
+            profile=request.profile
+        )
+        if cacheable:
+            await save_module_translation(module.id, request.target_language, translated.model_dump(mode='json'))
+        
+        return TranslateModuleResponse(success=True, module=translated)
+        
+    except HTTPException:
+        raise
+    except TranslationQueueFull as e:
+        logger.warning(f"Translation queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error translating module: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to translate module: {str(e)}")
+
+@router.get("/translate/stats")
+async def get_translation_stats():
+    """Get translation memory hit rate and scheduler queue/latency metrics."""
+    return {
+        "success": True,
+        "stats": translation_service.get_stats()
+    }
+
 @router.post("/adapt", response_model=TranslateResponse)
 async def adapt_content(request: TranslateRequest):
     """
@@ -162,7 +390,8 @@ async def adapt_content(request: TranslateRequest):
         translated_text = await translation_service.translate(
             text=request.text,
             target_language=request.target_language,
-            source_language=request.source_language or "eng_Latn"
+            source_language=request.source_language or "eng_Latn",
+            profile=request.profile
         )
         
         return TranslateResponse(
@@ -172,6 +401,9 @@ async def adapt_content(request: TranslateRequest):
             target_language=request.target_language
         )
         
+    except TranslationQueueFull as e:
+        logger.warning(f"Translation queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error adapting content: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to adapt content: {str(e)}")
@@ -182,13 +414,10 @@ async def submit_feedback(request: FeedbackRequest):
     Submit implementation feedback for a module.
     """
     try:
-        from utils.db_utils import save_feedback, init_db
-        
-        # Ensure DB is initialized
-        init_db()
+        from utils.async_db import save_feedback
         
         # Save feedback
-        feedback_id = save_feedback({
+        feedback_id = await save_feedback({
             "module_id": request.module_id,
             "challenge": request.challenge,
             "rating": request.rating,
@@ -198,6 +427,7 @@ async def submit_feedback(request: FeedbackRequest):
         })
         
         logger.info(f"Feedback saved with ID: {feedback_id}")
+        dashboard_service.notify("feedback")
         
         return FeedbackResponse(
             success=True,
@@ -209,50 +439,201 @@ async def submit_feedback(request: FeedbackRequest):
         logger.error(f"Error submitting feedback: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to submit feedback: {str(e)}")
 
+@router.get("/feedback")
+async def get_feedback(
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None
+):
+    """Get feedback newest first; pass next_cursor back as cursor for the next page."""
+    try:
+        from utils.async_db import get_feedback_page
+        
+        feedback, next_cursor = await get_feedback_page(limit=limit, after=cursor)
+        return {
+            "success": True,
+            "feedback": feedback,
+            "next_cursor": next_cursor
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting feedback: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch feedback: {str(e)}")
+
 @router.get("/feedback/stats")
 async def get_feedback_stats_endpoint():
-    """Get aggregated feedback statistics."""
+    """
+    Get aggregated feedback statistics with recent feedback and queries.
+    
+    Served from the shared dashboard snapshot; dashboards subscribed to
+    /dashboard/events only call this as a fallback.
+    """
     try:
-        from utils.db_utils import get_feedback_stats, get_all_feedback, get_recent_queries
-        
-        stats = get_feedback_stats()
-        recent_feedback = get_all_feedback()
-        recent_queries = get_recent_queries()
-        
+        snapshot = await dashboard_service.snapshot()
         return {
             "success": True,
-            "stats": stats,
-            "recent_feedback": recent_feedback[:50],  # Limit to last 50 items
-            "recent_queries": recent_queries
+            **snapshot
         }
     except Exception as e:
         logger.error(f"Error getting feedback stats: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch stats: {str(e)}")
 
+@router.get("/dashboard/events")
+async def dashboard_events():
+    """
+    Live dashboard updates as server-sent events.
+    
+    Sends a "snapshot" event (same shape as /feedback/stats) on connect,
+    then "feedback" and "query" events carrying the new rows and a "stats"
+    event with the updated aggregates after each burst of writes.
+    """
+    return StreamingResponse(
+        dashboard_service.stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Don't let a reverse proxy buffer the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+@router.get("/feedback/modules/{module_id}")
+async def get_module_feedback(module_id: str):
+    """Get feedback count and average rating for one module."""
+    try:
+        from utils.async_db import get_module_feedback_stats
+        
+        stats = await get_module_feedback_stats(module_id)
+        if stats is None:
+            raise HTTPException(status_code=404, detail="No feedback for this module")
+        return {
+            "success": True,
+            "stats": stats
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting module feedback: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch module feedback: {str(e)}")
+
+@router.get("/queries")
+async def get_queries(
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None
+):
+    """Get teachers' recent queries newest first, one page at a time."""
+    try:
+        from utils.async_db import get_recent_queries_page
+        
+        queries, next_cursor = await get_recent_queries_page(limit=limit, after=cursor)
+        return {
+            "success": True,
+            "queries": queries,
+            "next_cursor": next_cursor
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting queries: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch queries: {str(e)}")
+
+@router.get("/search")
+async def search_history(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[str] = None,
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None
+):
+    """
+    Search past challenges, conversation titles and modules, best match first.
+
+    kind ("message", "conversation" or "module") restricts the search to one
+    source; next_cursor, passed back as cursor, fetches the next page.
+    """
+    try:
+        from utils.async_db import search
+
+        results, next_cursor = await search(q, kind=kind, limit=limit, after=cursor)
+        return {
+            "success": True,
+            "results": results,
+            "next_cursor": next_cursor
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to search: {str(e)}")
+
 # ============= Conversation Endpoints =============
 
 @router.get("/conversations")
-async def get_conversations():
-    """Get all conversations."""
+async def get_conversations(
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None
+):
+    """Get conversations, most recently active first, one page at a time."""
     try:
-        from utils.db_utils import get_all_conversations
+        from utils.async_db import get_conversations_page
         
-        conversations = get_all_conversations()
+        conversations, next_cursor = await get_conversations_page(limit=limit, after=cursor)
         return {
             "success": True,
-            "conversations": conversations
+            "conversations": conversations,
+            "next_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting conversations: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch conversations: {str(e)}")
 
+@router.get("/conversations/archived")
+async def get_archived_conversations(
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None
+):
+    """Get conversations moved to the archive by retention, most recently active first."""
+    try:
+        from utils.async_db import get_archived_conversations_page
+        
+        conversations, next_cursor = await get_archived_conversations_page(limit=limit, after=cursor)
+        return {
+            "success": True,
+            "conversations": conversations,
+            "next_cursor": next_cursor
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting archived conversations: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch archived conversations: {str(e)}")
+
+@router.post("/conversations/{conversation_id}/restore")
+async def restore_archived_conversation(conversation_id: int):
+    """Move an archived conversation back so it can be opened and continued."""
+    try:
+        from utils.async_db import restore_conversation
+        
+        if not await restore_conversation(conversation_id):
+            raise HTTPException(status_code=404, detail="Conversation is not archived")
+        return {
+            "success": True,
+            "conversation_id": conversation_id
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error restoring conversation: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to restore conversation: {str(e)}")
+
 @router.post("/conversations")
 async def create_new_conversation(title: str):
     """Create a new conversation."""
     try:
-        from utils.db_utils import create_conversation
+        from utils.async_db import create_conversation
         
-        conversation_id = create_conversation(title)
+        conversation_id = await create_conversation(title)
         return {
             "success": True,
             "conversation_id": conversation_id
@@ -262,20 +643,87 @@ async def create_new_conversation(title: str):
         raise HTTPException(status_code=500, detail=f"Failed to create conversation: {str(e)}")
 
 @router.get("/conversations/{conversation_id}/messages")
-async def get_messages(conversation_id: int):
-    """Get all messages for a conversation."""
+async def get_messages(
+    conversation_id: int,
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    include_modules: bool = True
+):
+    """
+    Get the latest messages of a conversation in chronological order.
+    
+    next_cursor, passed back as cursor, fetches the page of older messages.
+    """
     try:
-        from utils.db_utils import get_conversation_messages
+        from utils.async_db import get_messages_page
         
-        messages = get_conversation_messages(conversation_id)
-        return {
+        messages, next_cursor = await get_messages_page(
+            conversation_id,
+            limit=limit,
+            after=cursor,
+            include_modules=include_modules
+        )
+        # Module payloads are plain JSON already; skip FastAPI's jsonable_encoder pass
+        return ORJSONResponse({
             "success": True,
-            "messages": messages
-        }
+            "messages": messages,
+            "next_cursor": next_cursor
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting messages: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch messages: {str(e)}")
 
+@router.get("/modules/{module_id}")
+async def get_module(module_id: str):
+    """Get one generated module (for messages listed with include_modules=false)."""
+    try:
+        from utils.async_db import get_module_by_id
+
+        module_data = await get_module_by_id(module_id)
+        if module_data is None:
+            raise HTTPException(status_code=404, detail="Module not found")
+        return ORJSONResponse({
+            "success": True,
+            "module": module_data
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting module: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch module: {str(e)}")
+
+@router.get("/llm/stats")
+async def get_llm_stats():
+    """Get LLM routing state and cancelled/wasted generation counters."""
+    return {
+        "success": True,
+        "stats": micro_learning_service.llm_service.get_stats()
+    }
+
+@router.get("/db/stats")
+async def get_db_stats():
+    """Get group-commit batch sizes and write latency, the last retention run and dashboard push counters."""
+    from utils.async_db import get_write_stats
+    
+    return {
+        "success": True,
+        "stats": get_write_stats(),
+        "retention": retention_service.get_stats(),
+        "dashboard": dashboard_service.get_stats()
+    }
+
+@router.get("/http/stats")
+async def get_http_stats():
+    """Get per-route JSON bytes produced vs. bytes sent after 304s and compression."""
+    from utils.http_encoding import get_stats
+    
+    return {
+        "success": True,
+        "stats": get_stats()
+    }
+
 @router.get("/languages")
 async def get_supported_languages():
     """Get list of supported vernacular languages."""
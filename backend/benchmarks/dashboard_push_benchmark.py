@@ -0,0 +1,128 @@
+"""
+Dashboard DB load: every open dashboard polling /feedback/stats vs. server push.
+
+Seeds a database, then for a fixed time has teachers writing feedback and
+queries at a steady rate while N admins watch the dashboard. In "poll"
+mode each admin re-runs the old /feedback/stats queries (stats, 50 recent
+feedback rows, 50 recent queries) every poll interval; in "push" mode they
+subscribe to DashboardService.stream() and the writes call notify(), as
+the routes do. Prints the DB reads made and the DB thread time they took
+per mode.
+
+Run from the backend directory:
+    python -m benchmarks.dashboard_push_benchmark --messages 200000 --admins 50 --seconds 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Dict
+
+from benchmarks.db_query_plans import seed
+from services.dashboard_service import DashboardService
+from utils import async_db, db_utils
+
+FEEDBACK = {"module_id": "module-1", "rating": 4, "implementation_status": "implemented"}
+
+def count_db_calls(counters: Dict[str, float]) -> None:
+    """Wrap async_db.run_db so every DB call and its duration are counted."""
+    run_db = async_db.run_db
+
+    def timed(fn):
+        def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                counters["db_ms"] += (time.perf_counter() - started) * 1000
+
+        return call
+
+    async def counted(fn, *args, write: bool = False, **kwargs):
+        if not write:
+            counters["reads"] += 1
+            fn = timed(fn)
+        return await run_db(fn, *args, write=write, **kwargs)
+
+    async_db.run_db = counted
+
+async def teachers(service: DashboardService, conversations: int, rate: float, seconds: float, push: bool) -> None:
+    """Steady stream of feedback and query writes."""
+    deadline = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < deadline:
+        if i % 3 == 0:
+            await async_db.save_feedback(FEEDBACK)
+            kind = "feedback"
+        else:
+            await async_db.add_messages(i % conversations + 1, [("user", f"How do I handle question {i}?", None)])
+            kind = "query"
+        if push:
+            service.notify(kind)
+        i += 1
+        await asyncio.sleep(1 / rate)
+
+async def poller(interval: float, seconds: float) -> None:
+    """One admin polling the old /feedback/stats queries."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        await async_db.get_feedback_stats()
+        await async_db.get_feedback_page(limit=50)
+        await async_db.get_recent_queries_page(limit=50)
+        await asyncio.sleep(interval)
+
+async def subscriber(service: DashboardService, seconds: float, counters: Dict[str, float]) -> None:
+    """One admin's event stream."""
+    stream = service.stream()
+    deadline = time.perf_counter() + seconds
+    try:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(stream.__anext__(), timeout=remaining)
+                counters["events"] += 1
+            except asyncio.TimeoutError:
+                return
+    finally:
+        await stream.aclose()
+
+async def run_mode(mode: str, admins: int, rate: float, interval: float, seconds: float, conversations: int) -> Dict[str, float]:
+    counters = {"reads": 0, "db_ms": 0.0, "events": 0}
+    count_db_calls(counters)
+    service = DashboardService()
+    push = mode == "push"
+    if push:
+        watchers = [subscriber(service, seconds, counters) for _ in range(admins)]
+    else:
+        watchers = [poller(interval, seconds) for _ in range(admins)]
+    await asyncio.gather(teachers(service, conversations, rate, seconds, push), *watchers)
+    counters.update(service.get_stats())
+    return counters
+
+def main(messages: int, admins: int, rate: float, interval: float, seconds: float) -> None:
+    db_utils.DB_PATH = os.path.join(tempfile.mkdtemp(), "dashboard.db")
+    per_conversation = 50
+    seed(db_utils.get_connection(), messages, per_conversation, feedback=messages // 10)
+    conversations = max(1, messages // per_conversation)
+    print(f"Seeded {messages} messages; {admins} dashboards, {rate:.0f} writes/s for {seconds:.0f}s")
+
+    run_db = async_db.run_db
+    for mode in ("poll", "push"):
+        result = asyncio.run(run_mode(mode, admins, rate, interval, seconds, conversations))
+        async_db.run_db = run_db
+        print(f"  {mode:>4}: {result['reads']:6d} DB reads  {result['db_ms']:9.0f} ms DB time  "
+              f"(refreshes {result['refreshes']}, events delivered {result['events']})")
+    asyncio.run(async_db.shutdown())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000, help="Messages to seed")
+    parser.add_argument("--admins", type=int, default=50, help="Open dashboards")
+    parser.add_argument("--rate", type=float, default=20.0, help="Teacher writes per second")
+    parser.add_argument("--interval", type=float, default=5.0, help="Poll interval (seconds) in poll mode")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Duration per mode")
+    args = parser.parse_args()
+    main(args.messages, args.admins, args.rate, args.interval, args.seconds)
@@ -0,0 +1,100 @@
+"""
+Mixed-traffic load test: sqlite calls inline in async handlers vs. the async DB layer.
+
+Simulates concurrent requests on one event loop: cheap non-DB requests
+(like /languages), history reads (get_conversation_messages), dashboard
+reads (get_feedback_stats + get_recent_queries) and writes (add_message,
+save_feedback), arriving open-loop at a fixed rate. In "sync" mode
+handlers call db_utils directly, as the routes used to; in "async" mode
+they await utils.async_db. Prints p50/p99 latency per request type for both.
+
+Run from the backend directory:
+    python -m benchmarks.db_load_test --messages 200000 --requests 3000 --rate 400
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks.db_query_plans import seed
+from utils import async_db, db_utils
+
+MIX = [("no_db", 0.4), ("history_read", 0.3), ("dashboard_read", 0.1), ("write", 0.2)]
+
+async def handle(kind: str, mode: str, conversations: int) -> None:
+    """One simulated request of the given kind."""
+    db = async_db if mode == "async" else db_utils
+
+    async def call(fn_name: str, *args):
+        result = getattr(db, fn_name)(*args)
+        return await result if mode == "async" else result
+
+    conversation_id = random.randint(1, conversations)
+    if kind == "no_db":
+        await asyncio.sleep(0)
+    elif kind == "history_read":
+        await call("get_conversation_messages", conversation_id)
+    elif kind == "dashboard_read":
+        await call("get_feedback_stats")
+        await call("get_recent_queries", 50)
+    else:
+        await call("add_message", conversation_id, "user", "How do I manage a large class?")
+        await call("save_feedback", {"module_id": "module-1", "rating": 4, "implementation_status": "implemented"})
+
+async def run_mode(mode: str, requests: int, rate: float, conversations: int) -> Dict[str, List[float]]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    kinds = random.choices([k for k, _ in MIX], weights=[w for _, w in MIX], k=requests)
+
+    async def one(kind: str, arrival: float) -> None:
+        await handle(kind, mode, conversations)
+        # Measured from the scheduled arrival, so time spent waiting for a
+        # blocked event loop to accept the request counts too
+        latencies[kind].append((time.perf_counter() - arrival) * 1000)
+
+    # Poisson arrivals; each request is due at a fixed time regardless of how
+    # long earlier ones take
+    tasks = []
+    arrival = time.perf_counter()
+    for kind in kinds:
+        arrival += random.expovariate(rate)
+        delay = arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(kind, arrival)))
+    await asyncio.gather(*tasks)
+    return latencies
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+def main(messages: int, requests: int, rate: float) -> None:
+    db_utils.DB_PATH = os.path.join(tempfile.mkdtemp(), "load_test.db")
+    per_conversation = 50
+    seed(db_utils.get_connection(), messages, per_conversation, feedback=messages // 10)
+    conversations = max(1, messages // per_conversation)
+    print(f"Seeded {messages} messages; {requests} requests at {rate:.0f} req/s")
+
+    for mode in ("sync", "async"):
+        random.seed(0)
+        started = time.perf_counter()
+        latencies = asyncio.run(run_mode(mode, requests, rate, conversations))
+        elapsed = time.perf_counter() - started
+        print(f"\n== {mode} ({requests / elapsed:.0f} req/s) ==")
+        for kind, _ in MIX:
+            values = latencies[kind]
+            print(f"  {kind:>15}: n={len(values):5d}  p50 {percentile(values, 0.5):7.1f} ms  "
+                  f"p99 {percentile(values, 0.99):7.1f} ms")
+    asyncio.run(async_db.shutdown())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000, help="Messages to seed")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests to simulate per mode")
+    parser.add_argument("--rate", type=float, default=400.0, help="Mean arrival rate (requests/sec)")
+    args = parser.parse_args()
+    main(args.messages, args.requests, args.rate)
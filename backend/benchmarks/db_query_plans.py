@@ -0,0 +1,169 @@
+"""
+Query-plan check for the hot db_utils read paths at production scale.
+
+Seeds a throwaway database (default ~1M messages), runs every hot read
+function, captures the SQL it actually executes and prints its
+EXPLAIN QUERY PLAN and latency. Exits non-zero if a hot path falls back to
+a full table scan or a temporary sort.
+
+Run from the backend directory:
+    python -m benchmarks.db_query_plans --messages 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from utils import db_utils
+from utils.module_codec import pack_module
+
+# A plan line containing this means rows were sorted instead of read in index order
+TEMP_SORT = "USE TEMP B-TREE"
+
+# Seeded challenges are drawn from these, so text search sees common and rare words
+ACTIONS = ["teach", "explain", "manage", "assess", "motivate", "engage", "support", "revise"]
+TOPICS = ["fractions", "photosynthesis", "grammar", "multiplication", "map reading", "poetry",
+          "electricity", "water cycle", "reading comprehension", "algebra", "group work", "homework"]
+CONTEXTS = ["a large class", "a multigrade classroom", "students with no textbooks", "first-generation learners",
+            "a noisy classroom", "shy students", "mixed ability groups", "a school without electricity"]
+
+def challenge_text(i: int) -> str:
+    rng = random.Random(i)
+    return f"How do I {rng.choice(ACTIONS)} {rng.choice(TOPICS)} with {rng.choice(CONTEXTS)}? ({i})"
+
+def seed(conn: sqlite3.Connection, messages: int, per_conversation: int, feedback: int) -> None:
+    """Insert conversations with alternating user/assistant messages and feedback."""
+    start = datetime(2025, 1, 1)
+    conversations = max(1, messages // per_conversation)
+
+    conn.executemany(
+        "INSERT INTO conversations (id, title, created_at, updated_at) VALUES (?, ?, ?, ?)",
+        (
+            (c, f"Challenge {c}", (start + timedelta(minutes=c)).isoformat() + 'Z',
+             (start + timedelta(minutes=c, seconds=per_conversation)).isoformat() + 'Z')
+            for c in range(1, conversations + 1)
+        )
+    )
+
+    def message_created(i):
+        c = i // per_conversation + 1
+        return (start + timedelta(minutes=c, seconds=i % per_conversation)).isoformat() + 'Z'
+
+    conn.executemany(
+        "INSERT INTO modules (id, title, payload, created_at) VALUES (?, ?, ?, ?)",
+        (
+            (f"module-{i}", f"Module {i}", pack_module({"id": f"module-{i}", "title": f"Module {i}"}), message_created(i))
+            for i in range(1, messages, 2)
+        )
+    )
+    conn.executemany(
+        "INSERT INTO modules_fts (rowid, title, body) SELECT rowid, title, ? FROM modules WHERE id = ?",
+        ((challenge_text(i - 1), f"module-{i}") for i in range(1, messages, 2))
+    )
+
+    def message_rows():
+        for i in range(messages):
+            c = i // per_conversation + 1
+            if i % 2 == 0:
+                yield (c, "user", challenge_text(i), None, message_created(i))
+            else:
+                yield (c, "assistant", "Module generated", f"module-{i}", message_created(i))
+
+    conn.executemany(
+        "INSERT INTO messages (conversation_id, role, content, module_id, created_at) VALUES (?, ?, ?, ?, ?)",
+        message_rows()
+    )
+
+    statuses = ["implemented", "partially", "not_yet"]
+    conn.executemany(
+        "INSERT INTO feedback (module_id, challenge, rating, implementation_status, comments, conversation_id, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (f"module-{2 * i + 1}", f"Challenge {i}", random.randint(1, 5), random.choice(statuses), None,
+             random.randint(1, conversations), (start + timedelta(seconds=i)).isoformat() + 'Z')
+            for i in range(feedback)
+        )
+    )
+    conn.commit()
+    # Raw inserts bypass the incremental rollups, so backfill them
+    db_utils.rebuild_rollups()
+    conn.execute("ANALYZE")
+
+def check(conn: sqlite3.Connection, name: str, call) -> bool:
+    """Run a db_utils call, then EXPLAIN each SELECT it issued. Returns True if all plans use indexes."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    started = time.perf_counter()
+    call()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    conn.set_trace_callback(None)
+
+    ok = True
+    print(f"\n== {name} ({elapsed_ms:.1f} ms) ==")
+    for sql in statements:
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        for line in plan:
+            bad = (line.startswith("SCAN ") and "INDEX" not in line) or TEMP_SORT in line
+            ok = ok and not bad
+            print(f"  {'!!' if bad else 'ok'} {line}")
+    return ok
+
+def run(messages: int, per_conversation: int, feedback: int) -> int:
+    db_utils.DB_PATH = os.path.join(tempfile.mkdtemp(), "query_plans.db")
+    conn = db_utils.get_connection()
+
+    started = time.perf_counter()
+    seed(conn, messages, per_conversation, feedback)
+    print(f"Seeded {messages} messages, {feedback} feedback rows in {time.perf_counter() - started:.1f}s")
+
+    conversation_id = max(1, messages // per_conversation) // 2
+    hot_paths = [
+        ("get_conversation_messages", lambda: db_utils.get_conversation_messages(conversation_id)),
+        ("get_recent_queries", lambda: db_utils.get_recent_queries(limit=50)),
+        ("get_module_by_id", lambda: db_utils.get_module_by_id(f"module-{messages // 2 + 1}")),
+        ("get_module_feedback_stats", lambda: db_utils.get_module_feedback_stats("module-1")),
+        ("get_recent_turns", lambda: db_utils.get_recent_turns(conversation_id, 4)),
+        ("get_module_translation", lambda: db_utils.get_module_translation("module-1", "hin_Deva")),
+    ]
+
+    # Keyset pages: first page, then a page deep into the table via its cursor
+    deep = {
+        "feedback": db_utils.get_feedback_page(limit=feedback // 2)[1],
+        "conversations": db_utils.get_conversations_page(limit=max(1, messages // per_conversation) // 2)[1],
+        "messages": db_utils.get_messages_page(conversation_id, limit=per_conversation // 2)[1],
+        "queries": db_utils.get_recent_queries_page(limit=messages // 4)[1],
+    }
+    hot_paths += [
+        ("get_feedback_page", lambda: db_utils.get_feedback_page(limit=50)),
+        ("get_feedback_page (deep)", lambda: db_utils.get_feedback_page(limit=50, after=deep["feedback"])),
+        ("get_conversations_page", lambda: db_utils.get_conversations_page(limit=50)),
+        ("get_conversations_page (deep)", lambda: db_utils.get_conversations_page(limit=50, after=deep["conversations"])),
+        ("get_messages_page", lambda: db_utils.get_messages_page(conversation_id, limit=20)),
+        ("get_messages_page (older)", lambda: db_utils.get_messages_page(conversation_id, limit=20, after=deep["messages"])),
+        ("get_recent_queries_page", lambda: db_utils.get_recent_queries_page(limit=50)),
+        ("get_recent_queries_page (deep)", lambda: db_utils.get_recent_queries_page(limit=50, after=deep["queries"])),
+    ]
+    results = [check(conn, name, call) for name, call in hot_paths]
+
+    # Reported for reference: these read every row by design
+    print("\n-- full listings (informational) --")
+    check(conn, "get_all_conversations", db_utils.get_all_conversations)
+    check(conn, "get_all_feedback", db_utils.get_all_feedback)
+
+    failed = [name for (name, _), ok in zip(hot_paths, results) if not ok]
+    print(f"\n{'FAILED: ' + ', '.join(failed) if failed else 'All hot paths use indexes'}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1_000_000, help="Messages to seed")
+    parser.add_argument("--per-conversation", type=int, default=50, help="Messages per conversation")
+    parser.add_argument("--feedback", type=int, default=100_000, help="Feedback rows to seed")
+    args = parser.parse_args()
+    sys.exit(run(args.messages, args.per_conversation, args.feedback))
@@ -0,0 +1,68 @@
+"""
+Write throughput: one transaction per write vs. the group-commit writer.
+
+Runs bursts of concurrent add_message/save_feedback calls through the
+single DB writer thread, first committing each write on its own (as the
+async layer did before group commit), then through async_db's
+GroupCommitWriter. Both use the writer's synchronous setting, so every
+commit is durable. Prints writes/sec and p50/p99 write latency per mode.
+
+Run from the backend directory:
+    python -m benchmarks.group_commit_benchmark --writers 200 --rounds 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List
+
+from utils import async_db, db_utils
+
+FEEDBACK = {"module_id": "module-1", "rating": 4, "implementation_status": "implemented"}
+
+async def write(mode: str, conversation_id: int, i: int) -> float:
+    started = time.perf_counter()
+    if mode == "group":
+        if i % 5 == 0:
+            await async_db.save_feedback(FEEDBACK)
+        else:
+            await async_db.add_message(conversation_id, "user", f"Question {i}")
+    else:
+        if i % 5 == 0:
+            await async_db.run_db(db_utils.save_feedback, FEEDBACK, write=True)
+        else:
+            await async_db.run_db(db_utils.add_message, conversation_id, "user", f"Question {i}", write=True)
+    return (time.perf_counter() - started) * 1000
+
+async def run_mode(mode: str, writers: int, rounds: int) -> List[float]:
+    conversation_id = await async_db.create_conversation(f"Benchmark ({mode})")
+    latencies: List[float] = []
+    for _ in range(rounds):
+        latencies.extend(await asyncio.gather(*(write(mode, conversation_id, i) for i in range(writers))))
+    return latencies
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+def main(writers: int, rounds: int) -> None:
+    db_utils.DB_PATH = os.path.join(tempfile.mkdtemp(), "group_commit.db")
+    print(f"{writers} concurrent writers x {rounds} rounds")
+
+    for mode in ("per_write", "group"):
+        started = time.perf_counter()
+        latencies = asyncio.run(run_mode(mode, writers, rounds))
+        elapsed = time.perf_counter() - started
+        print(f"  {mode:>9}: {len(latencies) / elapsed:8.0f} writes/s  "
+              f"p50 {percentile(latencies, 0.5):7.1f} ms  p99 {percentile(latencies, 0.99):7.1f} ms")
+
+    print(f"  group commit stats: {async_db.get_write_stats()}")
+    asyncio.run(async_db.shutdown())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=200, help="Concurrent writes per round")
+    parser.add_argument("--rounds", type=int, default=20, help="Rounds of concurrent writes")
+    args = parser.parse_args()
+    main(args.writers, args.rounds)
@@ -0,0 +1,75 @@
+"""
+Full-text search benchmark: FTS5 index build and query latency at scale.
+
+Seeds a throwaway database (default 1M messages, indexed by the triggers
+as rows arrive), then times a full rebuild of the search index and runs a
+set of searches, from words in most challenges to rare words and prefixes,
+reporting p50/p95 latency for the first and a deep page.
+
+Run from the backend directory:
+    python -m benchmarks.search_benchmark --messages 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from benchmarks.db_query_plans import seed
+from utils import db_utils
+
+QUERIES = [
+    ("common word", "classroom", None),
+    ("two words", "fractions large", None),
+    ("three words", "school without electricity", None),
+    ("prefix", "photosynth", None),
+    ("messages only", "motivate shy", "message"),
+    ("conversations only", "challenge 12", "conversation"),
+    ("no match", "cricket", None),
+]
+
+def timed(call: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)
+
+def main(messages: int, repeat: int) -> None:
+    db_utils.DB_PATH = os.path.join(tempfile.mkdtemp(), "search.db")
+    conn = db_utils.get_connection()
+
+    started = time.perf_counter()
+    seed(conn, messages, per_conversation=50, feedback=messages // 10)
+    print(f"Seeded {messages} messages (indexed on insert) in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    db_utils.rebuild_search_index()
+    print(f"Full index rebuild (incl. optimize): {time.perf_counter() - started:.1f}s")
+    try:
+        size = conn.execute("SELECT SUM(pgsize) FROM dbstat WHERE name LIKE '%_fts%'").fetchone()[0]
+        print(f"Index size: {size / 1e6:.0f} MB")
+    except Exception:
+        pass
+
+    print(f"\n{'query':>20} {'hits':>6} {'p50 ms':>8} {'p95 ms':>8} {'page 5 p50':>11}")
+    for name, query, kind in QUERIES:
+        results, cursor = db_utils.search(query, kind=kind, limit=20)
+        first = timed(lambda: db_utils.search(query, kind=kind, limit=20), repeat)
+
+        deep_cursor = cursor
+        for _ in range(3):
+            if deep_cursor:
+                deep_cursor = db_utils.search(query, kind=kind, limit=20, after=deep_cursor)[1]
+        deep = timed(lambda: db_utils.search(query, kind=kind, limit=20, after=deep_cursor), repeat) if deep_cursor else [0.0]
+
+        print(f"{name:>20} {len(results):6d} {first[len(first) // 2]:8.1f} {first[int(len(first) * 0.95)]:8.1f} "
+              f"{deep[len(deep) // 2]:11.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1_000_000, help="Messages to seed")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    args = parser.parse_args()
+    main(args.messages, args.repeat)
@@ -0,0 +1,124 @@
+"""
+JSON serialization cost: stdlib json + FastAPI's encoders vs. orjson and serialize-once.
+
+Two workloads, each timed the old way and the current way:
+
+- generate: a large module going into the /generate response and into
+  storage. Old: model_dump(mode='json') for storage (json.dumps + zlib),
+  then FastAPI's response_model validation/serialization and JSONResponse.
+  New: one EncodedModule whose JSON bytes become both the zlib payload and
+  the response body.
+- history: a page of conversation messages with their modules, read from
+  storage and rendered. Old: json.loads per payload, jsonable_encoder and
+  JSONResponse. New: orjson via unpack_module and ORJSONResponse.
+
+Run from the backend directory:
+    python -m benchmarks.serialization_benchmark --sections 5 --messages 50 --iterations 200
+"""
+import argparse
+import asyncio
+import json
+import time
+import zlib
+from typing import Awaitable, Callable, Dict, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from config import settings
+from models.schemas import GenerateModuleResponse, Module, ModuleSection
+from utils.module_codec import EncodedModule, pack_module, unpack_module
+
+PARAGRAPH = "बड़ी कक्षा में समूह कार्य के लिए बच्चों को चार-चार के समूहों में बाँटें। Use peer tutoring and exit tickets. "
+
+def make_module(sections: int, i: int = 0) -> Module:
+    return Module(
+        id=f"module-{i}",
+        title="बड़ी कक्षा का प्रबंधन",
+        challenge="How do I manage a class of 60 students?",
+        sections=[
+            ModuleSection(
+                title=f"Section {s}",
+                content=PARAGRAPH * 30,
+                duration_minutes=3,
+                activity=PARAGRAPH * 5
+            )
+            for s in range(sections)
+        ],
+        total_duration=15,
+        difficulty_level="intermediate"
+    )
+
+def old_pack(module_data: Dict) -> bytes:
+    encoded = json.dumps(module_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(encoded, settings.MODULE_COMPRESSION_LEVEL)
+
+async def time_per_call(fn: Callable[[], Awaitable[bytes]], iterations: int) -> float:
+    """Mean microseconds per call."""
+    await fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+async def run(sections: int, messages: int, iterations: int) -> None:
+    module = make_module(sections)
+    # The field FastAPI validates /generate's return value against
+    generate_field = APIRoute(
+        "/generate", lambda: None, response_model=GenerateModuleResponse
+    ).secure_cloned_response_field
+
+    async def generate_old() -> bytes:
+        old_pack(module.model_dump(mode='json'))
+        content = await serialize_response(
+            field=generate_field,
+            response_content=GenerateModuleResponse(success=True, module=module),
+            is_coroutine=True
+        )
+        return JSONResponse(content).body
+
+    async def generate_new() -> bytes:
+        encoded = EncodedModule(module.model_dump(mode='json'))
+        pack_module(encoded)
+        return encoded.envelope(success=True, message=None)
+
+    # A stored history page: every other message is an assistant turn with a module
+    rows: List[Dict] = []
+    for i in range(messages):
+        payload = pack_module(make_module(sections, i).model_dump(mode='json')) if i % 2 else None
+        rows.append({"id": i, "role": "assistant" if i % 2 else "user", "content": "x", "payload": payload})
+
+    async def history_old() -> bytes:
+        page = [
+            {**{k: v for k, v in row.items() if k != "payload"},
+             "module_data": json.loads(zlib.decompress(row["payload"])) if row["payload"] else None}
+            for row in rows
+        ]
+        content = await serialize_response(response_content={"success": True, "messages": page}, is_coroutine=True)
+        return JSONResponse(content).body
+
+    async def history_new() -> bytes:
+        page = [
+            {**{k: v for k, v in row.items() if k != "payload"},
+             "module_data": unpack_module(row["payload"]) if row["payload"] else None}
+            for row in rows
+        ]
+        return ORJSONResponse({"success": True, "messages": page}).body
+
+    assert json.loads(await generate_old()) == json.loads(await generate_new())
+    assert json.loads(await history_old()) == json.loads(await history_new())
+
+    print(f"Module: {sections} sections, {len(module.model_dump_json()) // 1024} KB JSON; "
+          f"history page: {messages} messages")
+    for name, old, new in (("generate", generate_old, generate_new), ("history", history_old, history_new)):
+        old_us = await time_per_call(old, iterations)
+        new_us = await time_per_call(new, iterations)
+        print(f"  {name:>8}: old {old_us:9.0f} us  new {new_us:9.0f} us  ({old_us / new_us:.1f}x)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sections", type=int, default=5, help="Sections per module")
+    parser.add_argument("--messages", type=int, default=50, help="Messages in the history page")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per workload")
+    args = parser.parse_args()
+    asyncio.run(run(args.sections, args.messages, args.iterations))
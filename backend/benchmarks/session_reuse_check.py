@@ -0,0 +1,87 @@
+"""
+Prompt-prefix reuse across a multi-turn conversation.
+
+Drives MicroLearningService.generate_module through several turns of one
+conversation with a full RAG context budget and module-sized replies,
+against a recording stand-in for the Ollama router (no LLM needed). For
+each turn it reports how many leading tokens match what Ollama holds in
+its KV cache from the previous request, i.e. how much prefill is skipped,
+and fails if the session is abandoned before the last turn.
+
+Run from the backend directory:
+    python -m benchmarks.session_reuse_check --turns 3
+"""
+import argparse
+import asyncio
+from typing import Any, Dict, List
+
+from models.schemas import RetrievalResult
+from services.micro_learning_service import MicroLearningService
+
+SECTION = """SECTION {n}: Group work in a large class
+DURATION: 3 min
+CONTENT: Split the class into groups of four and give every group a role card. """ + "Rotate roles each week so every child leads once. " * 12 + """
+
+ACTIVITY: Each group explains one solution to the class in two minutes.
+"""
+
+REPLY = "TITLE: Managing a Large Class\n\n" + "\n".join(SECTION.format(n=n) for n in range(1, 6))
+
+class RecordingRouter:
+    """Answers /api/chat with a fixed module and remembers what was sent."""
+
+    def __init__(self):
+        self.requests: List[List[Dict[str, str]]] = []
+
+    async def post(self, path: str, payload: Dict[str, Any], affinity=None, on_token=None) -> Dict[str, Any]:
+        self.requests.append([dict(m) for m in payload["messages"]])
+        return {"message": {"content": REPLY}}
+
+def cached_prefix_tokens(service: MicroLearningService, cached: List[Dict[str, str]], sent: List[Dict[str, str]]) -> int:
+    """Tokens of sent's leading messages that are identical to the cached sequence."""
+    tokens = 0
+    for old, new in zip(cached, sent):
+        if old != new:
+            break
+        tokens += service.prompt_builder.count_tokens(new["content"])
+    return tokens
+
+async def run(turns: int) -> None:
+    service = MicroLearningService()
+    router = RecordingRouter()
+    service.llm_service.router = router
+    context = [
+        RetrievalResult(text="Peer tutoring pairs a stronger reader with a weaker one. " * 20, score=1.0 - i / 10, metadata={})
+        for i in range(8)
+    ]
+
+    for turn in range(turns):
+        await service.generate_module(
+            challenge=f"Follow-up {turn}: how do I keep the back rows engaged?",
+            context=context,
+            conversation_history=[],
+            conversation_id=1
+        )
+        sent = router.requests[-1]
+        # system + this turn's prompt only means earlier turns were not replayed
+        replayed = len(sent) > 2
+        total = sum(service.prompt_builder.count_tokens(m["content"]) for m in sent)
+        reused = 0
+        if turn:
+            # Ollama's cache holds the previous request plus the reply it generated
+            previous = router.requests[-2] + [{"role": "assistant", "content": REPLY}]
+            reused = cached_prefix_tokens(service, previous, sent)
+        print(f"  turn {turn + 1}: {len(sent)} messages, ~{total} prompt tokens, "
+              f"~{reused} served from the KV cache{'' if replayed or not turn else ' (session restarted)'}")
+        if turn and not replayed:
+            raise SystemExit(f"Session was dropped before turn {turn + 1}")
+        if turn >= 2 and reused <= service.prompt_builder.count_tokens(sent[0]["content"]):
+            raise SystemExit(f"Turn {turn + 1} reused no more than the system prompt")
+
+    print("ok")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=3, help="Turns in the conversation")
+    args = parser.parse_args()
+    asyncio.run(run(args.turns))
@@ -0,0 +1,107 @@
+"""
+Translation throughput benchmark across backends and profiles.
+
+Reports sentences/sec for the one-by-one translate loop vs. batched
+translate_batch, and resident memory added by loading each backend. Each
+backend runs in its own process, so its memory figures are not inflated by
+backends measured before it.
+
+Run from the backend directory:
+    python -m benchmarks.translation_benchmark --target hin_Deva --count 32 \\
+        --backends torch torch-int8 --profiles fast best
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from config import settings
+from services.translation_service import TranslationService
+from utils.translation_backends import TRANSLATION_PROFILES
+
+SAMPLE_SECTIONS = [
+    "Start the class with a two-minute recap question.",
+    "Divide students into groups of four and give each group a picture card.",
+    "Ask each group to describe what they see, then share one sentence with the class.",
+    "Use local examples such as the village market to explain fractions.",
+    "Praise effort rather than the correct answer so quieter students participate.",
+    "At the end of the lesson, ask students to write one thing they learned and one question they still have. Collect these slips and use them to plan the next class.",
+]
+
+def current_rss_mb() -> float:
+    # Second field of statm is resident pages
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux; a high-water mark for this process
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def run_backend(target_language: str, count: int, backend: str, profiles: list) -> None:
+    # Unique texts, otherwise sentence dedup in translate_batch skews the result
+    texts = [
+        f"Lesson {i + 1}: {SAMPLE_SECTIONS[i % len(SAMPLE_SECTIONS)]}"
+        for i in range(count)
+    ]
+
+    # Fresh translation memory per run so every sentence hits the model
+    settings.TRANSLATION_MEMORY_PATH = os.path.join(tempfile.mkdtemp(), "translation_memory.db")
+
+    rss_before = current_rss_mb()
+    service = TranslationService(backend=backend)
+    rss_loaded = current_rss_mb()
+
+    # Warm up model weights and caches
+    service.backend.generate(texts[:1], target_language, "eng_Latn", num_beams=1)
+
+    print(f"\n== backend: {backend} (model memory ~{rss_loaded - rss_before:.0f} MB) ==", flush=True)
+    for profile in profiles:
+        num_beams = TRANSLATION_PROFILES[profile]["num_beams"]
+
+        start = time.perf_counter()
+        for text in texts:
+            service.backend.generate([text], target_language, "eng_Latn", num_beams=num_beams)
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await service.translate_batch(texts, target_language=target_language, profile=profile)
+        batch_seconds = time.perf_counter() - start
+
+        print(
+            f"{profile:>9}: loop {count / loop_seconds:6.2f} sent/s | "
+            f"batched {count / batch_seconds:6.2f} sent/s | "
+            f"speedup {loop_seconds / batch_seconds:.2f}x | "
+            f"RSS {current_rss_mb():.0f} MB (peak {peak_rss_mb():.0f} MB)",
+            flush=True
+        )
+
+def backend_process(*args) -> None:
+    asyncio.run(run_backend(*args))
+
+def run(target_language: str, count: int, backends: list, profiles: list) -> None:
+    # A fresh interpreter per backend: freed model memory is not always
+    # returned to the OS, and ru_maxrss never goes down
+    context = multiprocessing.get_context("spawn")
+    for backend in backends:
+        process = context.Process(
+            target=backend_process,
+            args=(target_language, count, backend, profiles)
+        )
+        process.start()
+        process.join()
+        if process.exitcode:
+            print(f"backend {backend} failed (exit code {process.exitcode})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", default="hin_Deva", help="Target language code")
+    parser.add_argument("--count", type=int, default=32, help="Number of texts to translate")
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8"],
+                        help="Backends: torch, torch-int8, ctranslate2")
+    parser.add_argument("--profiles", nargs="+", default=["fast", "balanced", "best"],
+                        help="Profiles: fast, balanced, best")
+    args = parser.parse_args()
+    run(args.target, args.count, args.backends, args.profiles)
@@ -2,7 +2,7 @@
 Main config for the backend. Use .env to override these if needed.
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Dict
 from functools import lru_cache
 
 class Settings(BaseSettings):
@@ -22,12 +22,28 @@ class Settings(BaseSettings):
     # LLM Stuff (Ollama)
     LLM_MODEL: str = "ministral:3b"
     LLM_BASE_URL: str = "http://localhost:11434"
+    LLM_BASE_URLS: List[str] = []  # multiple Ollama instances; overrides LLM_BASE_URL
+    LLM_HEDGE_AFTER: float = 0.0  # seconds before duplicating a slow request (0 = off)
+    LLM_BACKEND_MAX_FAILURES: int = 3
+    LLM_BACKEND_COOLDOWN: float = 30.0
+    LLM_HEALTH_CHECK_INTERVAL: float = 15.0  # seconds between backend probes (0 = only on failures)
+    LLM_AFFINITY_CACHE_SIZE: int = 4096  # conversations remembered for backend affinity
+    LLM_DISCONNECT_POLL_INTERVAL: float = 1.0  # seconds between client disconnect checks
     LLM_TEMPERATURE: float = 0.6
     LLM_MAX_TOKENS: int = 4096
     LLM_REPEAT_PENALTY: float = 1.2
     LLM_TOP_P: float = 0.9
     LLM_REQUEST_TIMEOUT: float = 60.0
-    
+    LLM_KEEP_ALIVE: str = "30m"  # keep model (and its KV cache) resident
+    LLM_SESSION_CACHE_SIZE: int = 256  # conversations whose prompt prefix we replay
+
+    # Prompt budgeting (tokens) - keeps prefill time predictable
+    LLM_CONTEXT_WINDOW: int = 8192
+    LLM_PROMPT_TOKEN_BUDGET: int = 3072
+    LLM_HISTORY_TOKEN_BUDGET: int = 512
+    LLM_CHARS_PER_TOKEN: float = 3.5
+    LLM_REPLY_TOKEN_RESERVE: int = 1536  # typical module reply; kept free when replaying a session
+
     # RAG / Embeddings
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DIMENSION: int = 384
@@ -37,11 +53,26 @@ class Settings(BaseSettings):
     
     # Language Support - NLLB model
     TRANSLATION_MODEL: str = "facebook/nllb-200-distilled-600M"
+    TRANSLATION_BACKEND: str = "torch"  # torch | torch-int8 | ctranslate2
+    TRANSLATION_CT2_MODEL_DIR: str = "./data/nllb-ct2-int8"
+    TRANSLATION_DEFAULT_PROFILE: str = "best"  # fast | balanced | best
     SUPPORTED_LANGUAGES: List[str] = [
         "eng_Latn", "hin_Deva", "ben_Beng", "tam_Taml",
         "tel_Telu", "mar_Deva", "bho_Deva", "mai_Deva",
         "mag_Deva", "san_Deva", "urd_Arab"
     ]
+    TRANSLATION_BATCH_TOKENS: int = 4096  # padded input tokens per generate call
+    TRANSLATION_MAX_BATCH_SIZE: int = 32
+    TRANSLATION_SEGMENT_MAX_CHARS: int = 600  # longer sentences are split at clauses
+    TRANSLATION_BATCH_WINDOW_MS: float = 15.0  # wait for concurrent requests to join a batch
+    TRANSLATION_MAX_QUEUE_DEPTH: int = 256
+    
+    # District -> dialects that new modules are pre-translated into
+    DISTRICT_DIALECTS: Dict[str, List[str]] = {}
+    DEFAULT_PRETRANSLATE_LANGUAGES: List[str] = ["hin_Deva"]
+    TRANSLATION_MEMORY_PATH: str = "./data/translation_memory.db"
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = 200000
+    TRANSLATION_MEMORY_EVICT_FRACTION: float = 0.05  # share of entries dropped once the limit is hit
     
     # Document Processing configs
     CHUNK_SIZE: int = 800
@@ -52,8 +83,52 @@ class Settings(BaseSettings):
     MODULE_TARGET_DURATION: int = 15
     MODULE_MAX_SECTIONS: int = 5
     
+    # Conversation history: last N messages verbatim, older turns as a rolling summary
+    HISTORY_WINDOW_MESSAGES: int = 4
+    HISTORY_SUMMARY_MAX_TOKENS: int = 200
+    HISTORY_SUMMARY_BATCH: int = 40  # max older messages folded into the summary per update
+    
+    # Idle-time precomputation of modules for trending challenges
+    PRECOMPUTE_ENABLED: bool = True
+    PRECOMPUTE_INTERVAL: float = 3600.0  # seconds between refreshes
+    PRECOMPUTE_IDLE_POLL: float = 5.0
+    PRECOMPUTE_QUERY_WINDOW: int = 500  # recent user queries to cluster
+    PRECOMPUTE_TOP_CLUSTERS: int = 10
+    PRECOMPUTE_MIN_CLUSTER_SIZE: int = 3
+    PRECOMPUTE_SIMILARITY: float = 0.85  # cosine threshold for clustering and serving
+    PRECOMPUTE_DURATIONS: List[int] = [5, 15, 40]
+    
     # DB (switch to Postgres later if needed)
     DATABASE_URL: str = "sqlite:///./data/pragati.db"
+    DB_BUSY_TIMEOUT_MS: int = 5000  # wait this long for a lock before "database is locked"
+    DB_STATEMENT_CACHE_SIZE: int = 256  # prepared statements cached per connection
+    DB_THREADS: int = 4  # reader threads running sqlite queries off the event loop (plus one writer)
+    DB_GROUP_COMMIT_WINDOW_MS: float = 2.0  # how long message/feedback writes wait to share a commit
+    DB_GROUP_COMMIT_MAX_BATCH: int = 128
+    DB_WRITER_SYNCHRONOUS: str = "FULL"  # fsync every (group) commit so acknowledged writes survive power loss
+    MODULE_COMPRESSION_LEVEL: int = 6  # zlib level for stored module payloads
+    PAGE_DEFAULT_LIMIT: int = 50  # keyset-paginated list endpoints
+    PAGE_MAX_LIMIT: int = 200
+    ARCHIVE_DATABASE_URL: str = ""  # defaults to <database>_archive.db next to DATABASE_URL
+    RETENTION_ENABLED: bool = True
+    RETENTION_DAYS: int = 180  # conversations idle this long, and older feedback, move to the archive
+    RETENTION_BATCH: int = 100  # conversations (or 10x feedback rows) archived per transaction
+    MAINTENANCE_HOURS: List[int] = [2, 3, 4]  # local hours when archival and compaction run
+    MAINTENANCE_POLL: float = 600.0
+    COMPACT_STEP_PAGES: int = 2048  # pages returned to the OS per incremental vacuum step
+    
+    # Live dashboard (server-sent events)
+    DASHBOARD_RECENT_LIMIT: int = 50  # recent feedback/queries kept in the shared snapshot
+    DASHBOARD_PUSH_INTERVAL: float = 0.5  # seconds of writes folded into one refresh and push
+    DASHBOARD_SNAPSHOT_TTL: float = 300.0  # full reload after this long (picks up out-of-process writes)
+    DASHBOARD_HEARTBEAT: float = 15.0  # keep-alive comment interval on idle streams
+    DASHBOARD_SUBSCRIBER_QUEUE: int = 100  # events buffered per dashboard before it is resynced
+    DASHBOARD_RECONNECT_MS: int = 3000
+    
+    # Response encoding (ETag/304 on GETs, compression, optional MessagePack)
+    COMPRESSION_MIN_BYTES: int = 1024  # smaller bodies aren't worth a compression frame
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 5  # 4-6 is the usual size/CPU sweet spot for dynamic responses
     
     class Config:
         env_file = ".env"
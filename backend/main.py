@@ -4,11 +4,14 @@ FastAPI Backend Application Entry Point
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
-from api.routes import router
+from api.routes import router, micro_learning_service, precompute_service, retention_service
 from config import settings
+from utils.http_encoding import ResponseEncodingMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -20,22 +23,47 @@ async def lifespan(app: FastAPI):
     
     # Initialize Database
     try:
-        from utils.db_utils import init_db
-        init_db()
+        from utils.async_db import init_db
+        await init_db()
         print("Database initialized successfully")
     except Exception as e:
         print(f"Database initialization failed: {e}")
     
+    # Start idle-time module precomputation
+    precompute_task = None
+    if settings.PRECOMPUTE_ENABLED:
+        precompute_task = asyncio.create_task(precompute_service.run_forever())
+    
+    # Probe Ollama backends so dead ones leave rotation
+    health_task = None
+    if settings.LLM_HEALTH_CHECK_INTERVAL > 0:
+        health_task = asyncio.create_task(micro_learning_service.llm_service.run_health_checks())
+    
+    # Off-hours archival and compaction
+    retention_task = None
+    if settings.RETENTION_ENABLED:
+        retention_task = asyncio.create_task(retention_service.run_forever())
+    
     yield
     
     # Shutdown
     print("PRAGATI Backend Shutting Down...")
+    if precompute_task:
+        precompute_task.cancel()
+    if retention_task:
+        retention_task.cancel()
+    if health_task:
+        health_task.cancel()
+    
+    from utils import async_db
+    await async_db.shutdown()
 
 app = FastAPI(
     title="PRAGATI API",
     description="AI-Powered Educational Platform for Teacher Training",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
 )
@@ -49,6 +77,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ETags/304s, compression and MessagePack for JSON responses
+app.add_middleware(ResponseEncodingMiddleware)
+
 # Include API routes
 app.include_router(router, prefix="/api")
 
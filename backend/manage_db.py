@@ -0,0 +1,85 @@
+"""
+PRAGATI database maintenance commands.
+
+Run from the backend directory:
+    python manage_db.py migrate
+    python manage_db.py rebuild-rollups
+    python manage_db.py rebuild-search
+    python manage_db.py archive [--days 180]
+    python manage_db.py restore <conversation_id>
+    python manage_db.py vacuum
+"""
+import argparse
+import asyncio
+import logging
+
+from utils import async_db, db_utils
+
+def migrate(args: argparse.Namespace) -> None:
+    db_utils.init_db()
+    print(f"Database at {db_utils.DB_PATH} is up to date")
+
+def rebuild_rollups(args: argparse.Namespace) -> None:
+    db_utils.rebuild_rollups()
+    stats = db_utils.get_feedback_stats()
+    print(f"Rollups rebuilt: {stats['total_count']} feedback rows, average rating {stats['average_rating']}")
+
+def rebuild_search(args: argparse.Namespace) -> None:
+    db_utils.rebuild_search_index()
+    print("Search index rebuilt")
+
+def archive(args: argparse.Namespace) -> None:
+    from config import settings
+    from services.retention_service import RetentionService
+
+    if args.days is not None:
+        settings.RETENTION_DAYS = args.days
+
+    async def run():
+        try:
+            return await RetentionService().run_once()
+        finally:
+            await async_db.shutdown()
+
+    result = asyncio.run(run())
+    print(f"Archived {result['conversations_archived']} conversations and {result['feedback_archived']} "
+          f"feedback rows to {db_utils.archive_path()}, freed {result['pages_freed']} pages")
+
+def restore(args: argparse.Namespace) -> None:
+    if db_utils.restore_conversation(args.conversation_id):
+        print(f"Conversation {args.conversation_id} restored")
+    else:
+        print(f"Conversation {args.conversation_id} is not in the archive")
+
+def vacuum(args: argparse.Namespace) -> None:
+    db_utils.vacuum_database()
+    print(f"Database at {db_utils.DB_PATH} rebuilt with incremental auto-vacuum")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="Apply pending schema migrations").set_defaults(run=migrate)
+    commands.add_parser(
+        "rebuild-rollups",
+        help="Recompute feedback/message rollup tables from raw rows (backfill or repair)"
+    ).set_defaults(run=rebuild_rollups)
+    commands.add_parser(
+        "rebuild-search",
+        help="Re-index messages, conversations and modules for full-text search"
+    ).set_defaults(run=rebuild_search)
+    archive_parser = commands.add_parser(
+        "archive",
+        help="Move old conversations and feedback to the archive database now, then compact"
+    )
+    archive_parser.add_argument("--days", type=int, help="Override RETENTION_DAYS")
+    archive_parser.set_defaults(run=archive)
+    restore_parser = commands.add_parser("restore", help="Bring an archived conversation back")
+    restore_parser.add_argument("conversation_id", type=int)
+    restore_parser.set_defaults(run=restore)
+    commands.add_parser(
+        "vacuum",
+        help="Full VACUUM (stop the server first); switches older databases to incremental auto-vacuum"
+    ).set_defaults(run=vacuum)
+    args = parser.parse_args()
+    args.run(args)
@@ -2,9 +2,12 @@
 Pydantic models for request/response validation.
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
+# Keys of utils.translation_backends.TRANSLATION_PROFILES
+TranslationProfile = Literal["fast", "balanced", "best"]
+
 # ============= Request Models =============
 
 class GenerateModuleRequest(BaseModel):
@@ -14,12 +17,23 @@ class GenerateModuleRequest(BaseModel):
     difficulty_level: Optional[str] = Field("intermediate", description="Difficulty level")
     conversation_id: Optional[int] = Field(None, description="Conversation ID for contextual refinement")
     language: Optional[str] = Field("eng_Latn", description="Target language code")
+    district: Optional[str] = Field(None, description="Teacher's district, for dialect pre-translation")
+    pretranslate: Optional[bool] = Field(False, description="Pre-translate the module into the district's dialects in the background")
 
 class TranslateRequest(BaseModel):
     """Request model for content translation."""
     text: str = Field(..., description="Text to translate")
     target_language: str = Field(..., description="Target language code (e.g., hin_Deva)")
     source_language: Optional[str] = Field("eng_Latn", description="Source language code")
+    profile: Optional[TranslationProfile] = Field(None, description="Translation profile: fast, balanced or best")
+
+class TranslateModuleRequest(BaseModel):
+    """Request model for translating a whole module."""
+    module_id: Optional[str] = Field(None, description="ID of a previously generated module")
+    module: Optional["Module"] = Field(None, description="Module payload (used if module_id is not given)")
+    target_language: str = Field(..., description="Target language code (e.g., hin_Deva)")
+    source_language: Optional[str] = Field(None, description="Source language code (defaults to the module's language)")
+    profile: Optional[TranslationProfile] = Field(None, description="Translation profile: fast, balanced or best")
 
 class FeedbackRequest(BaseModel):
     """Request model for module feedback."""
@@ -57,6 +71,11 @@ class GenerateModuleResponse(BaseModel):
     module: Module
     message: Optional[str] = None
 
+class TranslateModuleResponse(BaseModel):
+    """Response model for whole-module translation."""
+    success: bool
+    module: Module
+
 class TranslateResponse(BaseModel):
     """Response model for translation."""
     success: bool
@@ -90,3 +109,5 @@ class RetrievalResult(BaseModel):
     text: str
     score: float
     metadata: Dict[str, Any]
+
+TranslateModuleRequest.model_rebuild()
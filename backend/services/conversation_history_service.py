@@ -0,0 +1,118 @@
+"""
+Conversation History Service - Windowed history with a rolling per-conversation summary.
+"""
+import logging
+from typing import List, Dict, Any, Set
+
+from config import settings
+from services.llm_service import LLMService
+from utils.async_db import (
+    get_recent_turns,
+    get_turns_between,
+    get_conversation_summary,
+    save_conversation_summary
+)
+
+logger = logging.getLogger(__name__)
+
+class ConversationHistoryService:
+    """
+    Supply prompt history as: rolling summary + last HISTORY_WINDOW_MESSAGES messages.
+
+    Reads stay bounded however long a conversation gets: one summary row and
+    a fixed number of recent messages. Turns that leave the window are folded
+    into the summary in the background after each response.
+    """
+
+    def __init__(self, llm_service: LLMService):
+        self.llm_service = llm_service
+        self.window = settings.HISTORY_WINDOW_MESSAGES
+        self._updating: Set[int] = set()
+
+        logger.info("Conversation History Service initialized")
+
+    async def load(self, conversation_id: int) -> List[Dict[str, str]]:
+        """
+        Get prompt history for a conversation.
+
+        Returns:
+            Messages in chronological order; when older turns exist, the first
+            entry has role "summary" and holds the rolling summary
+        """
+        summary = await get_conversation_summary(conversation_id)
+        turns = await get_recent_turns(conversation_id, self.window)
+
+        history = []
+        if summary and summary["summary"]:
+            history.append({"role": "summary", "content": summary["summary"]})
+        history.extend(
+            {"role": turn["role"], "content": self._turn_text(turn)}
+            for turn in turns
+        )
+        return history
+
+    async def update_summary(self, conversation_id: int) -> bool:
+        """
+        Fold turns that have left the history window into the rolling summary.
+
+        Returns:
+            True if the summary changed
+        """
+        if conversation_id in self._updating:
+            return False
+        self._updating.add(conversation_id)
+        try:
+            turns = await get_recent_turns(conversation_id, self.window)
+            if len(turns) < self.window:
+                return False
+
+            summary = await get_conversation_summary(conversation_id)
+            previous = summary["summary"] if summary else ""
+            summarized_until = summary["summarized_until"] if summary else 0
+
+            # Everything older than the window that the summary has not seen yet
+            pending = await get_turns_between(
+                conversation_id,
+                after_id=summarized_until,
+                before_id=turns[0]["id"],
+                limit=settings.HISTORY_SUMMARY_BATCH
+            )
+            if not pending:
+                return False
+
+            updated = await self.llm_service.generate(
+                prompt=self._build_summary_prompt(previous, pending),
+                system_prompt="You maintain brief running summaries of teacher training conversations.",
+                max_tokens=settings.HISTORY_SUMMARY_MAX_TOKENS,
+                temperature=0.2
+            )
+            await save_conversation_summary(conversation_id, updated.strip(), pending[-1]["id"])
+            logger.info(f"Summarized {len(pending)} older messages of conversation {conversation_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error updating summary for conversation {conversation_id}: {str(e)}")
+            return False
+        finally:
+            self._updating.discard(conversation_id)
+
+    def _turn_text(self, turn: Dict[str, Any]) -> str:
+        """Message text, naming the module for assistant turns that produced one."""
+        if turn.get("module_title"):
+            return f"{turn['content']}: {turn['module_title']}"
+        return turn["content"]
+
+    def _build_summary_prompt(self, previous: str, turns: List[Dict[str, Any]]) -> str:
+        """Build the prompt that extends a summary with newly aged-out turns."""
+        transcript = "\n".join(
+            f"{'Teacher' if turn['role'] == 'user' else 'Assistant'}: {self._turn_text(turn)}"
+            for turn in turns
+        )
+        return f"""Current summary of the conversation so far:
+{previous or "(none yet)"}
+
+New messages to add:
+{transcript}
+
+Rewrite the summary to include the new messages. Keep the teacher's classroom
+context, challenges raised and modules already provided. At most 120 words, plain prose."""
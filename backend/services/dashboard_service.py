@@ -0,0 +1,198 @@
+"""
+Dashboard Service - One shared dashboard snapshot, pushed to every open DIET dashboard.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+import orjson
+
+from config import settings
+from utils.async_db import (
+    get_feedback_page,
+    get_feedback_since,
+    get_feedback_stats,
+    get_queries_since,
+    get_recent_queries_page
+)
+
+logger = logging.getLogger(__name__)
+
+# Queued in place of events a subscriber fell too far behind to receive
+_RESYNC = object()
+
+def format_event(event: str, data: Any) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {orjson.dumps(data, default=str).decode()}\n\n"
+
+class DashboardService:
+    """
+    In-process fan-out of dashboard updates.
+
+    The dashboard's data (aggregates, recent feedback, recent queries) is
+    loaded from the DB once and kept in memory. Routes call notify() after a
+    feedback or query write has committed; a burst of notifications within
+    DASHBOARD_PUSH_INTERVAL is folded into one refresh that reads only the
+    rows added since the last one plus the rollup-backed stats, and the
+    result is broadcast to every subscribed dashboard. N open dashboards
+    therefore cost one set of queries per burst of writes instead of N full
+    reloads per poll interval.
+    """
+
+    def __init__(self):
+        self.recent_limit = settings.DASHBOARD_RECENT_LIMIT
+
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._loaded_at = 0.0
+        self._last_feedback_id = 0
+        self._last_query_id = 0
+        self._load_lock: asyncio.Lock = None
+
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._pending: Set[str] = set()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self._refreshes = 0
+        self._events_sent = 0
+        self._resyncs = 0
+
+        logger.info("Dashboard Service initialized")
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """
+        Current dashboard data: {stats, recent_feedback, recent_queries}.
+
+        Served from memory; reloaded from the DB when missing or older than
+        DASHBOARD_SNAPSHOT_TTL (catches writes made outside this process,
+        e.g. archival or manage_db).
+        """
+        if self._snapshot is None or time.monotonic() - self._loaded_at > settings.DASHBOARD_SNAPSHOT_TTL:
+            if self._load_lock is None:
+                self._load_lock = asyncio.Lock()
+            async with self._load_lock:
+                if self._snapshot is None or time.monotonic() - self._loaded_at > settings.DASHBOARD_SNAPSHOT_TTL:
+                    await self._load()
+        return self._snapshot
+
+    async def _load(self) -> None:
+        """Full reload from the DB."""
+        stats = await get_feedback_stats()
+        recent_feedback, _ = await get_feedback_page(limit=self.recent_limit)
+        recent_queries, _ = await get_recent_queries_page(limit=self.recent_limit)
+
+        self._last_feedback_id = max((row["id"] for row in recent_feedback), default=self._last_feedback_id)
+        self._last_query_id = max((row["id"] for row in recent_queries), default=self._last_query_id)
+        self._snapshot = {
+            "stats": stats,
+            "recent_feedback": recent_feedback,
+            "recent_queries": recent_queries
+        }
+        self._loaded_at = time.monotonic()
+
+    def notify(self, kind: str) -> None:
+        """
+        Note that new rows of kind ("feedback" or "query") have been committed.
+
+        Cheap and non-blocking; the refresh runs shortly after in the background.
+        """
+        if self._snapshot is None and not self._subscribers:
+            # Nobody is watching; the next snapshot() loads from scratch
+            return
+        self._pending.add(kind)
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        """Read what changed since the last refresh and broadcast it."""
+        # Let the rest of the burst of writes arrive
+        await asyncio.sleep(settings.DASHBOARD_PUSH_INTERVAL)
+        while self._pending:
+            kinds, self._pending = self._pending, set()
+            try:
+                await self._apply(kinds)
+            except Exception as e:
+                logger.error(f"Error refreshing dashboard: {str(e)}")
+                # Start over from the DB next time anyone asks
+                self._snapshot = None
+                self._broadcast(_RESYNC)
+                return
+
+    async def _apply(self, kinds: Set[str]) -> None:
+        """Fold new feedback/queries and fresh stats into the snapshot, then push them."""
+        loaded_at = self._loaded_at
+        snapshot = await self.snapshot()
+        if self._loaded_at != loaded_at:
+            # Reloaded from scratch (expired or reset): it already holds the new rows
+            self._broadcast(format_event("snapshot", snapshot))
+            return
+        events = []
+
+        if "feedback" in kinds:
+            rows = await get_feedback_since(self._last_feedback_id, self.recent_limit)
+            if rows:
+                self._last_feedback_id = rows[-1]["id"]
+                snapshot["recent_feedback"] = (rows[::-1] + snapshot["recent_feedback"])[:self.recent_limit]
+                events.append(("feedback", rows))
+        if "query" in kinds:
+            rows = await get_queries_since(self._last_query_id, self.recent_limit)
+            if rows:
+                self._last_query_id = rows[-1]["id"]
+                snapshot["recent_queries"] = (rows[::-1] + snapshot["recent_queries"])[:self.recent_limit]
+                events.append(("query", rows))
+
+        # Feedback moves every aggregate; queries move the daily query counts
+        if events:
+            snapshot["stats"] = await get_feedback_stats()
+            events.append(("stats", snapshot["stats"]))
+
+        self._refreshes += 1
+        for event, data in events:
+            self._broadcast(format_event(event, data))
+
+    def _broadcast(self, message: Any) -> None:
+        """Queue an encoded event (encoded once, shared by all subscribers)."""
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(message)
+                self._events_sent += 1
+            except asyncio.QueueFull:
+                # Too slow to keep up: drop its backlog and send a fresh snapshot instead
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_RESYNC)
+                self._resyncs += 1
+
+    async def stream(self) -> AsyncIterator[str]:
+        """
+        Server-sent events for one dashboard: a snapshot, then feedback,
+        query and stats events as they happen, with keep-alive comments in
+        between. Unsubscribes when the client goes away.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.DASHBOARD_SUBSCRIBER_QUEUE)
+        # Subscribe before reading the snapshot so nothing committed in between is missed
+        self._subscribers.add(queue)
+        try:
+            yield f"retry: {settings.DASHBOARD_RECONNECT_MS}\n\n"
+            yield format_event("snapshot", await self.snapshot())
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.DASHBOARD_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is _RESYNC:
+                    yield format_event("snapshot", await self.snapshot())
+                else:
+                    yield message
+        finally:
+            self._subscribers.discard(queue)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscriber and push counters."""
+        return {
+            "subscribers": len(self._subscribers),
+            "refreshes": self._refreshes,
+            "events_sent": self._events_sent,
+            "resyncs": self._resyncs
+        }
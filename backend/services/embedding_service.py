@@ -1,6 +1,8 @@
 """
 Embedding Service - Generate embeddings using HuggingFace models.
 """
+import asyncio
+import functools
 import logging
 from typing import List
 from sentence_transformers import SentenceTransformer
@@ -36,12 +38,15 @@ class EmbeddingService:
             List of embedding vectors
         """
         try:
-            # Generate embeddings
-            embeddings = self.model.encode(
+            # Batches (ingest, precompute clustering) take long enough to
+            # stall every request, so they run on a worker thread
+            loop = asyncio.get_running_loop()
+            embeddings = await loop.run_in_executor(None, functools.partial(
+                self.model.encode,
                 texts,
                 convert_to_numpy=True,
                 show_progress_bar=len(texts) > 10
-            )
+            ))
             
             # Convert to list of lists
             embeddings_list = embeddings.tolist()
@@ -2,10 +2,12 @@
 LLM Service - Integration with Ollama for text generation.
 """
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
+from collections import OrderedDict
 import httpx
 
 from config import settings
+from utils.llm_router import LLMRouter
 
 logger = logging.getLogger(__name__)
 
@@ -13,12 +15,24 @@ class LLMService:
     """Service for LLM-based text generation using Ollama."""
     
     def __init__(self):
-        self.base_url = settings.LLM_BASE_URL
+        self.router = LLMRouter(
+            base_urls=settings.LLM_BASE_URLS or [settings.LLM_BASE_URL],
+            hedge_after=settings.LLM_HEDGE_AFTER,
+            max_failures=settings.LLM_BACKEND_MAX_FAILURES,
+            cooldown=settings.LLM_BACKEND_COOLDOWN,
+            max_affinity=settings.LLM_AFFINITY_CACHE_SIZE
+        )
         self.model = settings.LLM_MODEL
         self.temperature = settings.LLM_TEMPERATURE
         self.max_tokens = settings.LLM_MAX_TOKENS
         self.repeat_penalty = settings.LLM_REPEAT_PENALTY
         self.top_p = settings.LLM_TOP_P
+        self.context_window = settings.LLM_CONTEXT_WINDOW
+        self.keep_alive = settings.LLM_KEEP_ALIVE
+        self.session_cache_size = settings.LLM_SESSION_CACHE_SIZE
+        
+        # conversation_id -> exact chat messages sent so far (stable prefix)
+        self._sessions: "OrderedDict[int, List[Dict[str, str]]]" = OrderedDict()
         logger.info(f"LLM Service initialized with model: {self.model}")
     
     async def generate(
@@ -28,11 +42,22 @@ class LLMService:
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         repeat_penalty: Optional[float] = None,
-        top_p: Optional[float] = None
+        top_p: Optional[float] = None,
+        conversation_id: Optional[int] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        session_prompt: Optional[str] = None
     ) -> str:
         """
         Generate text using the LLM.
         
+        When a conversation_id is given, the messages of earlier turns are
+        replayed as a byte-identical prefix so Ollama can reuse its KV cache
+        and only prefill the new prompt. session_prompt, if given, is what
+        this turn's user message becomes in that transcript: one-off bulk
+        such as retrieved context is sent once and not replayed forever.
+        The next turn then diverges from Ollama's cache at this message, so
+        it re-prefills this turn and reuses everything before it.
+        
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
@@ -40,38 +65,90 @@ class LLMService:
             max_tokens: Max tokens to generate (overrides default)
             repeat_penalty: Penalty for repetition (overrides default)
             top_p: Nucleus sampling probability (overrides default)
+            conversation_id: Conversation whose session prefix should be reused
+            on_token: Optional callback receiving text as it streams in
+            session_prompt: Compact stand-in for prompt in the session transcript
+        
+        Returns:
+            Generated text
+        """
+        messages = self.get_session(conversation_id, system_prompt)
+        if messages is None:
+            messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        
+        generated_text = await self.chat(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            repeat_penalty=repeat_penalty,
+            top_p=top_p,
+            conversation_id=conversation_id,
+            on_token=on_token
+        )
+        
+        if conversation_id is not None:
+            if session_prompt is not None:
+                messages[-1] = {"role": "user", "content": session_prompt}
+            messages.append({"role": "assistant", "content": generated_text})
+            self._store_session(conversation_id, messages)
+        
+        return generated_text
+    
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        repeat_penalty: Optional[float] = None,
+        top_p: Optional[float] = None,
+        conversation_id: Optional[int] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Generate a reply using the Ollama chat API.
+        
+        Args:
+            messages: Chat messages (role/content dicts), oldest first
+            temperature: Sampling temperature (overrides default)
+            max_tokens: Max tokens to generate (overrides default)
+            repeat_penalty: Penalty for repetition (overrides default)
+            top_p: Nucleus sampling probability (overrides default)
+            conversation_id: Routing affinity so follow-ups hit the same backend
+            on_token: Optional callback receiving text as it streams in
         
         Returns:
             Generated text
         """
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature or self.temperature,
-                        "num_predict": max_tokens or self.max_tokens,
-                        "repeat_penalty": repeat_penalty or self.repeat_penalty,
-                        "top_p": top_p or self.top_p
-                    }
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "stream": True,
+                "keep_alive": self.keep_alive,
+                "options": {
+                    "temperature": temperature or self.temperature,
+                    "num_predict": max_tokens or self.max_tokens,
+                    "repeat_penalty": repeat_penalty or self.repeat_penalty,
+                    "top_p": top_p or self.top_p,
+                    "num_ctx": self.context_window
                 }
-                
-                if system_prompt:
-                    payload["system"] = system_prompt
-                
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                generated_text = result.get("response", "")
-                
-                logger.info(f"Generated {len(generated_text)} characters")
-                return generated_text
+            }
+            
+            result = await self.router.post(
+                "/api/chat",
+                payload,
+                affinity=conversation_id,
+                on_token=on_token
+            )
+            generated_text = result.get("message", {}).get("content", "")
+            
+            logger.info(
+                f"Generated {len(generated_text)} characters "
+                f"(prompt_tokens={result.get('prompt_eval_count')}, "
+                f"completion_tokens={result.get('eval_count')})"
+            )
+            return generated_text
                 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error calling Ollama: {str(e)}")
@@ -80,6 +157,40 @@ class LLMService:
             logger.error(f"Error generating text: {str(e)}")
             raise
     
+    def get_session(
+        self,
+        conversation_id: Optional[int],
+        system_prompt: Optional[str] = None
+    ) -> Optional[List[Dict[str, str]]]:
+        """
+        Get a copy of the cached chat transcript for a conversation.
+        
+        Returns None when there is no session, or when the system prompt has
+        changed (the prefix would no longer match Ollama's cache).
+        """
+        if conversation_id is None or conversation_id not in self._sessions:
+            return None
+        
+        messages = self._sessions[conversation_id]
+        cached_system = messages[0]["content"] if messages and messages[0]["role"] == "system" else None
+        if cached_system != system_prompt:
+            self.drop_session(conversation_id)
+            return None
+        
+        self._sessions.move_to_end(conversation_id)
+        return list(messages)
+    
+    def drop_session(self, conversation_id: int) -> None:
+        """Forget the cached transcript for a conversation."""
+        self._sessions.pop(conversation_id, None)
+    
+    def _store_session(self, conversation_id: int, messages: List[Dict[str, str]]) -> None:
+        """Cache a conversation transcript, evicting the least recently used."""
+        self._sessions[conversation_id] = messages
+        self._sessions.move_to_end(conversation_id)
+        while len(self._sessions) > self.session_cache_size:
+            self._sessions.popitem(last=False)
+    
     async def generate_with_context(
         self,
         query: str,
@@ -124,12 +235,32 @@ Please provide a comprehensive response based on the context above."""
             logger.error(f"Error generating with context: {str(e)}")
             raise
     
+    def in_flight(self) -> int:
+        """Number of LLM requests currently running across all backends."""
+        return sum(b.in_flight for b in self.router.backends)
+    
+    def foreground_in_flight(self) -> int:
+        """Running LLM requests that are not background work (see llm_router.background_request)."""
+        return self.in_flight() - self.router.background_in_flight
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get routing and cancellation counters."""
+        return {
+            **self.router.stats,
+            "backends": [
+                {
+                    "base_url": b.base_url,
+                    "healthy": b.healthy,
+                    "in_flight": b.in_flight
+                }
+                for b in self.router.backends
+            ]
+        }
+    
     async def check_health(self) -> bool:
-        """Check if Ollama service is available."""
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                return response.status_code == 200
-        except Exception as e:
-            logger.error(f"Ollama health check failed: {str(e)}")
-            return False
+        """Check if at least one Ollama backend is available."""
+        return await self.router.check_health()
+    
+    async def run_health_checks(self) -> None:
+        """Background loop: probe the backends so dead ones leave rotation before a request hits them."""
+        await self.router.run_health_checks(settings.LLM_HEALTH_CHECK_INTERVAL)
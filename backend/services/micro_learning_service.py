@@ -2,11 +2,13 @@
 Micro-Learning Service - Generate micro-learning modules from content.
 """
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import uuid
 from datetime import datetime
 
+from config import settings
 from services.llm_service import LLMService
+from utils.prompt_builder import PromptBuilder
 from models.schemas import Module, ModuleSection, RetrievalResult
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,7 @@ class MicroLearningService:
     
     def __init__(self):
         self.llm_service = LLMService()
+        self.prompt_builder = PromptBuilder()
         logger.info("Micro-Learning Service initialized")
     
     async def generate_module(
@@ -24,7 +27,9 @@ class MicroLearningService:
         context: List[RetrievalResult],
         target_duration: int = 15,
         difficulty_level: str = "intermediate",
-        conversation_history: List[Dict[str, str]] = None
+        conversation_history: List[Dict[str, str]] = None,
+        conversation_id: Optional[int] = None,
+        on_section: Optional[Callable[[int, ModuleSection], None]] = None
     ) -> Module:
         """
         Generate a micro-learning module based on teacher's challenge.
@@ -34,34 +39,65 @@ class MicroLearningService:
             context: Retrieved relevant content chunks
             target_duration: Target duration in minutes
             difficulty_level: Module difficulty level
-            conversation_history: Previous messages for context (optional)
+            conversation_history: Previous messages for context, optionally led by a
+                {"role": "summary"} entry covering older turns (optional)
+            conversation_id: Conversation to reuse the LLM prompt prefix for (optional)
+            on_section: Called with (index, section) as soon as each section has
+                finished streaming, before the rest of the module is written
         
         Returns:
             Generated micro-learning module
         """
         try:
-            # Extract context text
-            context_texts = [result.text for result in context]
-            
             # Build system prompt
             system_prompt = self._build_system_prompt(
                 target_duration=target_duration,
                 difficulty_level=difficulty_level
             )
             
-            # Build generation prompt with conversation history
-            generation_prompt = self._build_generation_prompt(
-                challenge=challenge,
-                context_texts=context_texts,
-                target_duration=target_duration,
-                conversation_history=conversation_history or []
+            # If the LLM already holds this conversation's transcript, the
+            # history is in the replayed prefix and must not be re-rendered
+            session = self.llm_service.get_session(conversation_id, system_prompt)
+            history = [] if session is not None else (conversation_history or [])
+            
+            # Build a single budgeted prompt: history and context are packed
+            # into LLM_PROMPT_TOKEN_BUDGET instead of being wrapped twice
+            generation_prompt, prompt_tokens = self._build_prompt(
+                challenge, context, target_duration, history, system_prompt
             )
             
+            if session is not None:
+                session_tokens = sum(
+                    self.prompt_builder.count_tokens(msg["content"])
+                    for msg in session[1:]
+                )
+                # Reserve what a module reply typically takes, not num_predict's
+                # ceiling, or no follow-up would ever fit next to the transcript
+                if (session_tokens + prompt_tokens + settings.LLM_REPLY_TOKEN_RESERVE
+                        > self.prompt_builder.context_window):
+                    # Transcript no longer fits; start a fresh prefix
+                    self.llm_service.drop_session(conversation_id)
+                    generation_prompt, prompt_tokens = self._build_prompt(
+                        challenge, context, target_duration,
+                        conversation_history or [], system_prompt
+                    )
+                else:
+                    prompt_tokens += session_tokens
+            
+            logger.info(f"Module prompt assembled: ~{prompt_tokens} tokens")
+            
+            # Later turns replay this one without its retrieved context
+            session_prompt = None
+            if conversation_id is not None:
+                session_prompt, _ = self._build_prompt(challenge, [], target_duration, [], system_prompt)
+            
             # Generate module content
-            generated_content = await self.llm_service.generate_with_context(
-                query=generation_prompt,
-                context_chunks=context_texts,
-                system_prompt=system_prompt
+            generated_content = await self.llm_service.generate(
+                prompt=generation_prompt,
+                system_prompt=system_prompt,
+                conversation_id=conversation_id,
+                on_token=self._section_watcher(on_section) if on_section else None,
+                session_prompt=session_prompt
             )
             
             # Parse generated content into structured module
@@ -102,28 +138,62 @@ Structure each module with:
 
 Keep language simple, clear, and encouraging."""
     
-    def _build_generation_prompt(
+    def _build_prompt(
         self,
         challenge: str,
-        context_texts: List[str],
+        context: List[RetrievalResult],
         target_duration: int,
-        conversation_history: List[Dict[str, str]] = None
+        conversation_history: List[Dict[str, str]],
+        system_prompt: str
+    ) -> Tuple[str, int]:
+        """Assemble the budgeted generation prompt and its token estimate."""
+        return self.prompt_builder.build(
+            template=self._build_generation_prompt(
+                target_duration=target_duration
+            ),
+            results=context,
+            conversation_history=conversation_history,
+            render_history=self._render_conversation_history,
+            system_prompt=system_prompt,
+            challenge=challenge
+        )
+    
+    def _render_conversation_history(
+        self,
+        conversation_history: List[Dict[str, str]]
     ) -> str:
-        """Build generation prompt for module creation."""
+        """Render (already budget-trimmed) conversation history for the prompt."""
+        if not conversation_history:
+            return ""
         
-        # Build conversation context if history exists
-        conversation_context = ""
-        if conversation_history and len(conversation_history) > 0:
-            conversation_context = "\n\nPrevious conversation:\n"
-            for msg in conversation_history[-4:]:  # Last 4 messages for context
-                role = "Teacher" if msg["role"] == "user" else "Assistant"
-                conversation_context += f"{role}: {msg['content']}\n"
-            conversation_context += "\nBased on the above conversation, "
+        conversation_context = "\n\nPrevious conversation:\n"
+        for msg in conversation_history:
+            if msg["role"] == "summary":
+                conversation_context += f"(Summary of earlier messages: {msg['content']})\n"
+                continue
+            role = "Teacher" if msg["role"] == "user" else "Assistant"
+            conversation_context += f"{role}: {msg['content']}\n"
+        conversation_context += "\nBased on the above conversation, "
+        return conversation_context
+    
+    def _build_generation_prompt(
+        self,
+        target_duration: int
+    ) -> str:
+        """
+        Build generation prompt template for module creation.
         
+        The {history}, {context} and {challenge} placeholders are filled by
+        PromptBuilder; the challenge is never formatted into the template
+        itself, so braces typed by a teacher stay literal.
+        """
         return f"""[INST]
 You are an expert teacher trainer.
-{conversation_context}Create a {target_duration}-minute micro-learning module for this challenge:
-"{challenge}"
+
+Context Information:
+{{context}}
+{{history}}Create a {target_duration}-minute micro-learning module for this challenge:
+"{{challenge}}"
 
 Format your response using proper markdown for readability:
 - Use blank lines (double newlines) between paragraphs
@@ -148,6 +218,82 @@ CONTENT: [Explanation with proper paragraphs and formatting]
 ACTIVITY: [Short activity description]
 [/INST]"""
     
+    def _section_watcher(
+        self,
+        on_section: Callable[[int, ModuleSection], None]
+    ) -> Callable[[str], None]:
+        """
+        Build a token callback that reports each section once it is complete.
+        
+        A section is complete when the next SECTION header starts, so the
+        section still being written is never reported; the caller handles
+        the last one from the final parse.
+        """
+        buffer: List[str] = []
+        reported = 0
+        
+        def on_token(text: str) -> None:
+            nonlocal reported
+            buffer.append(text)
+            if "\n" not in text:
+                return
+            
+            streamed = "".join(buffer)
+            complete_lines = streamed[:streamed.rfind("\n")].strip().split("\n")
+            sections = self._parse_sections(complete_lines)
+            while reported < len(sections) - 1:
+                on_section(reported, sections[reported])
+                reported += 1
+        
+        return on_token
+    
+    def _parse_sections(self, lines: List[str]) -> List[ModuleSection]:
+        """Parse SECTION/DURATION/CONTENT/ACTIVITY blocks into ModuleSection objects."""
+        # Parse sections (simplified - in production, use more robust parsing)
+        sections = []
+        current_section = None
+        
+        for line in lines:
+            clean_line = line.strip().replace("*", "")
+            if clean_line.upper().startswith("SECTION"):
+                if current_section:
+                    sections.append(current_section)
+                current_section = {
+                    "title": clean_line.split(":", 1)[1].strip() if ":" in clean_line else "Section",
+                    "content": "",
+                    "duration_minutes": 3,
+                    "activity": None
+                }
+            elif current_section and line.strip():
+                clean_start = line.strip().replace("*", "").upper()
+                if clean_start.startswith("DURATION:"):
+                    # Extract duration
+                    try:
+                        duration_str = line.split(":", 1)[1].strip()
+                        current_section["duration_minutes"] = int(''.join(filter(str.isdigit, duration_str)))
+                    except:
+                        pass
+                elif clean_start.startswith("ACTIVITY:"):
+                    current_section["activity"] = line.split(":", 1)[1].strip().replace("*", "")
+                elif clean_start.startswith("CONTENT:"):
+                    current_section["content"] = line.split(":", 1)[1].strip().replace("*", "")
+                else:
+                    current_section["content"] += "\n" + line.strip()
+        
+        if current_section:
+            sections.append(current_section)
+        
+        # Create ModuleSection objects
+        return [
+            ModuleSection(
+                title=s["title"],
+                content=s["content"],
+                duration_minutes=s["duration_minutes"],
+                activity=s.get("activity")
+            )
+            for s in sections
+        ]
+    
     def _parse_module_content(
         self,
         generated_content: str,
@@ -167,50 +313,8 @@ ACTIVITY: [Short activity description]
                     title = line.replace("TITLE:", "").strip()
                     break
             
-            # Parse sections (simplified - in production, use more robust parsing)
-            sections = []
-            current_section = None
-            
-            for line in lines:
-                clean_line = line.strip().replace("*", "")
-                if clean_line.upper().startswith("SECTION"):
-                    if current_section:
-                        sections.append(current_section)
-                    current_section = {
-                        "title": clean_line.split(":", 1)[1].strip() if ":" in clean_line else "Section",
-                        "content": "",
-                        "duration_minutes": 3,
-                        "activity": None
-                    }
-                elif current_section and line.strip():
-                    clean_start = line.strip().replace("*", "").upper()
-                    if clean_start.startswith("DURATION:"):
-                        # Extract duration
-                        try:
-                            duration_str = line.split(":", 1)[1].strip()
-                            current_section["duration_minutes"] = int(''.join(filter(str.isdigit, duration_str)))
-                        except:
-                            pass
-                    elif clean_start.startswith("ACTIVITY:"):
-                        current_section["activity"] = line.split(":", 1)[1].strip().replace("*", "")
-                    elif clean_start.startswith("CONTENT:"):
-                        current_section["content"] = line.split(":", 1)[1].strip().replace("*", "")
-                    else:
-                        current_section["content"] += "\n" + line.strip()
-            
-            if current_section:
-                sections.append(current_section)
-            
-            # Create ModuleSection objects
-            module_sections = [
-                ModuleSection(
-                    title=s["title"],
-                    content=s["content"],
-                    duration_minutes=s["duration_minutes"],
-                    activity=s.get("activity")
-                )
-                for s in sections
-            ]
+            # Parse sections
+            module_sections = self._parse_sections(lines)
             
             # If no sections parsed, create a default one
             if not module_sections:
@@ -0,0 +1,231 @@
+"""
+Precompute Service - Generate modules for trending challenges while the LLM is idle.
+"""
+import asyncio
+import logging
+import uuid
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+import numpy as np
+
+from config import settings
+from services.rag_service import RAGService
+from services.micro_learning_service import MicroLearningService
+from models.schemas import Module
+from utils.llm_router import background_request
+from utils.async_db import (
+    get_recent_queries,
+    save_precomputed_module,
+    get_precomputed_modules,
+    clear_precomputed_modules
+)
+
+logger = logging.getLogger(__name__)
+
+class PrecomputeService:
+    """Cluster recent challenges and pre-generate modules for the biggest clusters."""
+
+    def __init__(
+        self,
+        rag_service: RAGService,
+        micro_learning_service: MicroLearningService
+    ):
+        self.rag_service = rag_service
+        self.micro_learning_service = micro_learning_service
+        self.durations = settings.PRECOMPUTE_DURATIONS
+        self.difficulty_level = "intermediate"
+
+        # In-memory copy of the precomputed_modules table
+        self._entries: List[Dict[str, Any]] = []
+        self._embeddings: Optional[np.ndarray] = None
+        self._corpus_version: Optional[str] = None
+
+        logger.info("Precompute Service initialized")
+
+    async def run_forever(self) -> None:
+        """Background loop: refresh precomputed modules every interval."""
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error precomputing modules: {str(e)}")
+            await asyncio.sleep(settings.PRECOMPUTE_INTERVAL)
+
+    async def refresh(self) -> int:
+        """
+        Cluster recent queries and generate missing modules for top clusters.
+
+        Returns:
+            Number of modules generated
+        """
+        await self._sync_corpus_version()
+
+        queries = [q["content"] for q in await get_recent_queries(limit=settings.PRECOMPUTE_QUERY_WINDOW)]
+        if not queries:
+            return 0
+
+        embeddings = self._normalize(await self.rag_service.embedding_service.embed_texts(queries))
+        clusters = self._cluster(embeddings)
+
+        generated = 0
+        for members in clusters[:settings.PRECOMPUTE_TOP_CLUSTERS]:
+            centroid = embeddings[members].mean(axis=0)
+            representative = members[int(np.argmax(embeddings[members] @ centroid))]
+            challenge = queries[representative]
+
+            for duration in self.durations:
+                if self._match(embeddings[representative], duration, self.difficulty_level):
+                    continue
+                if await self._generate(challenge, embeddings[representative], duration):
+                    generated += 1
+
+        if generated:
+            logger.info(f"Precomputed {generated} modules for {len(clusters)} challenge clusters")
+        return generated
+
+    async def lookup(
+        self,
+        challenge: str,
+        target_duration: int,
+        difficulty_level: str
+    ) -> Optional[Module]:
+        """
+        Find a precomputed module for a challenge.
+
+        Args:
+            challenge: Teacher's classroom challenge
+            target_duration: Requested duration in minutes
+            difficulty_level: Requested difficulty level
+
+        Returns:
+            A fresh copy of the matching module, or None
+        """
+        if not self._entries:
+            return None
+
+        query = self._normalize([await self.rag_service.embedding_service.embed_query(challenge)])[0]
+        entry = self._match(query, target_duration, difficulty_level)
+        if entry is None:
+            return None
+
+        logger.info(f"Serving precomputed module for: {challenge[:50]}...")
+        return Module(**{
+            **entry["module_data"],
+            "id": str(uuid.uuid4()),
+            "challenge": challenge,
+            "created_at": datetime.now()
+        })
+
+    async def invalidate(self) -> None:
+        """Drop every precomputed module (the corpus they were built from changed)."""
+        await clear_precomputed_modules()
+        self._entries = []
+        self._embeddings = None
+        logger.info("Precomputed modules invalidated")
+
+    async def _sync_corpus_version(self) -> None:
+        """Load stored modules, invalidating them if the corpus has changed."""
+        stats = await self.rag_service.get_document_stats()
+        corpus_version = str(stats["document_count"])
+
+        entries = await get_precomputed_modules()
+        if any(e["corpus_version"] != corpus_version for e in entries):
+            await self.invalidate()
+            entries = []
+
+        self._corpus_version = corpus_version
+        self._set_entries(entries)
+
+    async def _generate(self, challenge: str, embedding: np.ndarray, duration: int) -> bool:
+        """Generate and store one module once the LLM is idle; user traffic preempts it."""
+        while self.micro_learning_service.llm_service.in_flight() > 0:
+            await asyncio.sleep(settings.PRECOMPUTE_IDLE_POLL)
+
+        context = await self.rag_service.retrieve_relevant_content(query=challenge, top_k=5)
+
+        async def generate() -> Module:
+            # Runs in the task's own context: marks only this job's requests
+            background_request.set(True)
+            return await self.micro_learning_service.generate_module(
+                challenge=challenge,
+                context=context,
+                target_duration=duration,
+                difficulty_level=self.difficulty_level
+            )
+
+        task = asyncio.ensure_future(generate())
+
+        while not task.done():
+            await asyncio.wait({task}, timeout=settings.PRECOMPUTE_IDLE_POLL)
+            # Our own request (and its hedge) don't count as user traffic
+            if not task.done() and self.micro_learning_service.llm_service.foreground_in_flight() > 0:
+                task.cancel()
+                logger.info("Precompute preempted by user traffic")
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                return False
+
+        module = task.result()
+        await save_precomputed_module(
+            challenge=challenge,
+            target_duration=duration,
+            difficulty_level=self.difficulty_level,
+            embedding=embedding.tolist(),
+            module_data=module.model_dump(mode='json'),
+            corpus_version=self._corpus_version
+        )
+        self._set_entries(await get_precomputed_modules())
+        return True
+
+    def _cluster(self, embeddings: np.ndarray) -> List[List[int]]:
+        """Greedy leader clustering by cosine similarity, largest cluster first."""
+        clusters: List[List[int]] = []
+        centroids: List[np.ndarray] = []
+
+        for i, vector in enumerate(embeddings):
+            if centroids:
+                similarities = np.stack(centroids) @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= settings.PRECOMPUTE_SIMILARITY:
+                    clusters[best].append(i)
+                    centroid = embeddings[clusters[best]].mean(axis=0)
+                    centroids[best] = centroid / np.linalg.norm(centroid)
+                    continue
+            clusters.append([i])
+            centroids.append(vector)
+
+        clusters = [c for c in clusters if len(c) >= settings.PRECOMPUTE_MIN_CLUSTER_SIZE]
+        clusters.sort(key=len, reverse=True)
+        return clusters
+
+    def _match(
+        self,
+        embedding: np.ndarray,
+        target_duration: int,
+        difficulty_level: str
+    ) -> Optional[Dict[str, Any]]:
+        """Best stored entry above the similarity threshold for this duration/level."""
+        if self._embeddings is None:
+            return None
+
+        similarities = self._embeddings @ embedding
+        for i in np.argsort(-similarities):
+            if similarities[i] < settings.PRECOMPUTE_SIMILARITY:
+                break
+            entry = self._entries[i]
+            if entry["target_duration"] == target_duration and entry["difficulty_level"] == difficulty_level:
+                return entry
+        return None
+
+    def _set_entries(self, entries: List[Dict[str, Any]]) -> None:
+        self._entries = entries
+        self._embeddings = self._normalize([e["embedding"] for e in entries]) if entries else None
+
+    def _normalize(self, vectors: List[List[float]]) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
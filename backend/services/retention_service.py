@@ -0,0 +1,93 @@
+"""
+Retention Service - Archive old conversations and feedback, then compact the database, during off hours.
+"""
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from config import settings
+from utils.async_db import (
+    archive_conversations,
+    archive_feedback,
+    compact_database,
+    optimize_search_index
+)
+
+logger = logging.getLogger(__name__)
+
+class RetentionService:
+    """
+    Keep the live database small: once a day, in MAINTENANCE_HOURS, move
+    conversations idle for RETENTION_DAYS (and older feedback) to the
+    archive database and hand the freed pages back to the filesystem.
+
+    Every step is a short job on the DB writer thread, so requests keep
+    being served while it runs.
+    """
+
+    def __init__(self):
+        self._last_run_day: Optional[date] = None
+        self._last_result: Dict[str, int] = {}
+
+        logger.info("Retention Service initialized")
+
+    async def run_forever(self) -> None:
+        """Background loop: run maintenance once per day inside the off-hours window."""
+        while True:
+            try:
+                if datetime.now().hour in settings.MAINTENANCE_HOURS and self._last_run_day != date.today():
+                    await self.run_once()
+                    self._last_run_day = date.today()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error running database maintenance: {str(e)}")
+            await asyncio.sleep(settings.MAINTENANCE_POLL)
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Archive everything past retention, then compact.
+
+        Returns:
+            Conversations and feedback rows archived, pages freed
+        """
+        batch = settings.RETENTION_BATCH
+        conversations = await self._drain(archive_conversations, settings.RETENTION_DAYS, batch)
+        feedback = await self._drain(archive_feedback, settings.RETENTION_DAYS, batch * 10)
+
+        # Merging the search index frees pages too, so it goes before compaction
+        await optimize_search_index()
+        pages = 0
+        while True:
+            freed = await compact_database(settings.COMPACT_STEP_PAGES)
+            pages += freed
+            if freed < settings.COMPACT_STEP_PAGES:
+                break
+
+        self._last_result = {
+            "conversations_archived": conversations,
+            "feedback_archived": feedback,
+            "pages_freed": pages
+        }
+        logger.info(
+            f"Maintenance done: archived {conversations} conversations and {feedback} feedback rows, "
+            f"freed {pages} pages"
+        )
+        return self._last_result
+
+    async def _drain(self, archive, older_than_days: int, batch: int) -> int:
+        """Call an archive_* function batch by batch until nothing is left to move."""
+        total = 0
+        while True:
+            moved = await archive(older_than_days, batch)
+            total += moved
+            if moved < batch:
+                return total
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the last maintenance run's date and results."""
+        return {
+            "last_run_day": self._last_run_day.isoformat() if self._last_run_day else None,
+            **self._last_result
+        }
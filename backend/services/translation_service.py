@@ -1,34 +1,42 @@
 """
 Translation Service - Vernacular translation using HuggingFace transformers.
 """
+import asyncio
 import logging
-from typing import Optional
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-import torch
+from typing import Optional, List, Dict, Tuple, Any
 
 from config import settings
+from models.schemas import Module, ModuleSection
+from utils.translation_backends import TRANSLATION_PROFILES, create_translation_backend
+from utils.translation_memory import TranslationMemory
+from utils.text_segmenter import TextSegmenter
+from utils.translation_scheduler import TranslationScheduler
 
 logger = logging.getLogger(__name__)
 
 class TranslationService:
     """Service for translating content to vernacular languages."""
     
-    def __init__(self):
+    def __init__(self, backend: str = None):
         """Initialize translation model."""
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"Loading translation model on {self.device}")
-        
         self.model_name = settings.TRANSLATION_MODEL
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name).to(self.device)
+        self.backend = create_translation_backend(backend)
+        self.tokenizer = self.backend.tokenizer
+        self.default_profile = settings.TRANSLATION_DEFAULT_PROFILE
+        self.batch_token_budget = settings.TRANSLATION_BATCH_TOKENS
+        self.max_batch_size = settings.TRANSLATION_MAX_BATCH_SIZE
+        self.memory = TranslationMemory()
+        self.segmenter = TextSegmenter()
+        self.scheduler = TranslationScheduler(self._translate_uncached)
         
-        logger.info(f"Translation model loaded: {self.model_name}")
+        logger.info(f"Translation model loaded: {self.model_name} ({self.backend.name})")
     
     async def translate(
         self,
         text: str,
         target_language: str,
-        source_language: str = "eng_Latn"
+        source_language: str = "eng_Latn",
+        profile: Optional[str] = None
     ) -> str:
         """
         Translate text to target language.
@@ -37,6 +45,7 @@ class TranslationService:
             text: Text to translate
             target_language: Target language code (e.g., 'hin_Deva' for Hindi)
             source_language: Source language code (default: English)
+            profile: Latency/quality profile: fast, balanced or best
         
         Returns:
             Translated text
@@ -50,33 +59,12 @@ class TranslationService:
             if source_language == target_language:
                 return text
             
-            # Tokenize with language codes
-            self.tokenizer.src_lang = source_language
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=512
-            ).to(self.device)
-            
-            # Generate translation
-            forced_bos_token_id = self.tokenizer.convert_tokens_to_ids(target_language)
-            
-            with torch.no_grad():
-                generated_tokens = self.model.generate(
-                    **inputs,
-                    forced_bos_token_id=forced_bos_token_id,
-                    max_length=512,
-                    num_beams=5,
-                    early_stopping=True
-                )
-            
-            # Decode translation
-            translated_text = self.tokenizer.batch_decode(
-                generated_tokens,
-                skip_special_tokens=True
-            )[0]
+            translated_text = (await self.translate_batch(
+                texts=[text],
+                target_language=target_language,
+                source_language=source_language,
+                profile=profile
+            ))[0]
             
             logger.info(f"Translated text from {source_language} to {target_language}")
             return translated_text
@@ -89,7 +77,8 @@ class TranslationService:
         self,
         texts: list[str],
         target_language: str,
-        source_language: str = "eng_Latn"
+        source_language: str = "eng_Latn",
+        profile: Optional[str] = None
     ) -> list[str]:
         """
         Translate multiple texts in batch.
@@ -98,22 +87,219 @@ class TranslationService:
             texts: List of texts to translate
             target_language: Target language code
             source_language: Source language code
+            profile: Latency/quality profile: fast, balanced or best
         
         Returns:
             List of translated texts
         """
         try:
-            translations = []
-            for text in texts:
-                translated = await self.translate(
-                    text=text,
-                    target_language=target_language,
-                    source_language=source_language
+            # Validate language codes
+            if target_language not in settings.SUPPORTED_LANGUAGES:
+                raise ValueError(f"Unsupported target language: {target_language}")
+            
+            # Skip translation if source and target are the same
+            if source_language == target_language:
+                return list(texts)
+            
+            profile = profile or self.default_profile
+            if profile not in TRANSLATION_PROFILES:
+                raise ValueError(f"Unknown translation profile: {profile}")
+            
+            # Output depends on engine and decoding settings, so both key the cache
+            memory_model = f"{self.model_name}:{self.backend.name}:{profile}"
+            
+            # Split into sentences (keeping markdown structure aside) so long
+            # text is never truncated and partially changed text reuses cache
+            segmented = [self.segmenter.segment(text) for text in texts]
+            sentences = list(dict.fromkeys(
+                piece
+                for pieces in segmented
+                for piece, translatable in pieces
+                if translatable
+            ))
+            
+            # Translation memory first; only misses reach the model
+            translated = await self.memory.lookup(
+                sentences, source_language, target_language, memory_model
+            )
+            misses = [sentence for sentence in sentences if sentence not in translated]
+            if misses:
+                # Model work is shared with concurrent requests on a worker thread
+                new_translations = await self.scheduler.submit(
+                    misses, target_language, source_language, profile
+                )
+                translated.update(zip(misses, new_translations))
+                await self.memory.store(
+                    zip(misses, new_translations),
+                    source_language, target_language, memory_model
                 )
-                translations.append(translated)
             
+            translations = [
+                "".join(translated[piece] if translatable else piece for piece, translatable in pieces)
+                for pieces in segmented
+            ]
+            
+            logger.info(
+                f"Batch translated {len(texts)} texts from {source_language} to {target_language} "
+                f"({len(sentences) - len(misses)}/{len(sentences)} sentences from translation memory)"
+            )
             return translations
             
         except Exception as e:
             logger.error(f"Error in batch translation: {str(e)}")
             raise
+    
+    def start_section_translation(
+        self,
+        section: ModuleSection,
+        target_language: str,
+        source_language: str = "eng_Latn",
+        profile: Optional[str] = None
+    ) -> asyncio.Task:
+        """
+        Start translating one section in the background.
+        
+        Used while the LLM is still writing later sections, so translation
+        overlaps generation; pass the tasks to translate_module afterwards.
+        """
+        return asyncio.ensure_future(self.translate_batch(
+            texts=[section.title, section.content, section.activity or ""],
+            target_language=target_language,
+            source_language=source_language,
+            profile=profile
+        ))
+    
+    async def translate_module(
+        self,
+        module: Module,
+        target_language: str,
+        source_language: str = "eng_Latn",
+        profile: Optional[str] = None,
+        section_translations: Optional[Dict[int, Tuple[ModuleSection, asyncio.Task]]] = None
+    ) -> Module:
+        """
+        Translate a whole module (title, section titles, contents, activities) in one batch.
+        
+        Args:
+            module: Module to translate
+            target_language: Target language code
+            source_language: Source language code
+            profile: Latency/quality profile: fast, balanced or best
+            section_translations: Sections already being translated, keyed by
+                index, from start_section_translation; reused when unchanged
+        
+        Returns:
+            Translated copy of the module with language set
+        """
+        try:
+            section_translations = section_translations or {}
+            
+            # Only sections not already in flight (or changed since) go in the batch
+            texts = [module.title]
+            batched = []
+            for i, section in enumerate(module.sections):
+                early = section_translations.get(i)
+                if early is not None and early[0] == section:
+                    continue
+                if early is not None:
+                    early[1].cancel()
+                texts.extend([section.title, section.content, section.activity or ""])
+                batched.append(i)
+            
+            translated = await self.translate_batch(
+                texts=texts,
+                target_language=target_language,
+                source_language=source_language,
+                profile=profile
+            )
+            
+            sections = []
+            offset = 1
+            for i, section in enumerate(module.sections):
+                if i in batched:
+                    title, content, activity = translated[offset:offset + 3]
+                    offset += 3
+                else:
+                    title, content, activity = await section_translations[i][1]
+                sections.append(section.model_copy(update={
+                    "title": title,
+                    "content": content,
+                    "activity": activity or section.activity
+                }))
+            
+            return module.model_copy(update={
+                "title": translated[0],
+                "sections": sections,
+                "language": target_language
+            })
+            
+        except Exception as e:
+            logger.error(f"Error translating module: {str(e)}")
+            raise
+    
+    def _translate_uncached(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: str,
+        profile: str
+    ) -> List[str]:
+        """Translate texts with the model in length-sorted, token-budgeted batches."""
+        translations = [""] * len(texts)
+        
+        # Sort by token length so each batch pads to a similar length
+        self.tokenizer.src_lang = source_language
+        encoded = self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=512
+        )["input_ids"]
+        lengths = {i: len(ids) for i, ids in enumerate(encoded)}
+        order = sorted(lengths, key=lambda i: lengths[i])
+        
+        for batch in self._make_batches(order, lengths):
+            batch_translations = self.backend.generate(
+                texts=[texts[i] for i in batch],
+                target_language=target_language,
+                source_language=source_language,
+                num_beams=TRANSLATION_PROFILES[profile]["num_beams"]
+            )
+            # Restore original order
+            for i, translated in zip(batch, batch_translations):
+                translations[i] = translated
+        
+        return translations
+    
+    def _make_batches(self, order: List[int], lengths: Dict[int, int]) -> List[List[int]]:
+        """
+        Group length-sorted indices into batches under the padded token budget.
+        
+        Args:
+            order: Text indices sorted by token length (ascending)
+            lengths: Token length of every text
+        
+        Returns:
+            Batches of text indices
+        """
+        batches = []
+        current: List[int] = []
+        for i in order:
+            # Sorted ascending, so the newest text sets the padded length
+            padded_tokens = lengths[i] * (len(current) + 1)
+            if current and (
+                padded_tokens > self.batch_token_budget
+                or len(current) >= self.max_batch_size
+            ):
+                batches.append(current)
+                current = []
+            current.append(i)
+        if current:
+            batches.append(current)
+        return batches
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get translation memory and scheduler statistics."""
+        return {
+            "memory": self.memory.get_stats(),
+            "scheduler": self.scheduler.get_stats()
+        }
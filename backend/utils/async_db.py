@@ -0,0 +1,140 @@
+"""
+Async DB - Awaitable versions of the db_utils functions for async route handlers.
+
+Every call runs on dedicated DB threads (each with its own long-lived
+connection from db_utils), so sqlite work never blocks the event loop.
+Reads share a small pool, which WAL mode lets run concurrently; writes go
+through a single writer thread so they queue in-process instead of
+contending for SQLite's write lock and sleeping in its busy handler.
+
+Message and feedback inserts, the hot writes, additionally go through a
+group-commit queue (utils.group_commit) that shares one transaction
+between all writes arriving within a few milliseconds.
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import settings
+from utils import db_utils
+from utils.group_commit import GroupCommitWriter
+
+logger = logging.getLogger(__name__)
+
+_readers: Optional[ThreadPoolExecutor] = None
+_writer: Optional[ThreadPoolExecutor] = None
+
+def _configure_writer() -> None:
+    """Writer-thread connection: group commit amortizes the fsync, so acknowledged writes can afford it."""
+    db_utils.get_connection().execute(f"PRAGMA synchronous={settings.DB_WRITER_SYNCHRONOUS}")
+
+def _writer_executor() -> ThreadPoolExecutor:
+    global _writer
+    if _writer is None:
+        _writer = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="db-writer",
+            initializer=_configure_writer
+        )
+    return _writer
+
+_group_writer = GroupCommitWriter(_writer_executor)
+
+async def run_db(fn: Callable[..., Any], *args, write: bool = False, **kwargs) -> Any:
+    """
+    Run a blocking db_utils function on the DB threads and await its result.
+    
+    Args:
+        fn: db_utils function
+        write: Run on the single writer thread instead of the reader pool
+    """
+    global _readers
+    if write:
+        executor = _writer_executor()
+    else:
+        if _readers is None:
+            _readers = ThreadPoolExecutor(max_workers=settings.DB_THREADS, thread_name_prefix="db-reader")
+        executor = _readers
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+def _awaitable(fn: Callable[..., Any], write: bool = False) -> Callable[..., Awaitable[Any]]:
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await run_db(fn, *args, write=write, **kwargs)
+    return wrapper
+
+def get_write_stats() -> Dict[str, Any]:
+    """Group-commit batch sizes and write latency."""
+    return _group_writer.get_stats()
+
+async def shutdown() -> None:
+    """Commit queued writes, then stop the DB threads (their connections close with them)."""
+    global _readers, _writer
+    await _group_writer.drain()
+    for executor in (_readers, _writer):
+        if executor is not None:
+            executor.shutdown(wait=True)
+    _readers = _writer = None
+
+init_db = _awaitable(db_utils.init_db, write=True)
+
+# Feedback
+async def save_feedback(data: Dict[str, Any]) -> int:
+    """Save feedback; returns once the group commit holding it is durable."""
+    return await _group_writer.submit(db_utils.write_feedback, data)
+
+get_all_feedback = _awaitable(db_utils.get_all_feedback)
+get_feedback_page = _awaitable(db_utils.get_feedback_page)
+get_feedback_since = _awaitable(db_utils.get_feedback_since)
+get_feedback_stats = _awaitable(db_utils.get_feedback_stats)
+get_module_feedback_stats = _awaitable(db_utils.get_module_feedback_stats)
+rebuild_rollups = _awaitable(db_utils.rebuild_rollups, write=True)
+
+# Conversations
+create_conversation = _awaitable(db_utils.create_conversation, write=True)
+get_all_conversations = _awaitable(db_utils.get_all_conversations)
+get_conversations_page = _awaitable(db_utils.get_conversations_page)
+async def add_message(conversation_id: int, role: str, content: str, module_data: Optional[Dict] = None) -> int:
+    """Add a message; returns once the group commit holding it is durable."""
+    message_ids = await _group_writer.submit(
+        db_utils.write_messages, conversation_id, [(role, content, module_data)]
+    )
+    return message_ids[0]
+
+async def add_messages(conversation_id: int, messages: List[Tuple[str, str, Optional[Dict]]]) -> List[int]:
+    """Add several messages, in order, in the same commit."""
+    return await _group_writer.submit(db_utils.write_messages, conversation_id, messages)
+
+get_conversation_messages = _awaitable(db_utils.get_conversation_messages)
+get_messages_page = _awaitable(db_utils.get_messages_page)
+get_recent_turns = _awaitable(db_utils.get_recent_turns)
+get_turns_between = _awaitable(db_utils.get_turns_between)
+get_conversation_summary = _awaitable(db_utils.get_conversation_summary)
+save_conversation_summary = _awaitable(db_utils.save_conversation_summary, write=True)
+get_recent_queries = _awaitable(db_utils.get_recent_queries)
+get_recent_queries_page = _awaitable(db_utils.get_recent_queries_page)
+get_queries_since = _awaitable(db_utils.get_queries_since)
+get_module_by_id = _awaitable(db_utils.get_module_by_id)
+
+# Search
+search = _awaitable(db_utils.search)
+optimize_search_index = _awaitable(db_utils.optimize_search_index, write=True)
+
+# Retention
+archive_conversations = _awaitable(db_utils.archive_conversations, write=True)
+archive_feedback = _awaitable(db_utils.archive_feedback, write=True)
+restore_conversation = _awaitable(db_utils.restore_conversation, write=True)
+get_archived_conversations_page = _awaitable(db_utils.get_archived_conversations_page)
+compact_database = _awaitable(db_utils.compact_database, write=True)
+
+# Module translations
+save_module_translation = _awaitable(db_utils.save_module_translation, write=True)
+get_module_translation = _awaitable(db_utils.get_module_translation)
+
+# Precomputed modules
+save_precomputed_module = _awaitable(db_utils.save_precomputed_module, write=True)
+get_precomputed_modules = _awaitable(db_utils.get_precomputed_modules)
+clear_precomputed_modules = _awaitable(db_utils.clear_precomputed_modules, write=True)
@@ -0,0 +1,401 @@
+"""
+DB Migrations - Versioned schema migrations for the SQLite database.
+"""
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from utils.module_codec import pack_module, unpack_module, module_text
+
+logger = logging.getLogger(__name__)
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+def _initial_schema(conn: sqlite3.Connection) -> None:
+    """Feedback, conversations and messages (IF NOT EXISTS: pre-migration databases have them)."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        module_id TEXT NOT NULL,
+        challenge TEXT,
+        rating INTEGER NOT NULL,
+        implementation_status TEXT NOT NULL,
+        comments TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS conversations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        conversation_id INTEGER NOT NULL,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL,
+        module_data TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (conversation_id) REFERENCES conversations (id)
+    )
+    """)
+
+def _feedback_links(conn: sqlite3.Connection) -> None:
+    """Link feedback to its challenge and conversation."""
+    columns = _columns(conn, "feedback")
+    if "challenge" not in columns:
+        conn.execute("ALTER TABLE feedback ADD COLUMN challenge TEXT")
+    if "conversation_id" not in columns:
+        conn.execute("ALTER TABLE feedback ADD COLUMN conversation_id INTEGER")
+
+def _module_tables(conn: sqlite3.Connection) -> None:
+    """Whole-module translations and idle-time precomputed modules."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS module_translations (
+        module_id TEXT NOT NULL,
+        language TEXT NOT NULL,
+        module_data TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (module_id, language)
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS precomputed_modules (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        challenge TEXT NOT NULL,
+        target_duration INTEGER NOT NULL,
+        difficulty_level TEXT NOT NULL,
+        embedding TEXT NOT NULL,
+        module_data TEXT NOT NULL,
+        corpus_version TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+def _hot_query_indexes(conn: sqlite3.Connection) -> None:
+    """Indexes matching the filter + sort of every hot read path."""
+    # get_conversation_messages: WHERE conversation_id = ? ORDER BY created_at
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_messages_conversation_created
+    ON messages (conversation_id, created_at)
+    """)
+    # get_recent_queries: WHERE role = 'user' ORDER BY created_at DESC LIMIT ?
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_messages_role_created
+    ON messages (role, created_at)
+    """)
+    # get_module_by_id: json_extract(module_data, '$.id') = ?
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_messages_module_id
+    ON messages (json_extract(module_data, '$.id'))
+    WHERE module_data IS NOT NULL
+    """)
+    # get_all_feedback: ORDER BY created_at DESC
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_feedback_created
+    ON feedback (created_at)
+    """)
+    # get_all_conversations: ORDER BY updated_at DESC
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_conversations_updated
+    ON conversations (updated_at)
+    """)
+    conn.execute("ANALYZE")
+
+def rebuild_rollups(conn: sqlite3.Connection, include_archive: bool = False) -> None:
+    """
+    Recompute every rollup table from the feedback and messages tables.
+
+    With include_archive, rows moved to the attached archive database count
+    too, so retention never changes the statistics.
+    """
+    feedback, messages = "feedback", "messages"
+    if include_archive:
+        feedback = """(
+            SELECT module_id, rating, implementation_status, created_at FROM main.feedback
+            UNION ALL SELECT module_id, rating, implementation_status, created_at FROM archive.feedback
+        )"""
+        messages = """(
+            SELECT role, created_at FROM main.messages
+            UNION ALL SELECT role, created_at FROM archive.messages
+        )"""
+
+    for table in ("feedback_totals", "feedback_status_counts", "feedback_daily", "feedback_modules", "message_daily"):
+        conn.execute(f"DELETE FROM {table}")
+    conn.execute(f"""
+    INSERT INTO feedback_totals (id, count, rating_sum)
+    SELECT 1, COUNT(*), COALESCE(SUM(rating), 0) FROM {feedback}
+    """)
+    conn.execute(f"""
+    INSERT INTO feedback_status_counts (status, count)
+    SELECT implementation_status, COUNT(*) FROM {feedback} GROUP BY implementation_status
+    """)
+    conn.execute(f"""
+    INSERT INTO feedback_daily (day, count, rating_sum)
+    SELECT substr(created_at, 1, 10), COUNT(*), SUM(rating) FROM {feedback} GROUP BY 1
+    """)
+    conn.execute(f"""
+    INSERT INTO feedback_modules (module_id, count, rating_sum, last_feedback_at)
+    SELECT module_id, COUNT(*), SUM(rating), MAX(created_at) FROM {feedback} GROUP BY module_id
+    """)
+    conn.execute(f"""
+    INSERT INTO message_daily (day, role, count)
+    SELECT substr(created_at, 1, 10), role, COUNT(*) FROM {messages} GROUP BY 1, 2
+    """)
+
+def _rollup_tables(conn: sqlite3.Connection) -> None:
+    """Incrementally maintained feedback/message aggregates, backfilled from existing rows."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS feedback_totals (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        count INTEGER NOT NULL,
+        rating_sum INTEGER NOT NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS feedback_status_counts (
+        status TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS feedback_daily (
+        day TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        rating_sum INTEGER NOT NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS feedback_modules (
+        module_id TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        rating_sum INTEGER NOT NULL,
+        last_feedback_at TIMESTAMP
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS message_daily (
+        day TEXT NOT NULL,
+        role TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (day, role)
+    )
+    """)
+    rebuild_rollups(conn)
+
+def _conversation_summaries(conn: sqlite3.Connection) -> None:
+    """Rolling summary of each conversation's turns older than the history window."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS conversation_summaries (
+        conversation_id INTEGER PRIMARY KEY,
+        summary TEXT NOT NULL,
+        summarized_until INTEGER NOT NULL,
+        updated_at TIMESTAMP NOT NULL,
+        FOREIGN KEY (conversation_id) REFERENCES conversations (id)
+    )
+    """)
+
+def _module_store(conn: sqlite3.Connection) -> None:
+    """Move generated modules out of messages.module_data into a compressed modules table."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS modules (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        payload BLOB NOT NULL,
+        created_at TIMESTAMP NOT NULL
+    )
+    """)
+    if "module_id" not in _columns(conn, "messages"):
+        conn.execute("ALTER TABLE messages ADD COLUMN module_id TEXT")
+
+    # Backfill in id order, a batch at a time, so large histories are never held in memory
+    last_id = 0
+    while True:
+        rows = conn.execute("""
+        SELECT id, module_data, created_at FROM messages
+        WHERE id > ? AND module_data IS NOT NULL
+        ORDER BY id
+        LIMIT 500
+        """, (last_id,)).fetchall()
+        if not rows:
+            break
+        for message_id, module_json, created_at in rows:
+            module_data = json.loads(module_json)
+            module_id = module_data.get("id") or f"message-{message_id}"
+            conn.execute("""
+            INSERT INTO modules (id, title, payload, created_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO NOTHING
+            """, (module_id, module_data.get("title", ""), pack_module(module_data), created_at))
+            conn.execute(
+                "UPDATE messages SET module_id = ?, module_data = NULL WHERE id = ?",
+                (module_id, message_id)
+            )
+        last_id = rows[-1][0]
+
+    conn.execute("DROP INDEX IF EXISTS idx_messages_module_id")
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        conn.execute("ALTER TABLE messages DROP COLUMN module_data")
+    # Which conversation produced a module (feedback joins go straight to modules.id)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_messages_module
+    ON messages (module_id)
+    WHERE module_id IS NOT NULL
+    """)
+
+def rebuild_search_index(conn: sqlite3.Connection) -> None:
+    """Re-index user messages, conversation titles and modules from scratch."""
+    conn.execute("INSERT INTO messages_fts (messages_fts) VALUES ('delete-all')")
+    conn.execute("INSERT INTO messages_fts (rowid, content) SELECT id, content FROM messages WHERE role = 'user'")
+    conn.execute("INSERT INTO conversations_fts (conversations_fts) VALUES ('rebuild')")
+
+    # Module text lives in the compressed payload, so it is extracted here rather than in SQL
+    conn.execute("DELETE FROM modules_fts")
+    last_rowid = 0
+    while True:
+        rows = conn.execute("""
+        SELECT rowid, title, payload FROM modules WHERE rowid > ? ORDER BY rowid LIMIT 500
+        """, (last_rowid,)).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "INSERT INTO modules_fts (rowid, title, body) VALUES (?, ?, ?)",
+            [(rowid, title, module_text(unpack_module(payload))) for rowid, title, payload in rows]
+        )
+        last_rowid = rows[-1][0]
+
+    optimize_search_index(conn)
+
+def optimize_search_index(conn: sqlite3.Connection) -> None:
+    """Merge each search index into one b-tree; a fragmented index is several times slower to query."""
+    for table in ("messages_fts", "conversations_fts", "modules_fts"):
+        conn.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+
+def _search_index(conn: sqlite3.Connection) -> None:
+    """FTS5 indexes over teachers' messages, conversation titles and modules, kept in sync by triggers."""
+    # External content: the text stays in messages/conversations, the index holds only postings
+    conn.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        content, content='messages', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """)
+    conn.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+        title, content='conversations', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """)
+    # Module text is compressed in modules.payload, so this index stores its own copy (written by db_utils.write_module)
+    conn.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS modules_fts USING fts5(
+        title, body, tokenize='unicode61 remove_diacritics 2'
+    )
+    """)
+
+    # Only teachers' messages are indexed; assistant turns are covered by modules_fts
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages WHEN new.role = 'user' BEGIN
+        INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages WHEN old.role = 'user' BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE OF content ON messages WHEN old.role = 'user' BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS conversations_fts_insert AFTER INSERT ON conversations BEGIN
+        INSERT INTO conversations_fts (rowid, title) VALUES (new.id, new.title);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS conversations_fts_delete AFTER DELETE ON conversations BEGIN
+        INSERT INTO conversations_fts (conversations_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS conversations_fts_update AFTER UPDATE OF title ON conversations BEGIN
+        INSERT INTO conversations_fts (conversations_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        INSERT INTO conversations_fts (rowid, title) VALUES (new.id, new.title);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS modules_fts_delete AFTER DELETE ON modules BEGIN
+        DELETE FROM modules_fts WHERE rowid = old.rowid;
+    END
+    """)
+    rebuild_search_index(conn)
+
+# Append only: never edit or reorder a migration once it has shipped
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "initial_schema", _initial_schema),
+    (2, "feedback_links", _feedback_links),
+    (3, "module_tables", _module_tables),
+    (4, "hot_query_indexes", _hot_query_indexes),
+    (5, "rollup_tables", _rollup_tables),
+    (6, "conversation_summaries", _conversation_summaries),
+    (7, "module_store", _module_store),
+    (8, "search_index", _search_index),
+]
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration version (0 for a fresh database)."""
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply pending migrations in order, each in its own transaction.
+
+    BEGIN IMMEDIATE takes the write lock before the version is re-read, so
+    several workers starting at once apply each migration exactly once.
+
+    Args:
+        conn: Open connection to the database
+
+    Returns:
+        Schema version after migrating
+    """
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP NOT NULL
+    )
+    """)
+    conn.commit()
+
+    for version, name, apply in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= schema_version(conn):
+                conn.rollback()
+                continue
+            apply(conn)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                (version, name, datetime.utcnow().isoformat() + 'Z')
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Migration {version} ({name}) failed: {str(e)}")
+            raise
+        logger.info(f"Applied migration {version}: {name}")
+
+    return schema_version(conn)
@@ -1,70 +1,180 @@
 import sqlite3
+import base64
 import json
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
 
-DB_PATH = "./data/pragati.db"
+from config import settings
+from utils.db_migrations import (
+    migrate,
+    rebuild_rollups as _rebuild_rollups,
+    rebuild_search_index as _rebuild_search_index,
+    optimize_search_index as _optimize_search_index
+)
+from utils.module_codec import EncodedModule, pack_module, unpack_module, module_text
+
+logger = logging.getLogger(__name__)
+
+class ConversationNotFound(LookupError):
+    """Raised when writing to a conversation that does not exist (or was archived)."""
+
+def _sqlite_path(database_url: str) -> str:
+    """Turn sqlite:///relative/path or sqlite:////absolute/path into a file path."""
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Only sqlite:/// database URLs are supported, got {database_url}")
+    return database_url[len(prefix):]
+
+DB_PATH = _sqlite_path(settings.DATABASE_URL)
+
+# ============= Connection Management =============
+
+# One long-lived connection per thread; sqlite3 connections are not shared across threads
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+def _thread_connection() -> sqlite3.Connection:
+    """Open (once per thread) a tuned connection to DB_PATH."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(os.path.abspath(DB_PATH)), exist_ok=True)
+        conn = sqlite3.connect(
+            DB_PATH,
+            timeout=settings.DB_BUSY_TIMEOUT_MS / 1000,
+            cached_statements=settings.DB_STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        # Lets retention hand freed pages back in steps; applies to new databases
+        # (existing ones switch over with `manage_db.py vacuum`)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # WAL lets readers run alongside the single writer; NORMAL is durable
+        # across application crashes and only risks the last commits on power loss
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(settings.DB_BUSY_TIMEOUT_MS)}")
+        # Archived conversations live in a second file, attached as schema "archive"
+        conn.execute("ATTACH DATABASE ? AS archive", (archive_path(),))
+        conn.execute("PRAGMA archive.auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA archive.journal_mode=WAL")
+        _local.conn = conn
+    return conn
+
+def get_connection() -> sqlite3.Connection:
+    """Get this thread's connection, creating the schema on first use."""
+    if not _schema_ready:
+        init_db()
+    return _thread_connection()
+
+def close_connection() -> None:
+    """Close this thread's connection (e.g. on shutdown)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
 
 def init_db():
-    """Initialize the SQLite database and tables."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Create feedback table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS feedback (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        module_id TEXT NOT NULL,
-        challenge TEXT,
-        rating INTEGER NOT NULL,
-        implementation_status TEXT NOT NULL,
-        comments TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    # Simple migration: try to add challenge column if it doesn't exist
-    try:
-        cursor.execute("ALTER TABLE feedback ADD COLUMN challenge TEXT")
-    except sqlite3.OperationalError:
-        pass # Column likely already exists
+    """Initialize the SQLite database and tables (once per process)."""
+    global _schema_ready
+    with _schema_lock:
+        if _schema_ready:
+            return
+        conn = _thread_connection()
+        version = migrate(conn)
+        _ensure_archive_schema(conn)
+        _schema_ready = True
+        logger.info(f"Database schema ready: {DB_PATH} (version {version})")
 
-    # Migration: add conversation_id
+# ============= Keyset Pagination =============
+
+def _encode_cursor(*values: Any) -> str:
+    """Opaque page cursor holding the sort key of the last row served."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode a page cursor, raising ValueError if it is malformed."""
     try:
-        cursor.execute("ALTER TABLE feedback ADD COLUMN conversation_id INTEGER")
-    except sqlite3.OperationalError:
-        pass 
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+def _keyset_page(
+    rows: List[sqlite3.Row],
+    limit: int,
+    key_columns: Sequence[str]
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Trim a LIMIT limit+1 result to one page and build the next cursor."""
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_cursor(*(items[-1][column] for column in key_columns))
+    return items, next_cursor
+
+def _keyset_filter(after: Optional[str], sort_column: str, id_column: str) -> Tuple[str, tuple]:
+    """
+    SQL condition selecting rows after a cursor in (sort_column, id) DESC order.
     
-    # Create conversations table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS conversations (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    Written as a range on sort_column plus a tie-break so SQLite seeks
+    straight into the (sort_column, rowid) index instead of scanning.
+    """
+    if not after:
+        return "1 = 1", ()
+    sort_value, row_id = _decode_cursor(after, 2)
+    return (
+        f"{sort_column} <= ? AND ({sort_column} < ? OR {id_column} < ?)",
+        (sort_value, sort_value, row_id)
     )
-    """)
-    
-    # Create messages table
+
+# ============= Rollups =============
+
+def _rollup_feedback(cursor: sqlite3.Cursor, module_id: str, rating: int, status: str, created_at: str) -> None:
+    """Fold one new feedback row into the rollup tables (same transaction as the insert)."""
     cursor.execute("""
-    CREATE TABLE IF NOT EXISTS messages (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        conversation_id INTEGER NOT NULL,
-        role TEXT NOT NULL,
-        content TEXT NOT NULL,
-        module_data TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (conversation_id) REFERENCES conversations (id)
-    )
-    """)
-    
-    conn.commit()
-    conn.close()
+    INSERT INTO feedback_totals (id, count, rating_sum) VALUES (1, 1, ?)
+    ON CONFLICT (id) DO UPDATE SET count = count + 1, rating_sum = rating_sum + excluded.rating_sum
+    """, (rating,))
+    cursor.execute("""
+    INSERT INTO feedback_status_counts (status, count) VALUES (?, 1)
+    ON CONFLICT (status) DO UPDATE SET count = count + 1
+    """, (status,))
+    cursor.execute("""
+    INSERT INTO feedback_daily (day, count, rating_sum) VALUES (?, 1, ?)
+    ON CONFLICT (day) DO UPDATE SET count = count + 1, rating_sum = rating_sum + excluded.rating_sum
+    """, (created_at[:10], rating))
+    cursor.execute("""
+    INSERT INTO feedback_modules (module_id, count, rating_sum, last_feedback_at) VALUES (?, 1, ?, ?)
+    ON CONFLICT (module_id) DO UPDATE SET
+        count = count + 1,
+        rating_sum = rating_sum + excluded.rating_sum,
+        last_feedback_at = excluded.last_feedback_at
+    """, (module_id, rating, created_at))
 
-def save_feedback(data: Dict[str, Any]) -> int:
-    """Save feedback to the database."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def _rollup_message(cursor: sqlite3.Cursor, role: str, created_at: str) -> None:
+    """Count one new message in the per-day activity rollup."""
+    cursor.execute("""
+    INSERT INTO message_daily (day, role, count) VALUES (?, ?, 1)
+    ON CONFLICT (day, role) DO UPDATE SET count = count + 1
+    """, (created_at[:10], role))
+
+def rebuild_rollups() -> None:
+    """Recompute all rollups from the raw tables, archived rows included (backfill or repair)."""
+    conn = get_connection()
+    with conn:
+        _rebuild_rollups(conn, include_archive=True)
+    logger.info("Rollup tables rebuilt")
+
+# ============= Feedback =============
+
+def write_feedback(cursor: sqlite3.Cursor, data: Dict[str, Any]) -> int:
+    """Insert feedback (and fold it into the rollups) on an open cursor; the caller commits."""
+    created_at = datetime.utcnow().isoformat() + 'Z'
     
     cursor.execute("""
     INSERT INTO feedback (module_id, challenge, rating, implementation_status, comments, conversation_id, created_at)
@@ -76,18 +186,23 @@ def save_feedback(data: Dict[str, Any]) -> int:
         data['implementation_status'], 
         data.get('comments'),
         data.get('conversation_id'),
-        datetime.utcnow().isoformat() + 'Z'
+        created_at
     ))
     
     feedback_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _rollup_feedback(cursor, data['module_id'], data['rating'], data['implementation_status'], created_at)
     return feedback_id
 
+def save_feedback(data: Dict[str, Any]) -> int:
+    """Save feedback to the database."""
+    conn = get_connection()
+    # Commits on success, rolls back on error so the shared connection stays clean
+    with conn:
+        return write_feedback(conn.cursor(), data)
+
 def get_all_feedback() -> List[Dict[str, Any]]:
     """Retrieve all feedback from the database."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # To return dict-like objects
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("SELECT * FROM feedback ORDER BY created_at DESC")
@@ -97,63 +212,144 @@ def get_all_feedback() -> List[Dict[str, Any]]:
     for row in rows:
         feedback_list.append(dict(row))
         
-    conn.close()
     return feedback_list
 
-def get_feedback_stats() -> Dict[str, Any]:
-    """Calculate aggregated feedback statistics."""
-    conn = sqlite3.connect(DB_PATH)
+def get_feedback_page(limit: int = 50, after: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Retrieve feedback newest first, one page at a time.
+    
+    Args:
+        limit: Page size
+        after: next_cursor returned with the previous page
+    
+    Returns:
+        (feedback rows with module_title, cursor for the next page or None)
+    """
+    conn = get_connection()
+    where, params = _keyset_filter(after, "f.created_at", "f.id")
+    
+    rows = conn.execute(f"""
+    SELECT f.*, mo.title AS module_title
+    FROM feedback f
+    LEFT JOIN modules mo ON mo.id = f.module_id
+    WHERE {where}
+    ORDER BY f.created_at DESC, f.id DESC
+    LIMIT ?
+    """, (*params, limit + 1)).fetchall()
+    
+    return _keyset_page(rows, limit, ("created_at", "id"))
+
+def get_feedback_since(after_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+    """Feedback rows with id > after_id (oldest first, at most limit), shaped like get_feedback_page."""
+    conn = get_connection()
+    rows = conn.execute("""
+    SELECT f.*, mo.title AS module_title
+    FROM feedback f
+    LEFT JOIN modules mo ON mo.id = f.module_id
+    WHERE f.id > ?
+    ORDER BY f.id DESC
+    LIMIT ?
+    """, (after_id, limit)).fetchall()
+    return [dict(row) for row in reversed(rows)]
+
+def get_feedback_stats(days: int = 30) -> Dict[str, Any]:
+    """
+    Aggregated feedback statistics, read from the rollup tables.
+    
+    Args:
+        days: Number of most recent days (with activity) in the time series
+    
+    Returns:
+        Totals, status breakdown and per-day feedback/query counts
+    """
+    conn = get_connection()
     cursor = conn.cursor()
     
-    # Total count
-    cursor.execute("SELECT COUNT(*) FROM feedback")
-    total_count = cursor.fetchone()[0]
+    # Totals
+    cursor.execute("SELECT count, rating_sum FROM feedback_totals WHERE id = 1")
+    totals = cursor.fetchone()
+    total_count = totals["count"] if totals else 0
     
     if total_count == 0:
         return {
             "total_count": 0,
             "average_rating": 0,
-            "implementation_breakdown": {}
+            "implementation_breakdown": {},
+            "daily": []
         }
 
     # Average rating
-    cursor.execute("SELECT AVG(rating) FROM feedback")
-    average_rating = round(cursor.fetchone()[0], 1)
+    average_rating = round(totals["rating_sum"] / total_count, 1)
     
     # Implementation status breakdown
-    cursor.execute("SELECT implementation_status, COUNT(*) FROM feedback GROUP BY implementation_status")
-    status_rows = cursor.fetchall()
-    implementation_breakdown = {row[0]: row[1] for row in status_rows}
+    cursor.execute("SELECT status, count FROM feedback_status_counts WHERE count > 0")
+    implementation_breakdown = {row[0]: row[1] for row in cursor.fetchall()}
     
-    conn.close()
+    # Per-day time series: feedback volume and rating alongside teacher queries
+    cursor.execute("""
+    SELECT d.day, d.count, d.rating_sum, COALESCE(m.count, 0) AS queries
+    FROM (SELECT * FROM feedback_daily ORDER BY day DESC LIMIT ?) d
+    LEFT JOIN message_daily m ON m.day = d.day AND m.role = 'user'
+    ORDER BY d.day ASC
+    """, (days,))
+    daily = [
+        {
+            "day": row["day"],
+            "feedback_count": row["count"],
+            "average_rating": round(row["rating_sum"] / row["count"], 1) if row["count"] else 0,
+            "query_count": row["queries"]
+        }
+        for row in cursor.fetchall()
+    ]
     
     return {
         "total_count": total_count,
         "average_rating": average_rating,
-        "implementation_breakdown": implementation_breakdown
+        "implementation_breakdown": implementation_breakdown,
+        "daily": daily
+    }
+
+def get_module_feedback_stats(module_id: str) -> Optional[Dict[str, Any]]:
+    """Feedback count, average rating and latest feedback time for one module."""
+    conn = get_connection()
+    row = conn.execute("""
+    SELECT fm.module_id, mo.title, fm.count, fm.rating_sum, fm.last_feedback_at
+    FROM feedback_modules fm
+    LEFT JOIN modules mo ON mo.id = fm.module_id
+    WHERE fm.module_id = ?
+    """, (module_id,)).fetchone()
+    if row is None:
+        return None
+    return {
+        "module_id": row["module_id"],
+        "module_title": row["title"],
+        "feedback_count": row["count"],
+        "average_rating": round(row["rating_sum"] / row["count"], 1) if row["count"] else 0,
+        "last_feedback_at": row["last_feedback_at"]
     }
 
 # ============= Conversation Management =============
 
+# Message fields returned by the message readers (module_data is loaded separately)
+_MESSAGE_COLUMNS = "m.id, m.conversation_id, m.role, m.content, m.module_id, mo.title AS module_title, m.created_at"
+
 def create_conversation(title: str) -> int:
     """Create a new conversation."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-    INSERT INTO conversations (title, created_at, updated_at)
-    VALUES (?, ?, ?)
-    """, (title, datetime.utcnow().isoformat() + 'Z', datetime.utcnow().isoformat() + 'Z'))
-    
-    conversation_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    conn = get_connection()
+    with conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+        INSERT INTO conversations (title, created_at, updated_at)
+        VALUES (?, ?, ?)
+        """, (title, datetime.utcnow().isoformat() + 'Z', datetime.utcnow().isoformat() + 'Z'))
+        
+        conversation_id = cursor.lastrowid
     return conversation_id
 
 def get_all_conversations() -> List[Dict[str, Any]]:
     """Retrieve all conversations."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("SELECT * FROM conversations ORDER BY updated_at DESC")
@@ -163,61 +359,235 @@ def get_all_conversations() -> List[Dict[str, Any]]:
     for row in rows:
         conversations.append(dict(row))
         
-    conn.close()
     return conversations
 
-def add_message(conversation_id: int, role: str, content: str, module_data: Optional[Dict] = None) -> int:
-    """Add a message to a conversation."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def get_conversations_page(limit: int = 50, after: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Retrieve conversations most recently active first, one page at a time.
     
-    module_json = json.dumps(module_data) if module_data else None
+    A conversation that gets a new message while a client is paging moves to
+    the front, so it may be missed or repeated by that client's later pages.
     
-    cursor.execute("""
-    INSERT INTO messages (conversation_id, role, content, module_data, created_at)
-    VALUES (?, ?, ?, ?, ?)
-    """, (conversation_id, role, content, module_json, datetime.utcnow().isoformat() + 'Z'))
+    Args:
+        limit: Page size
+        after: next_cursor returned with the previous page
+    
+    Returns:
+        (conversations, cursor for the next page or None)
+    """
+    conn = get_connection()
+    where, params = _keyset_filter(after, "updated_at", "id")
+    
+    rows = conn.execute(f"""
+    SELECT * FROM conversations
+    WHERE {where}
+    ORDER BY updated_at DESC, id DESC
+    LIMIT ?
+    """, (*params, limit + 1)).fetchall()
+    
+    return _keyset_page(rows, limit, ("updated_at", "id"))
+
+def write_messages(
+    cursor: sqlite3.Cursor,
+    conversation_id: int,
+    messages: List[Tuple[str, str, Optional[Dict]]]
+) -> List[int]:
+    """
+    Insert messages into a conversation on an open cursor; the caller commits.
     
-    message_id = cursor.lastrowid
+    Args:
+        cursor: Cursor inside the caller's transaction
+        conversation_id: Conversation ID
+        messages: (role, content, module_data) tuples in order; module_data may be an EncodedModule
     
-    # Update conversation timestamp
+    Returns:
+        New message IDs
+    """
+    created_at = datetime.utcnow().isoformat() + 'Z'
+    
+    # Update conversation timestamp; no row means it was never created or has
+    # been archived meanwhile, and messages written now would be orphaned
     cursor.execute("""
     UPDATE conversations SET updated_at = ? WHERE id = ?
-    """, (datetime.utcnow().isoformat() + 'Z', conversation_id))
+    """, (created_at, conversation_id))
+    if cursor.rowcount == 0:
+        raise ConversationNotFound(f"Conversation {conversation_id} not found")
     
-    conn.commit()
-    conn.close()
-    return message_id
+    message_ids = []
+    for role, content, module_data in messages:
+        module_id = write_module(cursor, module_data, created_at) if module_data else None
+        cursor.execute("""
+        INSERT INTO messages (conversation_id, role, content, module_id, created_at)
+        VALUES (?, ?, ?, ?, ?)
+        """, (conversation_id, role, content, module_id, created_at))
+        message_ids.append(cursor.lastrowid)
+        _rollup_message(cursor, role, created_at)
+    return message_ids
+
+def add_message(conversation_id: int, role: str, content: str, module_data: Optional[Dict] = None) -> int:
+    """Add a message to a conversation."""
+    conn = get_connection()
+    with conn:
+        return write_messages(conn.cursor(), conversation_id, [(role, content, module_data)])[0]
+
+def add_messages(conversation_id: int, messages: List[Tuple[str, str, Optional[Dict]]]) -> List[int]:
+    """Add several messages (e.g. a user/assistant exchange) to a conversation in one transaction."""
+    conn = get_connection()
+    with conn:
+        return write_messages(conn.cursor(), conversation_id, messages)
 
 def get_conversation_messages(conversation_id: int) -> List[Dict[str, Any]]:
     """Retrieve all messages for a conversation."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute("""
-    SELECT * FROM messages 
-    WHERE conversation_id = ? 
-    ORDER BY created_at ASC
+    cursor.execute(f"""
+    SELECT {_MESSAGE_COLUMNS}, mo.payload AS module_payload
+    FROM messages m
+    LEFT JOIN modules mo ON mo.id = m.module_id
+    WHERE m.conversation_id = ?
+    ORDER BY m.created_at ASC
     """, (conversation_id,))
     
-    rows = cursor.fetchall()
+    return _with_modules([dict(row) for row in cursor.fetchall()])
+
+def get_messages_page(
+    conversation_id: int,
+    limit: int = 50,
+    after: Optional[str] = None,
+    include_modules: bool = True
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Retrieve the latest messages of a conversation, paging back in time.
     
-    messages = []
-    for row in rows:
-        msg = dict(row)
-        # Parse module_data JSON if present
-        if msg['module_data']:
-            msg['module_data'] = json.loads(msg['module_data'])
-        messages.append(msg)
-        
-    conn.close()
-    return messages
+    Args:
+        conversation_id: Conversation ID
+        limit: Page size
+        after: next_cursor returned with the previous (newer) page
+        include_modules: Load and decompress module_data; False leaves it None
+            (module_id and module_title are always set, for loading it lazily)
+    
+    Returns:
+        (messages in chronological order, cursor for the older page or None)
+    """
+    conn = get_connection()
+    where, params = _keyset_filter(after, "m.created_at", "m.id")
+    payload_column = "mo.payload" if include_modules else "NULL"
+    
+    rows = conn.execute(f"""
+    SELECT {_MESSAGE_COLUMNS}, {payload_column} AS module_payload
+    FROM messages m
+    LEFT JOIN modules mo ON mo.id = m.module_id
+    WHERE m.conversation_id = ? AND {where}
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT ?
+    """, (conversation_id, *params, limit + 1)).fetchall()
+    
+    messages, next_cursor = _keyset_page(rows, limit, ("created_at", "id"))
+    messages.reverse()
+    return _with_modules(messages), next_cursor
+
+def get_recent_turns(conversation_id: int, limit: int) -> List[Dict[str, Any]]:
+    """
+    Retrieve the last few messages of a conversation for prompt history.
+    
+    Only the module title is read (never the payload), so long conversations
+    with large modules cost the same as short ones.
+    
+    Args:
+        conversation_id: Conversation ID
+        limit: Number of most recent messages
+    
+    Returns:
+        Messages (id, role, content, module_title) in chronological order
+    """
+    conn = get_connection()
+    rows = conn.execute("""
+    SELECT m.id, m.role, m.content, mo.title AS module_title
+    FROM messages m
+    LEFT JOIN modules mo ON mo.id = m.module_id
+    WHERE m.conversation_id = ?
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT ?
+    """, (conversation_id, limit)).fetchall()
+    return [dict(row) for row in reversed(rows)]
+
+def get_turns_between(conversation_id: int, after_id: int, before_id: int, limit: int) -> List[Dict[str, Any]]:
+    """
+    Retrieve messages with after_id < id < before_id, oldest first.
+    
+    Used to fold turns that have left the history window into the rolling summary.
+    """
+    conn = get_connection()
+    rows = conn.execute("""
+    SELECT m.id, m.role, m.content, mo.title AS module_title
+    FROM messages m
+    LEFT JOIN modules mo ON mo.id = m.module_id
+    WHERE m.conversation_id = ? AND m.id > ? AND m.id < ?
+    ORDER BY m.id ASC
+    LIMIT ?
+    """, (conversation_id, after_id, before_id, limit)).fetchall()
+    return [dict(row) for row in rows]
+
+def get_conversation_summary(conversation_id: int) -> Optional[Dict[str, Any]]:
+    """Retrieve a conversation's rolling summary and the last message id it covers."""
+    conn = get_connection()
+    row = conn.execute("""
+    SELECT summary, summarized_until, updated_at FROM conversation_summaries
+    WHERE conversation_id = ?
+    """, (conversation_id,)).fetchone()
+    return dict(row) if row else None
+
+def save_conversation_summary(conversation_id: int, summary: str, summarized_until: int) -> None:
+    """Store (or replace) a conversation's rolling summary."""
+    conn = get_connection()
+    with conn:
+        conn.execute("""
+        INSERT OR REPLACE INTO conversation_summaries (conversation_id, summary, summarized_until, updated_at)
+        VALUES (?, ?, ?, ?)
+        """, (conversation_id, summary, summarized_until, datetime.utcnow().isoformat() + 'Z'))
+
+def get_recent_queries_page(limit: int = 50, after: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Retrieve user queries newest first, one page at a time.
+    
+    Args:
+        limit: Page size
+        after: next_cursor returned with the previous page
+    
+    Returns:
+        (queries with content, created_at and topic, cursor for the next page or None)
+    """
+    conn = get_connection()
+    where, params = _keyset_filter(after, "m.created_at", "m.id")
+    
+    rows = conn.execute(f"""
+    SELECT m.id, m.content, m.created_at, c.title as topic
+    FROM messages m
+    JOIN conversations c ON m.conversation_id = c.id
+    WHERE m.role = 'user' AND {where}
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT ?
+    """, (*params, limit + 1)).fetchall()
+    
+    return _keyset_page(rows, limit, ("created_at", "id"))
+
+def get_queries_since(after_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+    """User queries with message id > after_id (oldest first, at most limit), shaped like get_recent_queries_page."""
+    conn = get_connection()
+    rows = conn.execute("""
+    SELECT m.id, m.content, m.created_at, c.title as topic
+    FROM messages m
+    JOIN conversations c ON m.conversation_id = c.id
+    WHERE m.id > ? AND m.role = 'user'
+    ORDER BY m.id DESC
+    LIMIT ?
+    """, (after_id, limit)).fetchall()
+    return [dict(row) for row in reversed(rows)]
 
 def get_recent_queries(limit: int = 50) -> List[Dict[str, Any]]:
     """Retrieve recent user queries (messages with role='user')."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -235,5 +605,453 @@ def get_recent_queries(limit: int = 50) -> List[Dict[str, Any]]:
     for row in rows:
         queries.append(dict(row))
         
-    conn.close()
     return queries
+
+# ============= Modules =============
+
+def write_module(cursor: sqlite3.Cursor, module: Union[Dict[str, Any], EncodedModule], created_at: str) -> str:
+    """
+    Store (or replace) a generated module, compressed, on an open cursor; returns its id.
+    
+    An EncodedModule's JSON is stored as already serialized rather than encoded again.
+    """
+    module_data = module.data if isinstance(module, EncodedModule) else module
+    cursor.execute("""
+    INSERT INTO modules (id, title, payload, created_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET title = excluded.title, payload = excluded.payload
+    """, (module_data['id'], module_data.get('title', ''), pack_module(module), created_at))
+    # Index the uncompressed text while we still have it
+    cursor.execute("""
+    INSERT OR REPLACE INTO modules_fts (rowid, title, body)
+    SELECT rowid, title, ? FROM modules WHERE id = ?
+    """, (module_text(module_data), module_data['id']))
+    return module_data['id']
+
+def get_module_by_id(module_id: str) -> Optional[Dict[str, Any]]:
+    """Find a generated module by its Module.id."""
+    conn = get_connection()
+    row = conn.execute("SELECT payload FROM modules WHERE id = ?", (module_id,)).fetchone()
+    return unpack_module(row[0]) if row else None
+
+def _with_modules(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace each message's module_payload with the decompressed module_data."""
+    for msg in messages:
+        payload = msg.pop('module_payload')
+        msg['module_data'] = unpack_module(payload) if payload else None
+    return messages
+
+# ============= Search =============
+
+# Per indexed source: how to rank matches, and how to describe the hits on a page.
+# bm25 is negative, lower is a better match; module titles weigh 4x their body.
+_SEARCH_SOURCES = {
+    "message": (
+        "SELECT 'message' AS kind, rowid, bm25(messages_fts) AS rank FROM messages_fts WHERE messages_fts MATCH :query",
+        """
+        SELECT f.rowid, m.conversation_id, NULL AS module_id, c.title,
+               snippet(messages_fts, 0, '[', ']', '…', 16) AS snippet, m.created_at
+        FROM messages_fts f
+        JOIN messages m ON m.id = f.rowid
+        JOIN conversations c ON c.id = m.conversation_id
+        WHERE messages_fts MATCH :query AND f.rowid IN ({rowids})
+        """
+    ),
+    "conversation": (
+        "SELECT 'conversation' AS kind, rowid, bm25(conversations_fts) AS rank FROM conversations_fts WHERE conversations_fts MATCH :query",
+        """
+        SELECT f.rowid, c.id AS conversation_id, NULL AS module_id, c.title,
+               snippet(conversations_fts, 0, '[', ']', '…', 16) AS snippet, c.updated_at AS created_at
+        FROM conversations_fts f
+        JOIN conversations c ON c.id = f.rowid
+        WHERE conversations_fts MATCH :query AND f.rowid IN ({rowids})
+        """
+    ),
+    "module": (
+        "SELECT 'module' AS kind, rowid, bm25(modules_fts, 4.0, 1.0) AS rank FROM modules_fts WHERE modules_fts MATCH :query",
+        """
+        SELECT f.rowid,
+               (SELECT conversation_id FROM messages WHERE module_id = mo.id LIMIT 1) AS conversation_id,
+               mo.id AS module_id, mo.title,
+               snippet(modules_fts, 1, '[', ']', '…', 16) AS snippet, mo.created_at
+        FROM modules_fts f
+        JOIN modules mo ON mo.rowid = f.rowid
+        WHERE modules_fts MATCH :query AND f.rowid IN ({rowids})
+        """
+    )
+}
+
+def _fts_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word must match, the last as a prefix.
+    
+    Each word is quoted, so FTS5 operators and punctuation in user input are
+    matched literally instead of raising syntax errors.
+    """
+    words = [word.replace('"', '""') for word in text.split()]
+    if not words:
+        raise ValueError("Search query is empty")
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+def search(
+    query: str,
+    kind: Optional[str] = None,
+    limit: int = 20,
+    after: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Full-text search over teachers' messages, conversation titles and modules, best match first.
+    
+    Args:
+        query: Words to search for (the last one may be a prefix)
+        kind: Restrict to "message", "conversation" or "module"; None searches all
+        limit: Page size
+        after: next_cursor returned with the previous page
+    
+    Returns:
+        (hits with kind, conversation_id, module_id, title, snippet, created_at and rank,
+         cursor for the next page or None)
+    """
+    if kind is not None and kind not in _SEARCH_SOURCES:
+        raise ValueError(f"Unknown search kind: {kind}")
+    kinds = [kind] if kind else list(_SEARCH_SOURCES)
+    params: Dict[str, Any] = {"query": _fts_query(query), "limit": limit + 1}
+    
+    where = "1 = 1"
+    if after:
+        params["rank"], params["kind"], params["rowid"] = _decode_cursor(after, 3)
+        where = "(rank, kind, rowid) > (:rank, :kind, :rowid)"
+    
+    # Rank every match on bm25 alone; snippets and joins are only worth doing for the page
+    conn = get_connection()
+    rows = conn.execute(f"""
+    SELECT * FROM ({" UNION ALL ".join(_SEARCH_SOURCES[k][0] for k in kinds)})
+    WHERE {where}
+    ORDER BY rank, kind, rowid
+    LIMIT :limit
+    """, params).fetchall()
+    hits, next_cursor = _keyset_page(rows, limit, ("rank", "kind", "rowid"))
+    
+    for k in kinds:
+        rowids = [hit["rowid"] for hit in hits if hit["kind"] == k]
+        if not rowids:
+            continue
+        details = {
+            row["rowid"]: dict(row)
+            for row in conn.execute(
+                _SEARCH_SOURCES[k][1].format(rowids=", ".join(f":r{i}" for i in range(len(rowids)))),
+                {"query": params["query"], **{f"r{i}": rowid for i, rowid in enumerate(rowids)}}
+            )
+        }
+        for hit in hits:
+            if hit["kind"] == k:
+                hit.update(details.get(hit["rowid"], {}))
+    
+    for hit in hits:
+        del hit["rowid"]
+    return hits, next_cursor
+
+def rebuild_search_index() -> None:
+    """Re-index all messages, conversations and modules (backfill or repair)."""
+    conn = get_connection()
+    with conn:
+        _rebuild_search_index(conn)
+    logger.info("Search index rebuilt")
+
+def optimize_search_index() -> None:
+    """Merge the search indexes' incremental segments (off-hours maintenance)."""
+    conn = get_connection()
+    with conn:
+        _optimize_search_index(conn)
+
+# ============= Retention =============
+
+# Tables whose rows move to the archive database
+_ARCHIVED_TABLES = ("conversations", "messages", "modules", "conversation_summaries", "feedback")
+
+def archive_path() -> str:
+    """Archive database file: ARCHIVE_DATABASE_URL, or <database>_archive.db next to DB_PATH."""
+    if settings.ARCHIVE_DATABASE_URL:
+        return _sqlite_path(settings.ARCHIVE_DATABASE_URL)
+    root, ext = os.path.splitext(DB_PATH)
+    return f"{root}_archive{ext or '.db'}"
+
+def _table_columns(conn: sqlite3.Connection, schema: str, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+def _ensure_archive_schema(conn: sqlite3.Connection) -> None:
+    """Mirror the archived tables in the archive database, including columns added by later migrations."""
+    for table in _ARCHIVED_TABLES:
+        archived = _table_columns(conn, "archive", table)
+        if not archived:
+            sql = conn.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()[0]
+            conn.execute(re.sub(rf'^CREATE TABLE\s+"?{table}"?', f"CREATE TABLE archive.{table}", sql, count=1))
+            continue
+        for row in conn.execute(f"PRAGMA main.table_info({table})").fetchall():
+            if row[1] not in archived:
+                conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {row[1]} {row[2]}")
+    
+    # Restore looks conversations up by id; listing pages by updated_at
+    conn.execute("CREATE INDEX IF NOT EXISTS archive.idx_messages_conversation ON messages (conversation_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS archive.idx_feedback_conversation ON feedback (conversation_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS archive.idx_conversations_updated ON conversations (updated_at)")
+    conn.commit()
+
+def _copy_rows(conn: sqlite3.Connection, table: str, source: str, target: str, where: str, params: Sequence) -> None:
+    """Copy the rows of source.table matching where into target.table (columns by name)."""
+    columns = ", ".join(_table_columns(conn, "main", table))
+    conflict = "REPLACE" if target == "archive" else "IGNORE"
+    conn.execute(f"""
+    INSERT OR {conflict} INTO {target}.{table} ({columns})
+    SELECT {columns} FROM {source}.{table} WHERE {where.format(source=source)}
+    """, params)
+
+def _move_rows(conn: sqlite3.Connection, scopes: List[Tuple[str, str]], source: str, target: str, params: Sequence) -> None:
+    """
+    Move rows between the main and archive databases.
+    
+    The copy commits before the delete, so a crash in between leaves a row
+    in both places (the next run settles it), never in neither. Deletes run
+    in scope order: list scopes that read another table before that table.
+    """
+    with conn:
+        for table, where in scopes:
+            _copy_rows(conn, table, source, target, where, params)
+    with conn:
+        for table, where in scopes:
+            conn.execute(f"DELETE FROM {source}.{table} WHERE {where.format(source=source)}", params)
+
+def _cutoff(older_than_days: int) -> str:
+    return (datetime.utcnow() - timedelta(days=older_than_days)).isoformat() + 'Z'
+
+def archive_conversations(older_than_days: int, limit: int) -> int:
+    """
+    Move up to limit conversations not updated for older_than_days into the archive.
+    
+    Messages, their modules, the rolling summary and feedback on the
+    conversation or its modules go with it, so no feedback left in main
+    points at an archived module. The rollup tables are left alone, so
+    archived activity still counts in the dashboard statistics.
+    
+    Returns:
+        Number of conversations archived
+    """
+    conn = get_connection()
+    ids = [row[0] for row in conn.execute("""
+    SELECT id FROM conversations WHERE updated_at < ? ORDER BY updated_at LIMIT ?
+    """, (_cutoff(older_than_days), limit))]
+    if not ids:
+        return 0
+    
+    # Numbered so a scope can use the id list twice
+    in_ids = ", ".join(f"?{i + 1}" for i in range(len(ids)))
+    module_ids = f"SELECT module_id FROM {{source}}.messages WHERE conversation_id IN ({in_ids})"
+    _move_rows(conn, [
+        ("feedback", f"conversation_id IN ({in_ids}) OR module_id IN ({module_ids})"),
+        ("modules", f"id IN ({module_ids})"),
+        ("conversation_summaries", f"conversation_id IN ({in_ids})"),
+        ("messages", f"conversation_id IN ({in_ids})"),
+        ("conversations", f"id IN ({in_ids})"),
+    ], "main", "archive", ids)
+    logger.info(f"Archived {len(ids)} conversations")
+    return len(ids)
+
+def archive_feedback(older_than_days: int, limit: int) -> int:
+    """Move up to limit feedback rows older than older_than_days into the archive (rollups unchanged)."""
+    conn = get_connection()
+    ids = [row[0] for row in conn.execute("""
+    SELECT id FROM feedback WHERE created_at < ? ORDER BY created_at LIMIT ?
+    """, (_cutoff(older_than_days), limit))]
+    if not ids:
+        return 0
+    
+    _move_rows(conn, [("feedback", f"id IN ({', '.join('?' * len(ids))})")], "main", "archive", ids)
+    logger.info(f"Archived {len(ids)} feedback rows")
+    return len(ids)
+
+def restore_conversation(conversation_id: int) -> bool:
+    """
+    Bring an archived conversation (messages, modules, summary, feedback) back into the main database.
+    
+    Returns:
+        False if the conversation is not in the archive
+    """
+    conn = get_connection()
+    if conn.execute("SELECT 1 FROM archive.conversations WHERE id = ?", (conversation_id,)).fetchone() is None:
+        return False
+    
+    # The same rows archive_conversations moved out
+    scopes = [
+        ("modules", "id IN (SELECT module_id FROM {source}.messages WHERE conversation_id = ?1)"),
+        ("conversation_summaries", "conversation_id = ?1"),
+        ("feedback", "conversation_id = ?1 OR module_id IN (SELECT module_id FROM {source}.messages WHERE conversation_id = ?1)"),
+        ("messages", "conversation_id = ?1"),
+        ("conversations", "id = ?1"),
+    ]
+    with conn:
+        for table, where in scopes:
+            _copy_rows(conn, table, "archive", "main", where, (conversation_id,))
+        # Message and title triggers re-index the rest; module text is only in the payload
+        for rowid, title, payload in conn.execute("""
+        SELECT rowid, title, payload FROM modules
+        WHERE id IN (SELECT module_id FROM messages WHERE conversation_id = ?)
+        """, (conversation_id,)).fetchall():
+            conn.execute(
+                "INSERT OR REPLACE INTO modules_fts (rowid, title, body) VALUES (?, ?, ?)",
+                (rowid, title, module_text(unpack_module(payload)))
+            )
+        # Touched now, so the next retention run does not archive it straight back
+        conn.execute(
+            "UPDATE conversations SET updated_at = ? WHERE id = ?",
+            (datetime.utcnow().isoformat() + 'Z', conversation_id)
+        )
+    with conn:
+        for table, where in scopes:
+            conn.execute(f"DELETE FROM archive.{table} WHERE {where.format(source='archive')}", (conversation_id,))
+    
+    logger.info(f"Restored conversation {conversation_id} from the archive")
+    return True
+
+def get_archived_conversations_page(limit: int = 50, after: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Retrieve archived conversations, most recently active first.
+    
+    Args:
+        limit: Page size
+        after: next_cursor returned with the previous page
+    
+    Returns:
+        (conversations, cursor for the next page or None)
+    """
+    conn = get_connection()
+    where, params = _keyset_filter(after, "updated_at", "id")
+    
+    rows = conn.execute(f"""
+    SELECT * FROM archive.conversations
+    WHERE {where}
+    ORDER BY updated_at DESC, id DESC
+    LIMIT ?
+    """, (*params, limit + 1)).fetchall()
+    
+    return _keyset_page(rows, limit, ("updated_at", "id"))
+
+def compact_database(max_pages: int) -> int:
+    """
+    Return up to max_pages free pages to the filesystem (incremental vacuum).
+    
+    Returns:
+        Pages freed; 0 when none are free or the database predates
+        incremental auto-vacuum (see vacuum_database)
+    """
+    conn = get_connection()
+    if conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] != 2:
+        return 0
+    before = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+    if not before:
+        return 0
+    
+    # sqlite3 steps a PRAGMA statement once and incremental_vacuum frees one
+    # page per step, so step it page by page inside a single transaction
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for _ in range(min(before, max_pages)):
+            conn.execute("PRAGMA main.incremental_vacuum(1)")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    freed = before - conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+    if freed:
+        # The file only shrinks once the WAL is checkpointed
+        conn.execute("PRAGMA main.wal_checkpoint(TRUNCATE)").fetchall()
+    return freed
+
+def vacuum_database() -> None:
+    """Rebuild the database file with VACUUM, switching it to incremental auto-vacuum (run offline)."""
+    conn = get_connection()
+    conn.execute("PRAGMA main.auto_vacuum=INCREMENTAL")
+    conn.execute("VACUUM main")
+    conn.execute("PRAGMA main.wal_checkpoint(TRUNCATE)").fetchall()
+
+# ============= Module Translations =============
+
+def save_module_translation(module_id: str, language: str, module_data: Dict) -> None:
+    """Store (or replace) a translated module."""
+    conn = get_connection()
+    with conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+        INSERT OR REPLACE INTO module_translations (module_id, language, module_data, created_at)
+        VALUES (?, ?, ?, ?)
+        """, (module_id, language, json.dumps(module_data), datetime.utcnow().isoformat() + 'Z'))
+
+def get_module_translation(module_id: str, language: str) -> Optional[Dict[str, Any]]:
+    """Retrieve a stored module translation, if one exists."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+    SELECT module_data FROM module_translations
+    WHERE module_id = ? AND language = ?
+    """, (module_id, language))
+    
+    row = cursor.fetchone()
+    return json.loads(row[0]) if row else None
+
+# ============= Precomputed Modules =============
+
+def save_precomputed_module(
+    challenge: str,
+    target_duration: int,
+    difficulty_level: str,
+    embedding: List[float],
+    module_data: Dict,
+    corpus_version: str
+) -> int:
+    """Store a module generated ahead of time for a trending challenge."""
+    conn = get_connection()
+    with conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+        INSERT INTO precomputed_modules (challenge, target_duration, difficulty_level, embedding, module_data, corpus_version, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            challenge,
+            target_duration,
+            difficulty_level,
+            json.dumps(embedding),
+            json.dumps(module_data),
+            corpus_version,
+            datetime.utcnow().isoformat() + 'Z'
+        ))
+        
+        precomputed_id = cursor.lastrowid
+    return precomputed_id
+
+def get_precomputed_modules() -> List[Dict[str, Any]]:
+    """Retrieve all precomputed modules with decoded embeddings and modules."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT * FROM precomputed_modules")
+    rows = cursor.fetchall()
+    
+    modules = []
+    for row in rows:
+        entry = dict(row)
+        entry['embedding'] = json.loads(entry['embedding'])
+        entry['module_data'] = json.loads(entry['module_data'])
+        modules.append(entry)
+        
+    return modules
+
+def clear_precomputed_modules() -> None:
+    """Delete all precomputed modules (e.g. after the corpus changed)."""
+    conn = get_connection()
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM precomputed_modules")
@@ -0,0 +1,178 @@
+"""
+Group Commit - Batch concurrent small writes into shared SQLite transactions.
+"""
+import asyncio
+import logging
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Tuple
+
+from config import settings
+from utils import db_utils
+
+logger = logging.getLogger(__name__)
+
+class _PendingWrite:
+    """One caller's write operation waiting for the next commit."""
+
+    def __init__(self, op: Callable[..., Any], args: tuple, future: asyncio.Future):
+        self.op = op
+        self.args = args
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+class GroupCommitWriter:
+    """
+    Write-behind queue that commits concurrent writes together.
+
+    Callers queue an operation that takes an open cursor (db_utils.write_*).
+    Every DB_GROUP_COMMIT_WINDOW_MS the queued operations run on the writer
+    thread inside one transaction, so hundreds of teachers' messages share a
+    single commit and fsync. Each operation runs in its own savepoint: one
+    failing operation is rolled back alone. Callers are answered only after
+    the commit, so an acknowledged write is durable.
+    """
+
+    def __init__(self, executor_fn: Callable[[], Executor]):
+        """
+        Args:
+            executor_fn: Returns the single-thread executor that owns all DB writes
+        """
+        self.executor_fn = executor_fn
+        self.window = settings.DB_GROUP_COMMIT_WINDOW_MS / 1000
+        self.max_batch = settings.DB_GROUP_COMMIT_MAX_BATCH
+
+        self._pending: deque = deque()
+        self._committing = False
+        self._wakeup: asyncio.Event = None
+        self._dispatcher: asyncio.Task = None
+
+        self._batches = 0
+        self._writes = 0
+        self._failed_writes = 0
+        self._batch_sizes: deque = deque(maxlen=1000)
+        self._commit_ms: deque = deque(maxlen=1000)
+        self._latency_ms: deque = deque(maxlen=1000)
+
+    async def submit(self, op: Callable[..., Any], *args) -> Any:
+        """
+        Queue op(cursor, *args) and wait until its transaction has committed.
+
+        Returns:
+            The operation's return value
+
+        Raises:
+            Whatever the operation (or the commit) raised
+        """
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._dispatcher = loop.create_task(self._dispatch_forever())
+
+        pending = _PendingWrite(op, args, loop.create_future())
+        self._pending.append(pending)
+        self._wakeup.set()
+
+        result = await pending.future
+        self._latency_ms.append((time.perf_counter() - pending.enqueued_at) * 1000)
+        return result
+
+    async def _dispatch_forever(self) -> None:
+        """Commit whatever has queued up, one transaction per batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # Let concurrent writers join the transaction
+            await asyncio.sleep(self.window)
+
+            if not self._pending:
+                self._wakeup.clear()
+                continue
+
+            batch = [self._pending.popleft() for _ in range(min(len(self._pending), self.max_batch))]
+            started = time.perf_counter()
+            self._committing = True
+            try:
+                outcomes = await loop.run_in_executor(self.executor_fn(), self._commit, batch)
+            except Exception as e:
+                logger.error(f"Group commit of {len(batch)} writes failed: {str(e)}")
+                self._failed_writes += len(batch)
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+            finally:
+                self._committing = False
+
+            for pending, (ok, value) in zip(batch, outcomes):
+                if not ok:
+                    self._failed_writes += 1
+                if pending.future.done():
+                    continue
+                if ok:
+                    pending.future.set_result(value)
+                else:
+                    pending.future.set_exception(value)
+
+            self._batches += 1
+            self._writes += len(batch)
+            self._batch_sizes.append(len(batch))
+            self._commit_ms.append((time.perf_counter() - started) * 1000)
+
+    async def drain(self) -> None:
+        """Wait until every queued write has been committed (e.g. before shutdown)."""
+        while self._pending or self._committing:
+            if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not asyncio.get_running_loop():
+                break
+            await asyncio.sleep(self.window)
+
+    def _commit(self, batch: List[_PendingWrite]) -> List[Tuple[bool, Any]]:
+        """Run a batch in one transaction on the writer thread (one savepoint per write)."""
+        conn = db_utils.get_connection()
+        cursor = conn.cursor()
+        outcomes: List[Tuple[bool, Any]] = []
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for pending in batch:
+                cursor.execute("SAVEPOINT write_op")
+                try:
+                    outcomes.append((True, pending.op(cursor, *pending.args)))
+                    cursor.execute("RELEASE write_op")
+                except sqlite3.OperationalError:
+                    # Lock/IO trouble affects the whole transaction, not one write
+                    raise
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO write_op")
+                    cursor.execute("RELEASE write_op")
+                    outcomes.append((False, e))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return outcomes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get commit batch size and write latency metrics."""
+        def percentile(values: deque, q: float) -> float:
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+        return {
+            "queue_depth": len(self._pending),
+            "batches": self._batches,
+            "writes": self._writes,
+            "failed_writes": self._failed_writes,
+            "avg_batch_size": round(self._writes / self._batches, 2) if self._batches else 0.0,
+            "batch_size_p50": percentile(self._batch_sizes, 0.5),
+            "batch_size_max": max(self._batch_sizes) if self._batch_sizes else 0,
+            "commit_ms_p50": percentile(self._commit_ms, 0.5),
+            "commit_ms_p95": percentile(self._commit_ms, 0.95),
+            "write_latency_ms_p50": percentile(self._latency_ms, 0.5),
+            "write_latency_ms_p95": percentile(self._latency_ms, 0.95),
+            "write_latency_ms_p99": percentile(self._latency_ms, 0.99)
+        }
@@ -0,0 +1,171 @@
+"""
+HTTP Encoding - ETags, conditional GETs, compression and binary encoding for JSON responses.
+"""
+import gzip
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Optional: brotli compresses JSON ~15-20% smaller than gzip; gzip only without it
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Optional: MessagePack for clients that send Accept: application/msgpack
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Per-route byte counters (module-level, like async_db's write stats)
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+    "responses": 0,
+    "not_modified": 0,
+    "json_bytes": 0,
+    "sent_bytes": 0
+})
+
+def _accepted_encodings(header: str) -> Set[str]:
+    """Content codings named in Accept-Encoding, minus those refused with q=0."""
+    accepted = set()
+    for part in header.lower().split(","):
+        name, _, params = part.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if name.strip():
+            accepted.add(name.strip())
+    return accepted
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+class ResponseEncodingMiddleware:
+    """
+    Make successful JSON API responses cheap to re-fetch and to download.
+
+    - GET responses get a weak ETag hashed from the JSON body and
+      Cache-Control: no-cache, so browsers and the PWA revalidate with
+      If-None-Match and get an empty 304 when nothing changed.
+    - Clients sending Accept: application/msgpack get MessagePack instead of
+      JSON (when msgpack is installed).
+    - Bodies of at least COMPRESSION_MIN_BYTES are brotli- or gzip-compressed
+      according to Accept-Encoding.
+
+    Anything else (errors, streams such as /dashboard/events, responses that
+    are already encoded) passes through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def send_encoded(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] != 200
+                    or not headers.get("content-type", "").startswith("application/json")
+                    or "content-encoding" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                await self._send_body(scope, start, b"".join(chunks), send)
+
+        await self.app(scope, receive, send_encoded)
+
+    async def _send_body(self, scope: Scope, start: Message, body: bytes, send: Send) -> None:
+        """Apply ETag, content negotiation and compression to a complete JSON body."""
+        request_headers = Headers(scope=scope)
+        headers = MutableHeaders(raw=list(start["headers"]))
+        route = scope.get("route")
+        stats = _stats[f"{scope['method']} {getattr(route, 'path', scope['path'])}"]
+        stats["responses"] += 1
+        stats["json_bytes"] += len(body)
+
+        headers.add_vary_header("Accept")
+        headers.add_vary_header("Accept-Encoding")
+
+        if scope["method"] == "GET":
+            # Weak: the same tag covers every encoding of this JSON
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers["ETag"] = etag
+            if "cache-control" not in headers:
+                headers["Cache-Control"] = "no-cache"
+            if _etag_matches(request_headers.get("if-none-match"), etag):
+                stats["not_modified"] += 1
+                del headers["content-type"]
+                del headers["content-length"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        if msgpack is not None and MSGPACK_MEDIA_TYPE in request_headers.get("accept", ""):
+            body = msgpack.packb(orjson.loads(body))
+            headers["Content-Type"] = MSGPACK_MEDIA_TYPE
+
+        if len(body) >= settings.COMPRESSION_MIN_BYTES:
+            encodings = _accepted_encodings(request_headers.get("accept-encoding", ""))
+            if brotli is not None and "br" in encodings:
+                body = brotli.compress(body, quality=settings.BROTLI_QUALITY)
+                headers["Content-Encoding"] = "br"
+            elif "gzip" in encodings:
+                body = gzip.compress(body, compresslevel=settings.GZIP_LEVEL)
+                headers["Content-Encoding"] = "gzip"
+
+        headers["Content-Length"] = str(len(body))
+        stats["sent_bytes"] += len(body)
+        await send({**start, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
+
+def get_stats() -> Dict[str, Any]:
+    """Per-route JSON bytes produced vs. bytes actually sent (304s send none)."""
+    routes = {}
+    for route, stats in sorted(_stats.items()):
+        saved = stats["json_bytes"] - stats["sent_bytes"]
+        routes[route] = {
+            **stats,
+            "saved_bytes": saved,
+            "saved_ratio": round(saved / stats["json_bytes"], 3) if stats["json_bytes"] else 0.0
+        }
+    return {
+        "brotli": brotli is not None,
+        "msgpack": msgpack is not None,
+        "routes": routes
+    }
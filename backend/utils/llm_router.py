@@ -0,0 +1,330 @@
+"""
+LLM Router - Load balancing, hedging and failover across Ollama instances.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, Iterable, Callable
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Set by background jobs (e.g. precompute) around their LLM calls; tasks
+# they spawn, hedges included, inherit it, so user traffic can be told apart
+background_request: ContextVar[bool] = ContextVar("background_request", default=False)
+
+class LLMBackend:
+    """A single Ollama instance and its routing state."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.in_flight = 0
+        self.failures = 0
+        self.healthy = True
+        self.retry_at = 0.0
+
+    def is_available(self, now: float) -> bool:
+        """Healthy, or out of rotation long enough to be tried again."""
+        return self.healthy or now >= self.retry_at
+
+    def __repr__(self) -> str:
+        return f"LLMBackend({self.base_url}, in_flight={self.in_flight}, healthy={self.healthy})"
+
+class LLMRouter:
+    """Route requests to the least-loaded healthy Ollama backend."""
+
+    def __init__(
+        self,
+        base_urls: List[str],
+        hedge_after: float = 0.0,
+        max_failures: int = 3,
+        cooldown: float = 30.0,
+        timeout: float = 120.0,
+        max_affinity: int = 4096
+    ):
+        """
+        Args:
+            base_urls: Ollama base URLs to balance across
+            hedge_after: Seconds before a slow request is duplicated to a
+                second backend (0 disables hedging)
+            max_failures: Consecutive failures before a backend leaves rotation
+            cooldown: Seconds a failed backend stays out of rotation
+            timeout: Per-request HTTP timeout
+            max_affinity: Affinity keys remembered (least recently used are forgotten)
+        """
+        if not base_urls:
+            raise ValueError("At least one LLM backend URL is required")
+
+        self.backends = [LLMBackend(url) for url in base_urls]
+        self.hedge_after = hedge_after
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.timeout = timeout
+        self.max_affinity = max_affinity
+
+        # affinity key (e.g. conversation_id) -> base_url that served it last,
+        # so follow-up turns land where their prompt prefix is cached
+        self._affinity: "OrderedDict[Any, str]" = OrderedDict()
+
+        # Requests (hedges included) made with background_request set
+        self.background_in_flight = 0
+
+        # Generations abandoned mid-stream (client gone, or a losing hedge)
+        self.stats = {
+            "cancelled_requests": 0,
+            "wasted_tokens": 0
+        }
+
+        logger.info(f"LLM Router initialized with {len(self.backends)} backend(s)")
+
+    def pick(
+        self,
+        exclude: Iterable[LLMBackend] = (),
+        affinity: Any = None
+    ) -> Optional[LLMBackend]:
+        """
+        Choose the least-loaded available backend.
+
+        Args:
+            exclude: Backends already tried for this request
+            affinity: Optional key whose previous backend is preferred when
+                it is no busier than the alternatives
+
+        Returns:
+            Selected backend, or None if every backend is excluded/unavailable
+        """
+        now = time.monotonic()
+        excluded = set(id(b) for b in exclude)
+        candidates = [
+            b for b in self.backends
+            if id(b) not in excluded and b.is_available(now)
+        ]
+        if not candidates:
+            return None
+
+        least = min(candidates, key=lambda b: (not b.healthy, b.in_flight))
+
+        if affinity is not None and affinity in self._affinity:
+            preferred_url = self._affinity[affinity]
+            for backend in candidates:
+                if (backend.base_url == preferred_url and backend.healthy
+                        and backend.in_flight <= least.in_flight):
+                    return backend
+
+        return least
+
+    async def post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        affinity: Any = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        POST a JSON payload to the best backend, hedging and failing over.
+
+        Args:
+            path: API path, e.g. "/api/chat"
+            payload: JSON body
+            affinity: Optional routing affinity key
+            on_token: Optional callback for each streamed text chunk. Hedging
+                is disabled, and failover only happens before the first chunk,
+                so the caller sees a single coherent stream.
+
+        Returns:
+            Decoded JSON response from the first backend to succeed
+        """
+        tried: List[LLMBackend] = []
+        last_error: Optional[BaseException] = None
+        emitted = 0
+
+        def forward(text: str) -> None:
+            nonlocal emitted
+            emitted += 1
+            on_token(text)
+
+        callback = forward if on_token else None
+
+        while True:
+            primary = self.pick(exclude=tried, affinity=affinity)
+            if primary is None:
+                if last_error is not None:
+                    raise last_error
+                raise RuntimeError("No LLM backends available")
+            tried.append(primary)
+
+            tasks = {asyncio.create_task(self._post_to(primary, path, payload, callback)): primary}
+            hedged = self.hedge_after <= 0 or on_token is not None
+            try:
+                while tasks:
+                    done, _ = await asyncio.wait(
+                        tasks,
+                        timeout=None if hedged else self.hedge_after,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                    if not done:
+                        hedged = True
+                        backup = self.pick(exclude=tried)
+                        if backup is not None:
+                            logger.info(f"Hedging slow request from {primary.base_url} to {backup.base_url}")
+                            tried.append(backup)
+                            tasks[asyncio.create_task(self._post_to(backup, path, payload))] = backup
+                        continue
+
+                    for task in done:
+                        backend = tasks.pop(task)
+                        if task.exception() is None:
+                            if affinity is not None:
+                                self._remember_affinity(affinity, backend.base_url)
+                            return task.result()
+                        last_error = task.exception()
+            finally:
+                # Abandon the losing hedge; closing the connection stops Ollama
+                for task in tasks:
+                    task.cancel()
+                if tasks:
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+            if emitted:
+                # Part of the answer already reached the caller; cannot restart
+                raise last_error
+            logger.warning(f"All attempts on {primary.base_url} failed, failing over")
+
+    def _remember_affinity(self, affinity: Any, base_url: str) -> None:
+        """Record where a key was served, evicting the least recently used keys."""
+        self._affinity[affinity] = base_url
+        self._affinity.move_to_end(affinity)
+        while len(self._affinity) > self.max_affinity:
+            self._affinity.popitem(last=False)
+
+    async def _post_to(
+        self,
+        backend: LLMBackend,
+        path: str,
+        payload: Dict[str, Any],
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """POST to one backend, tracking in-flight count and health."""
+        background = background_request.get()
+        backend.in_flight += 1
+        if background:
+            self.background_in_flight += 1
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                if payload.get("stream"):
+                    result = await self._read_stream(client, backend, path, payload, on_token)
+                else:
+                    response = await client.post(f"{backend.base_url}{path}", json=payload)
+                    response.raise_for_status()
+                    result = response.json()
+            self._mark_success(backend)
+            return result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"LLM backend {backend.base_url} failed: {str(e)}")
+            self._mark_failure(backend)
+            raise
+        finally:
+            backend.in_flight -= 1
+            if background:
+                self.background_in_flight -= 1
+
+    async def _read_stream(
+        self,
+        client: httpx.AsyncClient,
+        backend: LLMBackend,
+        path: str,
+        payload: Dict[str, Any],
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Consume a streamed chat response into a single result.
+
+        Streaming lets a cancelled caller close the connection mid-generation,
+        which makes Ollama stop decoding; tokens received so far are counted
+        as wasted.
+        """
+        parts: List[str] = []
+        result: Dict[str, Any] = {}
+        try:
+            async with client.stream("POST", f"{backend.base_url}{path}", json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise RuntimeError(chunk["error"])
+                    text = chunk.get("message", {}).get("content", "")
+                    parts.append(text)
+                    result = chunk
+                    if on_token and text:
+                        on_token(text)
+        except asyncio.CancelledError:
+            self.stats["cancelled_requests"] += 1
+            self.stats["wasted_tokens"] += len(parts)
+            logger.info(f"Cancelled generation on {backend.base_url} after {len(parts)} tokens")
+            raise
+
+        result["message"] = {"role": "assistant", "content": "".join(parts)}
+        return result
+
+    def _mark_success(self, backend: LLMBackend) -> None:
+        if not backend.healthy:
+            logger.info(f"LLM backend {backend.base_url} back in rotation")
+        backend.failures = 0
+        backend.healthy = True
+
+    def _mark_failure(self, backend: LLMBackend) -> None:
+        backend.failures += 1
+        if backend.failures >= self.max_failures or not backend.healthy:
+            if backend.healthy:
+                logger.warning(f"LLM backend {backend.base_url} removed from rotation")
+            backend.healthy = False
+            backend.retry_at = time.monotonic() + self.cooldown
+
+    async def check_health(self) -> bool:
+        """
+        Probe every backend and update its rotation state.
+
+        Returns:
+            True if at least one backend is healthy
+        """
+        async def probe(backend: LLMBackend) -> bool:
+            try:
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    response = await client.get(f"{backend.base_url}/api/tags")
+                    ok = response.status_code == 200
+            except Exception as e:
+                # Periodic probes would repeat this every interval; report the transition only
+                if backend.healthy:
+                    logger.error(f"Ollama health check failed for {backend.base_url}: {str(e)}")
+                ok = False
+
+            if ok:
+                self._mark_success(backend)
+            else:
+                if backend.healthy:
+                    logger.warning(f"LLM backend {backend.base_url} removed from rotation")
+                backend.healthy = False
+                backend.retry_at = time.monotonic() + self.cooldown
+            return ok
+
+        results = await asyncio.gather(*(probe(b) for b in self.backends))
+        return any(results)
+
+    async def run_health_checks(self, interval: float) -> None:
+        """Background loop: probe every backend each interval seconds."""
+        while True:
+            try:
+                await self.check_health()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error checking LLM backend health: {str(e)}")
+            await asyncio.sleep(interval)
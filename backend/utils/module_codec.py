@@ -0,0 +1,39 @@
+"""
+Module Codec - Compact storage encoding for generated modules.
+"""
+import zlib
+from typing import Any, Dict, Union
+
+import orjson
+
+from config import settings
+
+class EncodedModule:
+    """
+    A module dict serialized once. Its JSON bytes are reused for the HTTP
+    response and, compressed, for the stored payload.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.json = orjson.dumps(data)
+
+    def envelope(self, **fields: Any) -> bytes:
+        """JSON object of fields plus "module": this module, embedded without re-encoding."""
+        return orjson.dumps({**fields, "module": orjson.Fragment(self.json)})
+
+def pack_module(module: Union[Dict[str, Any], EncodedModule]) -> bytes:
+    """Encode a module (dict, or already-serialized EncodedModule) as zlib-compressed compact JSON."""
+    encoded = module.json if isinstance(module, EncodedModule) else orjson.dumps(module)
+    return zlib.compress(encoded, settings.MODULE_COMPRESSION_LEVEL)
+
+def unpack_module(payload: bytes) -> Dict[str, Any]:
+    """Decode a payload written by pack_module."""
+    return orjson.loads(zlib.decompress(payload))
+
+def module_text(module_data: Dict[str, Any]) -> str:
+    """Searchable text of a module: its challenge and every section's title, content and activity."""
+    parts = [module_data.get("challenge") or ""]
+    for section in module_data.get("sections") or []:
+        parts.extend([section.get("title") or "", section.get("content") or "", section.get("activity") or ""])
+    return "\n".join(part for part in parts if part)
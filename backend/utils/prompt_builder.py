@@ -0,0 +1,152 @@
+"""
+Prompt Builder - Token-budgeted prompt assembly for LLM generation.
+"""
+import logging
+import math
+import re
+from typing import List, Dict, Tuple
+
+from config import settings
+from models.schemas import RetrievalResult
+
+logger = logging.getLogger(__name__)
+
+# Filled in one pass, so braces inside the substituted (user) text are never expanded
+PLACEHOLDER_PATTERN = re.compile(r"\{(history|context|challenge)\}")
+
+class PromptBuilder:
+    """Assemble prompts that fit a fixed token budget."""
+
+    def __init__(self):
+        self.context_window = settings.LLM_CONTEXT_WINDOW
+        self.prompt_budget = settings.LLM_PROMPT_TOKEN_BUDGET
+        self.history_budget = settings.LLM_HISTORY_TOKEN_BUDGET
+        self.chars_per_token = settings.LLM_CHARS_PER_TOKEN
+        logger.info(f"Prompt Builder initialized with budget: {self.prompt_budget} tokens")
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Estimate the number of tokens in a piece of text.
+
+        Ollama does not expose its tokenizer, so this uses a character ratio
+        calibrated against the prompt_eval_count it reports.
+
+        Args:
+            text: Text to measure
+
+        Returns:
+            Estimated token count
+        """
+        if not text:
+            return 0
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def pack_context(
+        self,
+        results: List[RetrievalResult],
+        budget: int
+    ) -> List[str]:
+        """
+        Pack the highest scoring context chunks into a token budget.
+
+        Args:
+            results: Retrieved chunks with similarity scores
+            budget: Maximum tokens to spend on context
+
+        Returns:
+            Chunk texts that fit, best score first
+        """
+        packed = []
+        used = 0
+        for result in sorted(results, key=lambda r: r.score, reverse=True):
+            # Charged as it will appear: header plus separator from the previous chunk
+            entry = self._context_entry(len(packed), result.text)
+            cost = self.count_tokens(entry if not packed else "\n\n" + entry)
+            if used + cost > budget:
+                continue
+            packed.append(result.text)
+            used += cost
+
+        if len(packed) < len(results):
+            logger.info(f"Packed {len(packed)}/{len(results)} context chunks ({used}/{budget} tokens)")
+        return packed
+
+    def trim_history(
+        self,
+        conversation_history: List[Dict[str, str]],
+        budget: int
+    ) -> List[Dict[str, str]]:
+        """
+        Keep the most recent conversation messages that fit a token budget.
+
+        Args:
+            conversation_history: Messages in chronological order
+            budget: Maximum tokens to spend on history
+
+        Returns:
+            Trailing messages that fit, in chronological order
+        """
+        kept = []
+        used = 0
+        for msg in reversed(conversation_history):
+            cost = self.count_tokens(msg["content"])
+            if used + cost > budget:
+                break
+            kept.append(msg)
+            used += cost
+        kept.reverse()
+        return kept
+
+    def build(
+        self,
+        template: str,
+        results: List[RetrievalResult],
+        conversation_history: List[Dict[str, str]],
+        render_history,
+        system_prompt: str = "",
+        challenge: str = ""
+    ) -> Tuple[str, int]:
+        """
+        Fill a prompt template with budgeted history and context.
+
+        Args:
+            template: Prompt with {history}, {context} and {challenge} placeholders
+            results: Retrieved context chunks
+            conversation_history: Previous messages
+            render_history: Callable turning a message list into prompt text
+            system_prompt: System prompt, counted against the budget
+            challenge: Teacher's text for {challenge}, inserted verbatim
+
+        Returns:
+            Tuple of (prompt, estimated prompt tokens)
+        """
+        history = self.trim_history(conversation_history, self.history_budget)
+        history_text = render_history(history)
+
+        fixed_tokens = (
+            self.count_tokens(self._fill(template, history_text, "", challenge))
+            + self.count_tokens(system_prompt)
+        )
+        context_budget = max(0, self.prompt_budget - fixed_tokens)
+        context_chunks = self.pack_context(results, context_budget)
+        context_text = "\n\n".join([
+            self._context_entry(i, chunk)
+            for i, chunk in enumerate(context_chunks)
+        ])
+
+        prompt = self._fill(template, history_text, context_text, challenge)
+        prompt_tokens = self.count_tokens(prompt) + self.count_tokens(system_prompt)
+
+        if prompt_tokens > self.context_window:
+            logger.warning(f"Prompt ({prompt_tokens} tokens) exceeds context window ({self.context_window})")
+
+        return prompt, prompt_tokens
+
+    def _context_entry(self, index: int, chunk: str) -> str:
+        """One context chunk as it appears in the prompt."""
+        return f"[Context {index + 1}]\n{chunk}"
+
+    def _fill(self, template: str, history: str, context: str, challenge: str = "") -> str:
+        """Substitute placeholders without touching other braces in the template."""
+        values = {"history": history, "context": context, "challenge": challenge}
+        return PLACEHOLDER_PATTERN.sub(lambda m: values[m.group(1)], template)
@@ -0,0 +1,117 @@
+"""
+Text Segmenter - Script-aware, markdown-preserving sentence segmentation for translation.
+"""
+import logging
+import re
+from typing import List, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Line breaks are structure, never translated
+LINE_BREAK = re.compile(r"(\n+)")
+
+# Markdown line prefixes: bullets, numbered items, headings, quotes
+MARKDOWN_PREFIX = re.compile(r"^(\s*(?:[-*+•]|\d+[.)]|#{1,6}|>)\s+)")
+
+# Bold / italic-bold markers, kept in place around their translated span
+EMPHASIS_MARKER = re.compile(r"(\*\*|__)")
+
+# Sentence terminators: Latin, Devanagari/Bengali danda, Urdu full stop and question mark
+SENTENCE_END = re.compile(r"(?<=[.!?।॥۔؟])(\s+)")
+
+# Abbreviations that end in a period but do not end a sentence
+ABBREVIATIONS = {"e.g.", "i.e.", "etc.", "vs.", "dr.", "mr.", "mrs.", "ms.", "no.", "st."}
+INITIAL = re.compile(r"(?:^|\s)[A-Z]\.$")
+
+# Preferred places to break an over-long sentence
+CLAUSE_BREAK = re.compile(r"[,;:،]\s")
+
+class TextSegmenter:
+    """Split text into translatable sentences and untranslatable structure."""
+
+    def __init__(self, max_chars: int = None):
+        self.max_chars = max_chars or settings.TRANSLATION_SEGMENT_MAX_CHARS
+
+    def segment(self, text: str) -> List[Tuple[str, bool]]:
+        """
+        Segment text for translation.
+
+        Line breaks, markdown prefixes, emphasis markers and inter-sentence
+        whitespace are returned as untranslatable pieces, so translating the
+        translatable pieces and concatenating everything rebuilds the
+        original structure.
+
+        Args:
+            text: Text (optionally markdown) to segment
+
+        Returns:
+            (piece, translatable) pairs whose pieces concatenate to text
+        """
+        pieces: List[Tuple[str, bool]] = []
+        for i, line in enumerate(LINE_BREAK.split(text)):
+            if i % 2 == 1:
+                pieces.append((line, False))
+                continue
+
+            prefix = MARKDOWN_PREFIX.match(line)
+            if prefix:
+                pieces.append((prefix.group(1), False))
+                line = line[prefix.end():]
+
+            for j, span in enumerate(EMPHASIS_MARKER.split(line)):
+                if j % 2 == 1:
+                    pieces.append((span, False))
+                else:
+                    self._add_sentences(pieces, span)
+
+        return [(piece, translatable) for piece, translatable in pieces if piece]
+
+    def _add_sentences(self, pieces: List[Tuple[str, bool]], span: str) -> None:
+        """Append the sentences of a plain-text span, keeping outer whitespace."""
+        stripped = span.strip()
+        if not stripped:
+            pieces.append((span, False))
+            return
+
+        start = span.index(stripped)
+        pieces.append((span[:start], False))
+
+        parts = SENTENCE_END.split(stripped)
+        sentence = parts[0]
+        for k in range(1, len(parts), 2):
+            separator, following = parts[k], parts[k + 1]
+            if self._is_abbreviation(sentence):
+                sentence += separator + following
+                continue
+            self._add_sentence(pieces, sentence)
+            pieces.append((separator, False))
+            sentence = following
+        self._add_sentence(pieces, sentence)
+
+        pieces.append((span[start + len(stripped):], False))
+
+    def _add_sentence(self, pieces: List[Tuple[str, bool]], sentence: str) -> None:
+        """Append a sentence, breaking it at clauses if it is too long to translate whole."""
+        while len(sentence) > self.max_chars:
+            cut = self._find_break(sentence)
+            pieces.append((sentence[:cut].rstrip(), True))
+            pieces.append((sentence[len(sentence[:cut].rstrip()):cut], False))
+            sentence = sentence[cut:]
+        pieces.append((sentence, True))
+
+    def _find_break(self, sentence: str) -> int:
+        """Index at which to break an over-long sentence (after a clause or word)."""
+        window = sentence[:self.max_chars]
+        clauses = [m.end() for m in CLAUSE_BREAK.finditer(window)]
+        if clauses and clauses[-1] > self.max_chars // 2:
+            return clauses[-1]
+        space = window.rfind(" ")
+        if space > 0:
+            return space + 1
+        return self.max_chars
+
+    def _is_abbreviation(self, sentence: str) -> bool:
+        last_word = sentence.rsplit(None, 1)[-1].lower() if sentence.strip() else ""
+        return last_word in ABBREVIATIONS or bool(INITIAL.search(sentence))
@@ -0,0 +1,150 @@
+"""
+Translation Backends - Pluggable NLLB inference engines (fp32 torch, int8 torch, CTranslate2).
+"""
+import logging
+from typing import List, Dict, Any
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+import torch
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Latency/quality profiles selectable per request
+TRANSLATION_PROFILES: Dict[str, Dict[str, Any]] = {
+    "fast": {"num_beams": 1},      # greedy decoding
+    "balanced": {"num_beams": 2},
+    "best": {"num_beams": 5},
+}
+
+class TorchTranslationBackend:
+    """HuggingFace transformers backend, optionally int8 dynamic-quantized."""
+
+    def __init__(self, model_name: str, quantize: bool = False):
+        self.device = "cuda" if torch.cuda.is_available() and not quantize else "cpu"
+        self.name = "torch-int8" if quantize else "torch"
+        logger.info(f"Loading translation model on {self.device} ({self.name})")
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        if quantize:
+            # Dynamic quantization: int8 weights for every Linear layer, CPU only
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.model = self.model.to(self.device).eval()
+
+    def generate(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: str,
+        num_beams: int
+    ) -> List[str]:
+        """Run one padded model.generate call over a batch of texts."""
+        # Tokenize with language codes
+        self.tokenizer.src_lang = source_language
+        inputs = self.tokenizer(
+            texts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=512
+        ).to(self.device)
+
+        # Generate translation
+        forced_bos_token_id = self.tokenizer.convert_tokens_to_ids(target_language)
+
+        # Budget output by input length instead of a flat 512 so one runaway
+        # beam cannot dominate decode time
+        max_new_tokens = min(512, inputs["input_ids"].shape[1] * 2 + 16)
+
+        with torch.no_grad():
+            generated_tokens = self.model.generate(
+                **inputs,
+                forced_bos_token_id=forced_bos_token_id,
+                max_new_tokens=max_new_tokens,
+                num_beams=num_beams,
+                early_stopping=num_beams > 1
+            )
+
+        # Decode translation
+        return self.tokenizer.batch_decode(
+            generated_tokens,
+            skip_special_tokens=True
+        )
+
+class CTranslate2TranslationBackend:
+    """
+    CTranslate2 backend for an NLLB model converted ahead of time, e.g.:
+        ct2-transformers-converter --model facebook/nllb-200-distilled-600M \\
+            --quantization int8 --output_dir ./data/nllb-ct2-int8
+    """
+
+    def __init__(self, model_name: str, model_dir: str):
+        try:
+            import ctranslate2
+        except ImportError as e:
+            raise ImportError(
+                "TRANSLATION_BACKEND=ctranslate2 requires the ctranslate2 package"
+            ) from e
+
+        self.name = "ctranslate2"
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        logger.info(f"Loading CTranslate2 translation model from {model_dir} on {self.device}")
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.translator = ctranslate2.Translator(
+            model_dir,
+            device=self.device,
+            compute_type="int8" if self.device == "cpu" else "int8_float16"
+        )
+
+    def generate(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: str,
+        num_beams: int
+    ) -> List[str]:
+        """Translate a batch with CTranslate2, forcing the target language token."""
+        self.tokenizer.src_lang = source_language
+        sources = [
+            self.tokenizer.convert_ids_to_tokens(ids)
+            for ids in self.tokenizer(texts, truncation=True, max_length=512)["input_ids"]
+        ]
+        max_decoding_length = min(512, max(len(tokens) for tokens in sources) * 2 + 16)
+
+        results = self.translator.translate_batch(
+            sources,
+            target_prefix=[[target_language]] * len(sources),
+            beam_size=num_beams,
+            max_decoding_length=max_decoding_length
+        )
+
+        return [
+            self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(result.hypotheses[0][1:]),
+                skip_special_tokens=True
+            )
+            for result in results
+        ]
+
+def create_translation_backend(name: str = None):
+    """
+    Build the configured translation backend.
+
+    Args:
+        name: "torch", "torch-int8" or "ctranslate2" (default: TRANSLATION_BACKEND)
+
+    Returns:
+        Backend exposing tokenizer, name and generate()
+    """
+    name = name or settings.TRANSLATION_BACKEND
+    if name == "torch":
+        return TorchTranslationBackend(settings.TRANSLATION_MODEL)
+    if name == "torch-int8":
+        return TorchTranslationBackend(settings.TRANSLATION_MODEL, quantize=True)
+    if name == "ctranslate2":
+        return CTranslate2TranslationBackend(settings.TRANSLATION_MODEL, settings.TRANSLATION_CT2_MODEL_DIR)
+    raise ValueError(f"Unknown translation backend: {name}")
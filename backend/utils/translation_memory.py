@@ -0,0 +1,196 @@
+"""
+Translation Memory - Persistent sentence-level translation cache.
+
+Lookups and writes run on the memory's own thread (see lookup/store), so
+sqlite work and commits never block the event loop.
+"""
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class TranslationMemory:
+    """SQLite-backed cache of translations keyed by (text hash, source, target, model)."""
+
+    def __init__(self, path: str = None, max_entries: int = None):
+        self.path = path or settings.TRANSLATION_MEMORY_PATH
+        self.max_entries = max_entries or settings.TRANSLATION_MEMORY_MAX_ENTRIES
+        # Evicting down to this leaves room for many writes before the next eviction
+        self.evict_to = int(self.max_entries * (1 - settings.TRANSLATION_MEMORY_EVICT_FRACTION))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translation-memory")
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS translation_memory (
+            text_hash TEXT NOT NULL,
+            source_language TEXT NOT NULL,
+            target_language TEXT NOT NULL,
+            model TEXT NOT NULL,
+            translation TEXT NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (text_hash, source_language, target_language, model)
+        )
+        """)
+        self._conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_translation_memory_last_used
+        ON translation_memory (last_used)
+        """)
+        self._conn.commit()
+        # Kept up to date by put_many so writes never have to count the table
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+
+        logger.info(f"Translation memory opened: {self.path} ({self._entries} entries)")
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so trivially different inputs share a cache entry."""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @classmethod
+    def text_hash(cls, text: str) -> str:
+        return hashlib.sha1(cls.normalize(text).encode("utf-8")).hexdigest()
+
+    async def lookup(self, *args, **kwargs) -> Dict[str, str]:
+        """get_many on the memory's thread."""
+        return await self._run(self.get_many, *args, **kwargs)
+
+    async def store(self, *args, **kwargs) -> None:
+        """put_many on the memory's thread."""
+        await self._run(self.put_many, *args, **kwargs)
+
+    async def _run(self, fn, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def get_many(
+        self,
+        texts: Iterable[str],
+        source_language: str,
+        target_language: str,
+        model: str
+    ) -> Dict[str, str]:
+        """
+        Look up cached translations.
+
+        Args:
+            texts: Source texts (typically sentences)
+            source_language: Source language code
+            target_language: Target language code
+            model: Translation model/profile identifier
+
+        Returns:
+            Mapping of source text -> cached translation, for hits only
+        """
+        by_hash: Dict[str, List[str]] = {}
+        for text in texts:
+            by_hash.setdefault(self.text_hash(text), []).append(text)
+        if not by_hash:
+            return {}
+
+        found: Dict[str, str] = {}
+        found_hashes = set()
+        hashes = list(by_hash)
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(f"""
+                SELECT text_hash, translation FROM translation_memory
+                WHERE source_language = ? AND target_language = ? AND model = ?
+                AND text_hash IN ({placeholders})
+                """, (source_language, target_language, model, *chunk)).fetchall()
+                for text_hash, translation in rows:
+                    found_hashes.add(text_hash)
+                    for text in by_hash[text_hash]:
+                        found[text] = translation
+
+            if found:
+                now = time.time()
+                self._conn.executemany("""
+                UPDATE translation_memory SET last_used = ?
+                WHERE text_hash = ? AND source_language = ? AND target_language = ? AND model = ?
+                """, [
+                    (now, text_hash, source_language, target_language, model)
+                    for text_hash in found_hashes
+                ])
+                self._conn.commit()
+
+            self.hits += len(found_hashes)
+            self.misses += len(by_hash) - len(found_hashes)
+
+        return found
+
+    def put_many(
+        self,
+        pairs: Iterable[Tuple[str, str]],
+        source_language: str,
+        target_language: str,
+        model: str
+    ) -> None:
+        """
+        Store translations, evicting least recently used entries over the limit.
+
+        Args:
+            pairs: (source text, translation) pairs
+            source_language: Source language code
+            target_language: Target language code
+            model: Translation model/profile identifier
+        """
+        now = time.time()
+        rows = [
+            (self.text_hash(text), source_language, target_language, model, translation, now)
+            for text, translation in pairs
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            # Existing keys are left alone: same text, languages and model
+            # give the same translation. rowcount is then the rows added.
+            added = self._conn.executemany("""
+            INSERT OR IGNORE INTO translation_memory
+            (text_hash, source_language, target_language, model, translation, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, rows).rowcount
+            self._entries += added
+
+            if self._entries > self.max_entries:
+                evicted = self._conn.execute("""
+                DELETE FROM translation_memory WHERE rowid IN (
+                    SELECT rowid FROM translation_memory
+                    ORDER BY last_used ASC LIMIT ?
+                )
+                """, (self._entries - self.evict_to,)).rowcount
+                self._entries -= evicted
+                self.evictions += 1
+                logger.info(f"Evicted {evicted} translation memory entries")
+
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit-rate statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
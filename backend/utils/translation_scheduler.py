@@ -0,0 +1,169 @@
+"""
+Translation Scheduler - Cross-request micro-batching of translations on a worker thread.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class TranslationQueueFull(RuntimeError):
+    """Raised when too many translation requests are already waiting."""
+
+class _PendingTranslation:
+    """One caller's texts waiting to be batched."""
+
+    def __init__(self, texts: List[str], future: asyncio.Future):
+        self.texts = texts
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+class TranslationScheduler:
+    """
+    Collect concurrent translation requests and run them as shared batches.
+
+    Requests are grouped by (source, target, profile) so every batch shares
+    one forced target-language token and decoding setup. Model work runs on
+    a dedicated thread so the event loop keeps serving other requests.
+    """
+
+    def __init__(self, translate_fn: Callable[[List[str], str, str, str], List[str]]):
+        """
+        Args:
+            translate_fn: Blocking fn(texts, target_language, source_language, profile)
+        """
+        self.translate_fn = translate_fn
+        self.batch_window = settings.TRANSLATION_BATCH_WINDOW_MS / 1000
+        self.max_queue_depth = settings.TRANSLATION_MAX_QUEUE_DEPTH
+        self.max_batch_requests = settings.TRANSLATION_MAX_BATCH_SIZE
+
+        # A single worker: the model and tokenizer are not safe to share across threads
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translation")
+        self._pending: Dict[Tuple[str, str, str], deque] = {}
+        self._wakeup: asyncio.Event = None
+        self._dispatcher: asyncio.Task = None
+
+        self._batches = 0
+        self._requests = 0
+        self._wait_ms: deque = deque(maxlen=1000)
+        self._latency_ms: deque = deque(maxlen=1000)
+
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._pending.values())
+
+    async def submit(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: str,
+        profile: str
+    ) -> List[str]:
+        """
+        Queue texts for translation and wait for the shared batch to finish.
+
+        Raises:
+            TranslationQueueFull: If the queue is at TRANSLATION_MAX_QUEUE_DEPTH
+        """
+        if self.queue_depth() >= self.max_queue_depth:
+            raise TranslationQueueFull(
+                f"Translation queue is full ({self.max_queue_depth} requests waiting)"
+            )
+
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = loop.create_task(self._dispatch_forever())
+
+        pending = _PendingTranslation(texts, loop.create_future())
+        key = (source_language, target_language, profile)
+        self._pending.setdefault(key, deque()).append(pending)
+        self._wakeup.set()
+
+        result = await pending.future
+        self._latency_ms.append((time.perf_counter() - pending.enqueued_at) * 1000)
+        return result
+
+    async def _dispatch_forever(self) -> None:
+        """Drain the queue one (source, target, profile) group at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # Give concurrent callers a moment to join the batch
+            await asyncio.sleep(self.batch_window)
+
+            if not self.queue_depth():
+                self._wakeup.clear()
+                continue
+
+            # Serve the group whose oldest request has waited longest
+            key = min(
+                (k for k, queue in self._pending.items() if queue),
+                key=lambda k: self._pending[k][0].enqueued_at
+            )
+            queue = self._pending[key]
+            batch = [queue.popleft() for _ in range(min(len(queue), self.max_batch_requests))]
+            if not queue:
+                del self._pending[key]
+
+            started = time.perf_counter()
+            for pending in batch:
+                self._wait_ms.append((started - pending.enqueued_at) * 1000)
+
+            source_language, target_language, profile = key
+            texts = [text for pending in batch for text in pending.texts]
+            unique_texts = list(dict.fromkeys(texts))
+            try:
+                unique_translations = await loop.run_in_executor(
+                    self._executor,
+                    self.translate_fn,
+                    unique_texts,
+                    target_language,
+                    source_language,
+                    profile
+                )
+                by_text = dict(zip(unique_texts, unique_translations))
+                translations = [by_text[text] for text in texts]
+            except Exception as e:
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+
+            # Hand each caller its own slice, in order
+            offset = 0
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_result(translations[offset:offset + len(pending.texts)])
+                offset += len(pending.texts)
+
+            self._batches += 1
+            self._requests += len(batch)
+            logger.info(
+                f"Translated batch of {len(batch)} requests ({len(texts)} texts) "
+                f"{source_language}->{target_language} in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, batching and latency metrics."""
+        def percentile(values: deque, q: float) -> float:
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+        return {
+            "queue_depth": self.queue_depth(),
+            "max_queue_depth": self.max_queue_depth,
+            "batches": self._batches,
+            "requests": self._requests,
+            "avg_requests_per_batch": round(self._requests / self._batches, 2) if self._batches else 0.0,
+            "queue_wait_ms_p50": percentile(self._wait_ms, 0.5),
+            "queue_wait_ms_p95": percentile(self._wait_ms, 0.95),
+            "latency_ms_p50": percentile(self._latency_ms, 0.5),
+            "latency_ms_p95": percentile(self._latency_ms, 0.95)
+        }
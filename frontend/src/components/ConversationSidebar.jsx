@@ -17,7 +17,7 @@ const formatToIST = (dateStr, options = {}) => {
     });
 };
 
-export default function ConversationSidebar({ conversations, activeId, onSelect, onNewConversation }) {
+export default function ConversationSidebar({ conversations, activeId, onSelect, onNewConversation, onLoadMore }) {
     const [showSettings, setShowSettings] = useState(false)
     const [isDialectModalOpen, setIsDialectModalOpen] = useState(false)
 
@@ -63,6 +63,14 @@ export default function ConversationSidebar({ conversations, activeId, onSelect,
                                 </p>
                             </motion.button>
                         ))}
+                        {onLoadMore && (
+                            <button
+                                onClick={onLoadMore}
+                                className="w-full py-2 rounded-xl bg-white/60 border border-white/60 text-sm font-bold text-pragati-primary hover:shadow-lg transition-all duration-300"
+                            >
+                                Load more
+                            </button>
+                        )}
                     </div>
                 )}
             </div>
@@ -7,6 +7,15 @@ import Sidebar from '../components/Sidebar'
 import { useDialect } from '../context/DialectContext'
 
 const API_URL = 'http://localhost:8000/api'
+const POLL_INTERVAL_MS = 30000
+const RECENT_LIMIT = 50
+
+// New rows arrive oldest first; show newest first without duplicates
+const prependNewest = (rows, current) => {
+    const seen = new Set(current.map(row => row.id))
+    const fresh = rows.filter(row => !seen.has(row.id)).reverse()
+    return [...fresh, ...current].slice(0, RECENT_LIMIT)
+}
 
 // Helper to safely parse and format dates as IST
 const formatToIST = (dateStr, options = {}) => {
@@ -49,10 +58,50 @@ export default function Dashboard() {
             setIsScrolled(window.scrollY > 20)
         }
         window.addEventListener('scroll', handleScroll)
-        fetchStats()
         return () => window.removeEventListener('scroll', handleScroll)
     }, [])
 
+    // Live updates pushed by the server; poll only while the stream is down
+    useEffect(() => {
+        let pollTimer = null
+        const startPolling = () => {
+            if (pollTimer) return
+            fetchStats()
+            pollTimer = setInterval(fetchStats, POLL_INTERVAL_MS)
+        }
+        const stopPolling = () => {
+            clearInterval(pollTimer)
+            pollTimer = null
+        }
+
+        if (typeof EventSource === 'undefined') {
+            startPolling()
+            return stopPolling
+        }
+
+        const source = new EventSource(`${API_URL}/dashboard/events`)
+        source.addEventListener('snapshot', (event) => {
+            applySnapshot(JSON.parse(event.data))
+            stopPolling()
+        })
+        source.addEventListener('feedback', (event) => {
+            setRecentFeedback(prev => prependNewest(JSON.parse(event.data), prev))
+        })
+        source.addEventListener('query', (event) => {
+            setRecentQueries(prev => prependNewest(JSON.parse(event.data), prev))
+        })
+        source.addEventListener('stats', (event) => {
+            setStats(JSON.parse(event.data))
+        })
+        // EventSource keeps reconnecting on its own; the next snapshot stops the polling
+        source.onerror = startPolling
+
+        return () => {
+            source.close()
+            stopPolling()
+        }
+    }, [])
+
     useEffect(() => {
         const updateTitle = async () => {
             const translated = await adaptContent("DIET Overview")
@@ -61,13 +110,18 @@ export default function Dashboard() {
         updateTitle()
     }, [selectedDialect])
 
+    const applySnapshot = (data) => {
+        setStats(data.stats)
+        setRecentFeedback(data.recent_feedback)
+        setRecentQueries(data.recent_queries || [])
+        setLoading(false)
+    }
+
     const fetchStats = async () => {
         try {
             const response = await axios.get(`${API_URL}/feedback/stats`)
             if (response.data.success) {
-                setStats(response.data.stats)
-                setRecentFeedback(response.data.recent_feedback)
-                setRecentQueries(response.data.recent_queries || [])
+                applySnapshot(response.data)
             }
         } catch (error) {
             console.error('Failed to fetch stats:', error)
@@ -170,6 +224,36 @@ export default function Dashboard() {
                         </motion.div>
                     </div>
 
+                    {/* Daily Activity (from rollups) */}
+                    {stats?.daily?.length > 0 && (
+                        <div className="bg-white/60 backdrop-blur-md p-6 rounded-2xl shadow-sm border border-white/60 mb-8">
+                            <div className="flex items-center justify-between mb-6">
+                                <h3 className="text-xl font-bold text-pragati-text">Daily Activity</h3>
+                                <span className="text-xs text-pragati-text/50">Feedback per day, last {stats.daily.length} active days</span>
+                            </div>
+                            <div className="flex items-end gap-2 h-40">
+                                {stats.daily.map((day, index) => {
+                                    const maxCount = Math.max(...stats.daily.map(d => d.feedback_count), 1)
+                                    return (
+                                        <div
+                                            key={day.day}
+                                            className="flex-1 flex flex-col items-center justify-end h-full group"
+                                            title={`${day.day}: ${day.feedback_count} feedback, avg ${day.average_rating}, ${day.query_count} queries`}
+                                        >
+                                            <motion.div
+                                                initial={{ height: 0 }}
+                                                animate={{ height: `${(day.feedback_count / maxCount) * 100}%` }}
+                                                transition={{ duration: 0.6, delay: index * 0.02 }}
+                                                className="w-full rounded-t-lg bg-gradient-to-t from-pragati-primary/60 to-pragati-primary group-hover:opacity-80"
+                                            />
+                                            <span className="text-[10px] text-pragati-text/40 mt-1">{day.day.slice(5)}</span>
+                                        </div>
+                                    )
+                                })}
+                            </div>
+                        </div>
+                    )}
+
                     <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
                         {/* Implementation Status Chart */}
                         <div className="lg:col-span-1 bg-white/60 backdrop-blur-md p-6 rounded-2xl shadow-sm border border-white/60 flex flex-col h-[500px]">
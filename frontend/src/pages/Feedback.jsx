@@ -1,10 +1,8 @@
 import { useState, useEffect } from 'react'
 import { motion } from 'framer-motion'
 import { MessageSquare, Star, ArrowDownWideNarrow, Filter, BarChart3, Clock } from 'lucide-react'
-import axios from 'axios'
 import Sidebar from '../components/Sidebar'
-
-const API_URL = 'http://localhost:8000/api'
+import { getFeedback } from '../services/api'
 
 // Helper to safely parse and format dates as IST
 const formatToIST = (dateStr, options = {}) => {
@@ -22,20 +20,19 @@ const formatToIST = (dateStr, options = {}) => {
 export default function Feedback() {
     const [feedback, setFeedback] = useState([])
     const [loading, setLoading] = useState(true)
+    const [nextCursor, setNextCursor] = useState(null)
     const [filterStatus, setFilterStatus] = useState('all') // all, implemented, pending, etc.
 
     useEffect(() => {
         fetchFeedback()
     }, [])
 
-    const fetchFeedback = async () => {
+    const fetchFeedback = async (cursor = null) => {
         try {
-            // Reusing the stats endpoint as it returns recent_feedback.
-            // Ideally, this should be a paginated endpoint for ALL feedback.
-            // Assuming for now simply displaying available data.
-            const response = await axios.get(`${API_URL}/feedback/stats`)
-            if (response.data.success) {
-                setFeedback(response.data.recent_feedback || [])
+            const response = await getFeedback({ limit: 50, cursor })
+            if (response.success) {
+                setFeedback(prev => cursor ? [...prev, ...response.feedback] : response.feedback)
+                setNextCursor(response.next_cursor)
             }
         } catch (error) {
             console.error('Failed to fetch feedback:', error)
@@ -141,6 +138,17 @@ export default function Feedback() {
                                 </motion.div>
                             ))}
 
+                            {nextCursor && (
+                                <div className="flex justify-center pt-4">
+                                    <button
+                                        onClick={() => fetchFeedback(nextCursor)}
+                                        className="px-6 py-2 rounded-xl bg-white/60 border border-white/60 text-sm font-bold text-pragati-primary hover:shadow-lg transition-all duration-300"
+                                    >
+                                        Load more
+                                    </button>
+                                </div>
+                            )}
+
                             {filteredFeedback.length === 0 && (
                                 <div className="flex flex-col items-center justify-center h-64 text-pragati-text/40">
                                     <MessageSquare className="w-16 h-16 mb-4 opacity-30" />
@@ -10,14 +10,18 @@ import LogoIcon from '../assets/pragati-logo-icon.png'
 
 export default function TeacherView() {
     const [conversations, setConversations] = useState([])
+    const [conversationsCursor, setConversationsCursor] = useState(null)
     const [activeConvId, setActiveConvId] = useState(null)
     const [messages, setMessages] = useState([])
+    const [olderMessagesCursor, setOlderMessagesCursor] = useState(null)
     const [input, setInput] = useState('')
     const [duration, setDuration] = useState(15)
     const [isLoading, setIsLoading] = useState(false)
     const [showFeedback, setShowFeedback] = useState(false)
     const [currentModule, setCurrentModule] = useState(null)
     const endRef = useRef(null)
+    // Set while older messages are prepended, so the view stays where it is
+    const loadingOlder = useRef(false)
     const location = useLocation()
 
     const [showNavbar, setShowNavbar] = useState(true)
@@ -84,25 +88,38 @@ export default function TeacherView() {
     }, [activeConvId])
 
     useEffect(() => {
+        if (loadingOlder.current) {
+            loadingOlder.current = false
+            return
+        }
         endRef.current?.scrollIntoView({ behavior: 'smooth' })
     }, [messages])
 
-    const loadConversations = async () => {
+    // Newest conversations first; pass a cursor to append the next page
+    const loadConversations = async (cursor = null) => {
         try {
-            const res = await getConversations()
+            const res = await getConversations({ limit: 50, cursor })
             if (res.success) {
-                setConversations(res.conversations)
+                setConversations(prev => cursor ? [...prev, ...res.conversations] : res.conversations)
+                setConversationsCursor(res.next_cursor)
             }
         } catch (err) {
             console.error('Conversations load failed:', err)
         }
     }
 
-    const loadMessages = async (id) => {
+    // Latest page of a conversation; pass a cursor to prepend the older page before it
+    const loadMessages = async (id, cursor = null) => {
         try {
-            const res = await getConversationMessages(id)
+            const res = await getConversationMessages(id, { limit: 50, cursor })
             if (res.success) {
-                setMessages(res.messages)
+                if (cursor) {
+                    loadingOlder.current = true
+                    setMessages(prev => [...res.messages, ...prev])
+                } else {
+                    setMessages(res.messages)
+                }
+                setOlderMessagesCursor(res.next_cursor)
             }
         } catch (err) {
             console.error('Messages load failed:', err)
@@ -112,6 +129,7 @@ export default function TeacherView() {
     const onNewChat = () => {
         setActiveConvId(null)
         setMessages([])
+        setOlderMessagesCursor(null)
         setInput('')
         setCurrentModule(null)
         setShowFeedback(false)
@@ -169,6 +187,7 @@ export default function TeacherView() {
                 activeId={activeConvId}
                 onSelect={setActiveConvId}
                 onNewConversation={onNewChat}
+                onLoadMore={conversationsCursor ? () => loadConversations(conversationsCursor) : null}
             />
 
             <div className="flex-1 flex flex-col relative overflow-hidden">
@@ -222,6 +241,16 @@ export default function TeacherView() {
                         </div>
                     ) : (
                         <>
+                            {olderMessagesCursor && (
+                                <div className="flex justify-center mb-4">
+                                    <button
+                                        onClick={() => loadMessages(activeConvId, olderMessagesCursor)}
+                                        className="px-6 py-2 rounded-xl bg-white/60 border border-white/60 text-sm font-bold text-pragati-primary hover:shadow-lg transition-all duration-300"
+                                    >
+                                        Load earlier messages
+                                    </button>
+                                </div>
+                            )}
                             {messages.map((msg) => (
                                 <ChatMessage
                                     key={msg.id}
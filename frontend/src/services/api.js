@@ -35,10 +35,19 @@ export const translateContent = async (payload) => {
     return await api.post('/api/translate', payload)
 }
 
+export const translateModule = async (payload) => {
+    return await api.post('/api/translate/module', payload)
+}
+
 export const submitFeedback = async (payload) => {
     return await api.post('/api/feedback', payload)
 }
 
+// Paginated lists: pass the previous response's next_cursor as cursor
+export const getFeedback = async ({ limit, cursor } = {}) => {
+    return await api.get('/api/feedback', { params: { limit, cursor } })
+}
+
 export const ingestDocument = async (file, title) => {
     const formData = new FormData()
     formData.append('file', file)
@@ -49,13 +58,17 @@ export const ingestDocument = async (file, title) => {
     })
 }
 
+export const searchHistory = async (q, { kind, limit, cursor } = {}) => {
+    return await api.get('/api/search', { params: { q, kind, limit, cursor } })
+}
+
 export const getSupportedLanguages = async () => {
     return await api.get('/api/languages')
 }
 
 // Conversation stuff
-export const getConversations = async () => {
-    return await api.get('/api/conversations')
+export const getConversations = async ({ limit, cursor } = {}) => {
+    return await api.get('/api/conversations', { params: { limit, cursor } })
 }
 
 export const createConversation = async (title) => {
@@ -64,8 +77,22 @@ export const createConversation = async (title) => {
     })
 }
 
-export const getConversationMessages = async (conversationId) => {
-    return await api.get(`/api/conversations/${conversationId}/messages`)
+export const getArchivedConversations = async ({ limit, cursor } = {}) => {
+    return await api.get('/api/conversations/archived', { params: { limit, cursor } })
+}
+
+export const restoreConversation = async (conversationId) => {
+    return await api.post(`/api/conversations/${conversationId}/restore`)
+}
+
+export const getConversationMessages = async (conversationId, { limit, cursor, includeModules } = {}) => {
+    return await api.get(`/api/conversations/${conversationId}/messages`, {
+        params: { limit, cursor, include_modules: includeModules }
+    })
+}
+
+export const getModule = async (moduleId) => {
+    return await api.get(`/api/modules/${moduleId}`)
 }
 
 export default api